@@ -0,0 +1 @@
+"""pytest-splinter benchmarks."""
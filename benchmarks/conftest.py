@@ -0,0 +1,71 @@
+"""Run the benchmarks against an in-process fake WebDriver server."""
+import pytest
+
+from .fake_webdriver import FakeWebDriverServer
+from .timer import BenchmarkTimer
+
+
+def pytest_addoption(parser):
+    """Fake WebDriver server options."""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--fake-webdriver-latency",
+        help="Milliseconds each command of the fake WebDriver server takes. Default: 0.",
+        type=float,
+        default=0,
+    )
+    group.addoption(
+        "--fake-webdriver-screenshot-size",
+        help="Size of the screenshots of the fake WebDriver server, in KB. Default: 200.",
+        type=int,
+        default=200,
+    )
+    group.addoption(
+        "--benchmark-timer-rounds",
+        help="Rounds of each benchmark, when pytest-benchmark is not installed. Default: 20.",
+        type=int,
+        default=20,
+    )
+
+
+def pytest_configure(config):
+    """Provide the benchmark fixture when pytest-benchmark is not installed."""
+    if not config.pluginmanager.hasplugin("benchmark"):
+        config.pluginmanager.register(
+            BenchmarkTimer(config.option.benchmark_timer_rounds), "benchmark_timer",
+        )
+
+
+@pytest.fixture(scope="session")
+def fake_webdriver(request):
+    """Fake WebDriver server, shared by the benchmarks."""
+    server = FakeWebDriverServer(
+        latency=request.config.option.fake_webdriver_latency / 1000,
+        screenshot_size=request.config.option.fake_webdriver_screenshot_size * 1024,
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def splinter_webdriver():
+    """Drive the fake server as a remote browser."""
+    return "remote"
+
+
+@pytest.fixture(scope="session")
+def splinter_remote_name():
+    """Ask the fake server for a chrome session."""
+    return "chrome"
+
+
+@pytest.fixture(scope="session")
+def splinter_remote_url(fake_webdriver):
+    """Point the remote webdriver to the fake server."""
+    return fake_webdriver.url
+
+
+@pytest.fixture(scope="session")
+def splinter_screenshot_dir(tmpdir_factory):
+    """Write screenshots to a temporary directory."""
+    return tmpdir_factory.mktemp("screenshots").strpath
@@ -0,0 +1,209 @@
+"""In-process WebDriver server answering the W3C commands used by pytest-splinter.
+
+Nothing is rendered: the server keeps the url of each session and answers
+every command right away, after an optional latency, so benchmarks measure
+the plugin and selenium rather than a browser.
+"""
+import base64
+import json
+import os
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+SESSION_RE = re.compile(r"^/session/(?P<session_id>[^/]+)(?P<command>/.*)?$")
+
+PAGE_SOURCE = "<html><head><title>Fake page</title></head><body>{}</body></html>"
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def make_png(size: int, width: int = 256) -> bytes:
+    """Make a valid png of about `size` bytes, with random pixels which do not compress."""
+    row_size = width * 3
+    height = max(size // (row_size + 1), 1)
+    rows = b"".join(b"\x00" + os.urandom(row_size) for _ in range(height))
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        _png_chunk(b"IDAT", zlib.compress(rows, 0)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+class FakeWebDriverHandler(BaseHTTPRequestHandler):
+    """Answer WebDriver commands from the state of the FakeWebDriverServer."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, do not wait for the ack of the headers.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):  # NOQA D102
+        pass
+
+    def _read_body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _send(self, value: Any, status: int = 200) -> None:
+        body = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str) -> None:
+        server = self.server.fake_webdriver
+        payload = self._read_body()
+        server.count(method, self.path)
+        if server.latency:
+            time.sleep(server.latency)
+
+        if self.path == "/status":
+            return self._send({"ready": True, "message": "fake webdriver"})
+
+        if self.path == "/session" and method == "POST":
+            return self._send(server.new_session(payload))
+
+        match = SESSION_RE.match(self.path)
+        session = match and server.sessions.get(match.group("session_id"))
+        if session is None:
+            return self._send(
+                {"error": "invalid session id", "message": self.path, "stacktrace": ""}, 404,
+            )
+
+        self._send(server.command(session, method, match.group("command") or "", payload))
+
+    def do_GET(self):  # NOQA N802 D102
+        self._handle("GET")
+
+    def do_POST(self):  # NOQA N802 D102
+        self._handle("POST")
+
+    def do_DELETE(self):  # NOQA N802 D102
+        self._handle("DELETE")
+
+
+class FakeWebDriverServer:
+    """WebDriver server running in a thread of the benchmark process.
+
+    Arguments:
+        latency (float): Seconds each command takes, to mimic a grid over the network.
+        screenshot_size (int): Size of the screenshots, in bytes.
+    """
+
+    def __init__(self, latency: float = 0, screenshot_size: int = 200 * 1024):
+        self.latency = latency
+        self.screenshot = base64.b64encode(make_png(screenshot_size)).decode("ascii")
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.commands: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Get the url to give to selenium as command_executor."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeWebDriverServer":
+        """Listen on a free port of localhost."""
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeWebDriverHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake_webdriver = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop listening."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def count(self, method: str, path: str) -> None:
+        """Count a command, by method and path without the session id."""
+        command = SESSION_RE.sub(r"/session/{id}\g<command>", path)
+        key = f"{method} {command}"
+        with self._lock:
+            self.commands[key] = self.commands.get(key, 0) + 1
+
+    def new_session(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a session with the capabilities asked for."""
+        capabilities = dict(payload.get("capabilities", {}).get("alwaysMatch", {}))
+        capabilities.setdefault("browserName", "chrome")
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self.sessions[session_id] = {
+                "id": session_id,
+                "url": "about:blank",
+                "cookies": {},
+                "rect": {"x": 0, "y": 0, "width": 1366, "height": 768},
+            }
+        return {"sessionId": session_id, "capabilities": capabilities}
+
+    def command(
+        self, session: Dict[str, Any], method: str, command: str, payload: Dict[str, Any],
+    ) -> Any:
+        """Run a command of a session."""
+        if command == "" and method == "DELETE":
+            with self._lock:
+                self.sessions.pop(session["id"], None)
+            return None
+
+        if command == "/url":
+            if method == "POST":
+                session["url"] = payload.get("url", "about:blank")
+                return None
+            return session["url"]
+
+        if command == "/title":
+            return "Fake page"
+
+        if command == "/source":
+            return PAGE_SOURCE.format(session["url"])
+
+        if command == "/screenshot":
+            return self.screenshot
+
+        if command == "/window":
+            return "main"
+
+        if command == "/window/handles":
+            return ["main"]
+
+        if command == "/window/rect":
+            if method == "POST":
+                session["rect"].update(
+                    {key: value for key, value in payload.items() if value is not None},
+                )
+            return session["rect"]
+
+        if command == "/cookie":
+            if method == "POST":
+                cookie = payload.get("cookie", {})
+                session["cookies"][cookie.get("name")] = cookie
+                return None
+            if method == "DELETE":
+                session["cookies"].clear()
+                return None
+            return list(session["cookies"].values())
+
+        if command in ("/execute/sync", "/execute/async"):
+            # Load conditions check the ready state of the page.
+            return True if "readyState" in payload.get("script", "") else None
+
+        return None
@@ -0,0 +1,20 @@
+"""Run the benchmarks without pytest-benchmark.
+
+Usage::
+
+    python benchmarks/run.py --fake-webdriver-latency=5 --benchmark-timer-rounds=50
+"""
+import os
+import sys
+
+import pytest
+
+
+def main(args):
+    """Run the benchmarks with the timer of the benchmarks conftest."""
+    benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+    return pytest.main([benchmarks_dir, "-p", "no:benchmark", "-p", "no:cacheprovider", *args])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""Browser lifecycle benchmarks."""
+import pytest
+
+
+def make_parent():
+    """Make a fixture function, which the browser pool uses as the key of a browser."""
+    def parent():
+        pass
+
+    return parent
+
+
+def test_get_browser(request, benchmark, browser_instance_getter):
+    """Start a new remote session, and prepare it for its first test."""
+    # Keep the parents alive, so their ids are not reused for the pool keys.
+    parents = []
+
+    def get_browser():
+        parents.append(make_parent())
+        return browser_instance_getter(request, parents[-1])
+
+    browser = benchmark(get_browser)
+
+    assert browser.driver.session_id
+
+
+def test_prepare_browser(request, benchmark, browser_instance_getter):
+    """Clean a pooled browser for the next test."""
+    parent = make_parent()
+
+    browser = benchmark(browser_instance_getter, request, parent)
+
+    assert browser is browser_instance_getter(request, parent)
+
+
+def test_visit(benchmark, browser, fake_webdriver):
+    """Visit a page and wait for the load condition."""
+    url = f"{fake_webdriver.url}/page"
+
+    benchmark(browser.visit, url)
+
+    assert browser.url == url
+
+
+@pytest.mark.parametrize("checks", [1, 3], ids=["immediate", "polled"])
+def test_wait_for_condition(benchmark, browser, checks):
+    """Wait for a condition met after a number of checks."""
+    def wait():
+        remaining = [checks]
+
+        def condition(browser):
+            ready = browser.evaluate_script("document.readyState === 'complete'")
+            remaining[0] -= 1
+            return ready and remaining[0] == 0
+
+        return browser.wait_for_condition(condition, timeout=5)
+
+    assert benchmark(wait)
@@ -0,0 +1,64 @@
+"""Screenshot benchmarks."""
+import os
+import types
+
+import pytest
+
+from pytest_splinter4.plugin import _take_screenshot
+from pytest_splinter4.xdist_plugin import SplinterXdistPlugin
+
+
+def fail(request):
+    """Take screenshots as if the test failed, without a traceback to add their paths to."""
+    request.node.splinter_failure = types.SimpleNamespace(longrepr=None)
+
+
+def extensions(directory):
+    """Get the extensions of the files of a directory."""
+    return sorted({os.path.splitext(name)[1] for name in os.listdir(directory)})
+
+
+def test_take_screenshot(request, benchmark, browser, session_tmpdir):
+    """Save the png and html of a page."""
+    fail(request)
+    benchmark(_take_screenshot, request, browser, "browser", session_tmpdir)
+
+    screenshot_dir = request.getfixturevalue("splinter_screenshot_dir")
+    assert extensions(os.path.join(screenshot_dir, "benchmarks.test_screenshots")) == [
+        ".html", ".png",
+    ]
+
+
+def test_xdist_screenshot_transfer(
+    request, benchmark, monkeypatch, browser, session_tmpdir, tmpdir,
+):
+    """Take a screenshot on a worker, and write it on the controller from the test report."""
+    execnet = pytest.importorskip("execnet")
+
+    fail(request)
+    config = request.config
+    controller = SplinterXdistPlugin(tmpdir.strpath)
+
+    def transfer():
+        # Worker
+        monkeypatch.setattr(config, "workeroutput", {}, raising=False)
+        try:
+            _take_screenshot(request, browser, "browser", session_tmpdir)
+        finally:
+            monkeypatch.delattr(config, "workeroutput")
+
+        report = pytest.TestReport(
+            request.node.nodeid, request.node.location, {}, "passed", None, "teardown",
+        )
+        report.splinter_screenshots = request.node.__dict__.pop("splinter_screenshots")
+        data = config.hook.pytest_report_to_serializable(config=config, report=report)
+        message = execnet.dumps(data)
+
+        # Controller
+        data = execnet.loads(message)
+        report = config.hook.pytest_report_from_serializable(config=config, data=data)
+        controller.pytest_runtest_logreport(report)
+
+    benchmark(transfer)
+
+    assert extensions(tmpdir.join("benchmarks.test_screenshots").strpath) == [".html", ".png"]
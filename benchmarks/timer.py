@@ -0,0 +1,81 @@
+"""Minimal stand-in for the `benchmark` fixture of pytest-benchmark."""
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+
+class Benchmark:
+    """Call a function a number of rounds, and record how long each round takes.
+
+    Arguments:
+        name (str): Name of the benchmark, ie: the test id.
+        rounds (int): Number of calls.
+        warmup (int): Calls made before the timed ones.
+    """
+
+    def __init__(self, name: str, rounds: int, warmup: int = 1):
+        self.name = name
+        self.rounds = rounds
+        self.warmup = warmup
+        self.durations: List[float] = []
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        """Benchmark a function, like pytest-benchmark does.
+
+        Returns:
+            The result of the last call.
+        """
+        for _ in range(self.warmup):
+            func(*args, **kwargs)
+
+        result = None
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.durations.append(time.perf_counter() - start)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """Get the min, mean, median and max durations, in seconds."""
+        return {
+            "min": min(self.durations),
+            "mean": statistics.mean(self.durations),
+            "median": statistics.median(self.durations),
+            "max": max(self.durations),
+        }
+
+
+class BenchmarkTimer:
+    """Plugin providing the `benchmark` fixture without pytest-benchmark."""
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+        self.benchmarks: List[Benchmark] = []
+
+    @pytest.fixture
+    def benchmark(self, request):
+        """Time a function, see Benchmark."""
+        benchmark = Benchmark(request.node.name, self.rounds)
+        yield benchmark
+        if benchmark.durations:
+            self.benchmarks.append(benchmark)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Write the durations of every benchmark, in milliseconds."""
+        if not self.benchmarks:
+            return
+
+        terminalreporter.write_sep("=", "benchmarks (ms)")
+        terminalreporter.write_line(
+            f"{'name':<48}{'rounds':>8}{'min':>10}{'mean':>10}{'median':>10}{'max':>10}",
+        )
+        for benchmark in self.benchmarks:
+            stats = benchmark.stats()
+            durations = "".join(
+                f"{stats[key] * 1000:>10.2f}" for key in ("min", "mean", "median", "max")
+            )
+            terminalreporter.write_line(
+                f"{benchmark.name:<48}{len(benchmark.durations):>8}{durations}",
+            )
@@ -0,0 +1,180 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Union
+
+import pytest
+
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+def content_digest(content: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """Get the sha256 digest of screenshot content."""
+    if isinstance(content, str):
+        content = content.encode(encoding or "utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def _compressor(compression: str):
+    if compression == "gzip":
+        return gzip.compress
+
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise pytest.UsageError(
+                "--splinter-artifact-compression=zstd requires the zstandard package",
+            )
+        return zstandard.ZstdCompressor().compress
+
+    return None
+
+
+class ArtifactStore:
+    """Content-addressed store for screenshots.
+
+    Each unique payload is saved once, as `blobs/<sha256><extension>` under the
+    root directory. `manifest.json` maps each test to the blobs of its screenshots.
+
+    Arguments:
+        root (str): Directory of the store.
+        compression (str): One of 'none', 'gzip' or 'zstd'.
+    """
+
+    def __init__(self, root: str, compression: str = "none"):
+        self.root = root
+        self.compression = compression
+        self._compress = _compressor(compression)
+        self.tests: Dict[str, List[Dict[str, Any]]] = {}
+        self._digests: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest: str, file_name: str = "") -> str:
+        """Get the path of a blob.
+
+        Arguments:
+            digest (str): sha256 digest of the content.
+            file_name (str): The blob keeps the extension of the screenshot file.
+        """
+        extension = os.path.splitext(file_name)[1]
+        return os.path.join(
+            self.root, "blobs", f"{digest}{extension}{_EXTENSIONS[self.compression]}",
+        )
+
+    def has(self, digest: str) -> bool:
+        """Check if a blob is already stored."""
+        with self._lock:
+            return digest in self._digests
+
+    def put(
+        self,
+        file_name: str,
+        content: Union[str, bytes],
+        encoding: Optional[str] = None,
+        digest: Optional[str] = None,
+    ) -> str:
+        """Save content, unless a blob with the same digest was already saved.
+
+        Returns:
+            str: The path of the blob.
+        """
+        if isinstance(content, str):
+            content = content.encode(encoding or "utf-8")
+        digest = digest or content_digest(content)
+        path = self.blob_path(digest, file_name)
+
+        with self._lock:
+            if digest in self._digests:
+                return path
+            self._digests.add(digest)
+
+        if not os.path.exists(path):
+            if self._compress is not None:
+                content = self._compress(content)
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as fd:
+                fd.write(content)
+            os.replace(tmp_path, path)
+
+        return path
+
+    def add(
+        self,
+        nodeid: str,
+        class_name: str,
+        file_name: str,
+        content: Union[str, bytes, None] = None,
+        encoding: Optional[str] = None,
+        digest: Optional[str] = None,
+    ) -> str:
+        """Save a screenshot file of a test and add it to the manifest.
+
+        Arguments:
+            nodeid (str): Id of the test.
+            class_name (str): Name of the screenshot directory.
+            file_name (str): Name of the screenshot file.
+            content: Content of the file. Can be omitted when a blob with the
+                given digest is already stored.
+            encoding (str): Encoding of text content.
+            digest (str): sha256 digest of the content.
+
+        Returns:
+            str: The path of the blob.
+        """
+        if content is None:
+            path = self.blob_path(digest, file_name)
+        else:
+            if isinstance(content, str):
+                content = content.encode(encoding or "utf-8")
+            digest = digest or content_digest(content)
+            path = self.put(file_name, content, digest=digest)
+
+        with self._lock:
+            self.tests.setdefault(nodeid, []).append({
+                "class_name": class_name,
+                "file_name": file_name,
+                "digest": digest,
+                "blob": os.path.relpath(path, self.root),
+                "encoding": encoding,
+            })
+
+        return path
+
+    def write_manifest(self) -> Optional[str]:
+        """Write the manifest, if any screenshot was stored.
+
+        Returns:
+            str: The path of the manifest.
+        """
+        if not self.tests:
+            return None
+
+        path = os.path.join(self.root, "manifest.json")
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, open(path, "w") as fd:
+            json.dump({"compression": self.compression, "tests": self.tests}, fd, indent=2)
+        return path
+
+
+store_key = pytest.StashKey[ArtifactStore]()
+sent_digests_key = pytest.StashKey[Set[str]]()
+
+
+def get_artifact_store(config) -> Optional[ArtifactStore]:
+    """Get the ArtifactStore of a pytest run, if enabled."""
+    return config.stash.get(store_key, None)
+
+
+def get_sent_digests(config) -> Set[str]:
+    """Get the digests a pytest-xdist worker already sent to the controller."""
+    if sent_digests_key not in config.stash:
+        config.stash[sent_digests_key] = set()
+    return config.stash[sent_digests_key]
@@ -0,0 +1,172 @@
+import logging
+import time
+from typing import Any, Callable, Hashable, List, Optional
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PooledBrowser:
+    """A browser instance tracked by the BrowserPool."""
+
+    def __init__(self, key: Hashable, browser: Any):
+        self.key = key
+        self.browser = browser
+        self.uses = 0
+        self.leases = 0
+        self.created = self.last_used = time.monotonic()
+        # Last resource usage sample of the health check.
+        self.sample = None
+
+    @property
+    def in_use(self) -> bool:
+        """Check if the browser is checked out."""
+        return self.leases > 0
+
+
+class BrowserPool:
+    """Bounded pool of reusable browser instances.
+
+    Browsers are checked out for a test and checked back in when the test is
+    finished. Idle browsers are evicted, least recently used first, when the
+    pool is full or when a browser has been used `max_uses` times.
+
+    Eviction is deferred until the next checkout so that a browser that was
+    just checked in is still available for failure screenshots.
+
+    Arguments:
+        max_size (int): Maximum number of browsers kept by the pool. 0 means no limit.
+        max_uses (int): Number of tests a browser serves before it is replaced.
+            0 means no limit.
+        health_check: Callable taking a PooledBrowser, returning the reason to
+            replace an idle browser, or None when it can be reused.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 0,
+        max_uses: int = 0,
+        health_check: Optional[Callable[[PooledBrowser], Optional[str]]] = None,
+    ):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.health_check = health_check
+        self._entries: List[PooledBrowser] = []
+
+    def __len__(self) -> int:
+        """Get the number of browsers in the pool."""
+        return len(self._entries)
+
+    def values(self) -> List[Any]:
+        """Get every browser known to the pool."""
+        return [entry.browser for entry in self._entries]
+
+    def clear(self) -> None:
+        """Forget every browser without quitting them."""
+        self._entries.clear()
+
+    def _find(self, browser: Any) -> Optional[PooledBrowser]:
+        for entry in self._entries:
+            if entry.browser is browser:
+                return entry
+        return None
+
+    def _is_expired(self, entry: PooledBrowser) -> bool:
+        return bool(self.max_uses) and entry.uses >= self.max_uses
+
+    def _evict(self, entry: PooledBrowser) -> None:
+        self._entries.remove(entry)
+        LOGGER.info(f"Removing browser from the pool after {entry.uses} uses")
+        try:
+            entry.browser.quit()
+        except Exception:  # NOQA
+            pass
+
+    def _evict_idle(self) -> None:
+        """Quit expired browsers and shrink the pool below max_size."""
+        for entry in [e for e in self._entries if not e.in_use and self._is_expired(e)]:
+            self._evict(entry)
+
+        if not self.max_size:
+            return
+
+        # Entries are kept in least recently used order.
+        idle = [e for e in self._entries if not e.in_use]
+        while idle and len(self._entries) >= self.max_size:
+            self._evict(idle.pop(0))
+
+    def reusable(self, key: Hashable) -> bool:
+        """Check if a checkout for the key can be served without a new browser.
+
+        The health check is only run at checkout, so the browser may still be replaced.
+        """
+        return any(
+            entry.key == key and (entry.in_use or not self._is_expired(entry))
+            for entry in self._entries
+        )
+
+    def checkout(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get an idle browser for the key, or create one with the factory.
+
+        Arguments:
+            key: Identifier of the consumer, ie: the parent fixture.
+            factory: Callable returning a new browser instance.
+
+        Returns:
+            A browser instance, marked as in use until it is checked in.
+        """
+        for entry in reversed(self._entries):
+            # A browser already checked out for this key is shared, as with the
+            # same parent fixture requested twice in a test.
+            if entry.key == key and (entry.in_use or not self._is_expired(entry)):
+                break
+        else:
+            entry = None
+
+        if entry is not None and not entry.in_use and self.health_check is not None:
+            reason = self.health_check(entry)
+            if reason:
+                LOGGER.info(f"Recycling browser: {reason}")
+                self._evict(entry)
+                entry = None
+
+        if entry is None:
+            self._evict_idle()
+            entry = PooledBrowser(key, factory())
+        else:
+            self._entries.remove(entry)
+
+        entry.leases += 1
+        self._entries.append(entry)
+        return entry.browser
+
+    def checkin(self, browser: Any) -> None:
+        """Return a browser to the pool after a test."""
+        entry = self._find(browser)
+        if entry is None or not entry.in_use:
+            return
+
+        entry.leases -= 1
+        if entry.in_use:
+            return
+
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+
+        self._entries.remove(entry)
+        self._entries.append(entry)
+
+    def discard(self, browser: Any) -> None:
+        """Remove a browser from the pool without quitting it."""
+        entry = self._find(browser)
+        if entry is not None:
+            self._entries.remove(entry)
+
+    def close(self) -> None:
+        """Quit every browser in the pool."""
+        for browser in self.values():
+            try:
+                browser.quit()
+            except Exception:  # NOQA
+                pass
+        self.clear()
@@ -0,0 +1,33 @@
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping
+
+
+class DriverKwargs(Mapping):
+    """Default keyword arguments of each driver, built when the driver is first used.
+
+    Building the arguments of a driver can touch the filesystem, ie: to find
+    its executable, so a session only pays for the drivers it uses.
+
+    Arguments:
+        factories: Callables building the keyword arguments, by driver name.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Dict[str, Any]]]):
+        self._factories = factories
+        self._values: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        """Get the keyword arguments of a driver, building them once."""
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = self._factories[name]()
+            return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the driver names."""
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        """Get the number of drivers."""
+        return len(self._factories)
@@ -0,0 +1,144 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+SERVICE_CLASSES = {
+    "chrome": ChromeService,
+    "firefox": FirefoxService,
+    "edge": EdgeService,
+}
+
+
+class ReusableService:
+    """Driver service which keeps running when its browser quits.
+
+    Selenium stops the service of a driver when the driver quits. Instead,
+    the service goes back to its manager, to be used by the next browser.
+    Other attributes are the ones of the selenium service.
+
+    Arguments:
+        service: The selenium driver service.
+        manager (DriverServiceManager): Manager to give the service back to.
+        key: Key of the driver settings the service was created with.
+    """
+
+    def __init__(self, service: Any, manager: "DriverServiceManager", key: Tuple):
+        self.service = service
+        self.manager = manager
+        self.key = key
+        self.started = False
+
+    def __getattr__(self, name: str) -> Any:
+        """Get an attribute of the selenium service."""
+        return getattr(self.service, name)
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the driver process is running."""
+        process = getattr(self.service, "process", None)
+        return self.started and process is not None and process.poll() is None
+
+    def start(self) -> None:
+        """Start the driver process, unless it is already running."""
+        if self.is_running:
+            return
+        self.service.start()
+        self.started = True
+
+    def stop(self) -> None:
+        """Give the service back to its manager, instead of stopping it."""
+        self.manager.release(self)
+
+    def close(self) -> None:
+        """Stop the driver process."""
+        if self.started:
+            self.started = False
+            self.service.stop()
+
+
+class DriverServiceManager:
+    """Reuse driver services, ie: chromedriver or geckodriver, across browsers.
+
+    A service is used by one browser at a time, since geckodriver only
+    supports a single session. When the browser quits, the service stays
+    running for the next browser created with the same driver settings.
+    """
+
+    def __init__(self):
+        self._idle: Dict[Tuple, List[ReusableService]] = {}
+        self._services: List[ReusableService] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(driver_name: str) -> bool:
+        """Check if a webdriver runs a local driver service."""
+        return driver_name in SERVICE_CLASSES
+
+    def acquire(self, driver_name: str, kwargs: Dict[str, Any]) -> ReusableService:
+        """Get a service for a new browser.
+
+        The service settings are removed from the webdriver kwargs.
+
+        Arguments:
+            driver_name (str): Name of the webdriver.
+            kwargs (dict): Keyword arguments for the webdriver.
+
+        Returns:
+            ReusableService
+        """
+        executable_path = kwargs.pop("executable_path", None)
+        service_args = kwargs.pop("service_args", None)
+        log_path = kwargs.pop("service_log_path", None)
+        key = (driver_name, executable_path, tuple(service_args or ()), log_path)
+
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                service = idle.pop()
+                if service.is_running:
+                    return service
+                self._services.remove(service)
+
+        service_kwargs = {"service_args": service_args, "log_path": log_path}
+        if executable_path:
+            service_kwargs["executable_path"] = executable_path
+
+        service = ReusableService(
+            SERVICE_CLASSES[driver_name](**service_kwargs), self, key,
+        )
+        with self._lock:
+            self._services.append(service)
+        return service
+
+    def release(self, service: ReusableService) -> None:
+        """Make a service available to the next browser."""
+        with self._lock:
+            if service in self._services and service not in self._idle.get(service.key, []):
+                self._idle.setdefault(service.key, []).append(service)
+
+    def idle_count(self, driver_name: Optional[str] = None) -> int:
+        """Get the number of services waiting for a browser."""
+        with self._lock:
+            return sum(
+                len(services) for key, services in self._idle.items()
+                if driver_name is None or key[0] == driver_name
+            )
+
+    def close(self) -> None:
+        """Stop every driver process."""
+        with self._lock:
+            services, self._services, self._idle = self._services, [], {}
+
+        for service in services:
+            try:
+                service.close()
+            except Exception:  # NOQA
+                LOGGER.warning("Error stopping the driver service", exc_info=True)
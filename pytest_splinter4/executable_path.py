@@ -1,15 +1,304 @@
+import json
+import logging
 import os
+import re
+import shutil
+import subprocess
+import threading
+import warnings
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+import pytest
 
-def get_executable_path(root: str, file_name: str) -> str:
-    """Check if a file name is in the current working directory.
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.selenium_manager import SeleniumManager
 
-    If so, return the full path.
+
+LOGGER = logging.getLogger(__name__)
+
+VERSION_RE = re.compile(r"\d+(?:\.\d+)+")
+
+# Directories searched for drivers after PATH, ie: the selenium manager cache.
+DEFAULT_DRIVER_DIRS = (os.path.join("~", ".cache", "selenium"),)
+
+# Depth of the driver directories searched, ie: chromedriver/linux64/114.0.5735.90/chromedriver
+MAX_DEPTH = 4
+
+# Browsers a driver must match the major version of, by driver name.
+DRIVER_BROWSERS = {
+    "chromedriver": ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser"),
+    "edgedriver": ("microsoft-edge", "microsoft-edge-stable", "msedge"),
+    "msedgedriver": ("microsoft-edge", "microsoft-edge-stable", "msedge"),
+}
+
+# Browser names of selenium-manager, by driver name.
+SELENIUM_MANAGER_BROWSERS = {
+    "chromedriver": "chrome",
+    "edgedriver": "edge",
+    "msedgedriver": "edge",
+}
+
+
+def executable_name(file_name: str) -> str:
+    """Get the name of an executable for the current OS."""
+    os_correct_file_name = {
+        'nt': f'{file_name}.exe',
+        'posix': file_name,
+    }
+    return os_correct_file_name[os.name]
+
+
+def probe_version(path: str, timeout: float = 10) -> Optional[str]:
+    """Get the version an executable prints with --version.
+
+    Returns:
+        str: None when the executable does not run or print a version.
+    """
+    try:
+        output = subprocess.run(
+            [path, "--version"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = VERSION_RE.search(output)
+    return match.group(0) if match else None
+
+
+class ExecutableIndex:
+    """Versions of executables, saved to a JSON file.
+
+    Entries are keyed by path, and are probed again when the modification
+    time or size of the executable changes.
+
+    Arguments:
+        path (str): The JSON file. Versions are only kept in memory when None.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        if path is not None:
+            try:
+                with open(path) as fd:
+                    self._entries = json.load(fd)
+            except (OSError, ValueError):
+                pass
+
+    def version(self, path: str) -> Optional[str]:
+        """Get the version of an executable, probing it only when it changed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = [stat.st_mtime_ns, stat.st_size]
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry["stat"] == key:
+            return entry["version"]
+
+        version = probe_version(path)
+        with self._lock:
+            self._entries[path] = {"stat": key, "version": version}
+        self.save()
+        return version
+
+    def save(self) -> None:
+        """Write the index, replacing the file at once for other processes."""
+        if self.path is None:
+            return
+
+        with self._lock:
+            entries = dict(self._entries)
+
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as fd:
+                json.dump(entries, fd, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+def _major(version: str) -> str:
+    return version.split(".")[0]
+
+
+def selenium_manager_path(file_name: str) -> Optional[str]:
+    """Get the driver selenium-manager provides for the installed browser.
+
+    selenium-manager downloads the driver matching the browser, if needed.
+
+    Returns:
+        str: None when selenium-manager can not provide the driver.
+    """
+    browser = SELENIUM_MANAGER_BROWSERS.get(file_name)
+    if browser is None:
+        return None
+
+    try:
+        return SeleniumManager().driver_location(browser)
+    # Newer selenium versions take the browser options instead of its name.
+    except (WebDriverException, OSError, TypeError, AttributeError):
+        LOGGER.warning(f"selenium-manager could not provide {file_name}", exc_info=True)
+        return None
+
+
+class ExecutableResolver:
+    """Find driver executables once, and use the ones matching the installed browser.
+
+    An executable is searched in the root directory, ie: the current
+    working directory, then in PATH, then in the driver directories, where
+    the most recently modified matches come first.
+
+    When versions are checked, the first executable matching the major
+    version of its browser is used. If none does, the driver provided by
+    selenium-manager is used instead.
+
+    Arguments:
+        driver_dirs: Directories searched after PATH, with their subdirectories.
+        index (ExecutableIndex): Versions of the executables, probed once.
+        check_versions (bool): Use the driver matching the major version of
+            its browser.
+        manager: Get the path of the driver selenium-manager provides for a
+            driver name, or None.
+    """
+
+    def __init__(
+        self,
+        driver_dirs: Iterable[str] = DEFAULT_DRIVER_DIRS,
+        index: Optional[ExecutableIndex] = None,
+        check_versions: bool = True,
+        manager: Callable[[str], Optional[str]] = selenium_manager_path,
+    ):
+        self.driver_dirs = [os.path.expanduser(directory) for directory in driver_dirs]
+        self.index = index or ExecutableIndex()
+        self.check_versions = check_versions
+        self.manager = manager
+        self._found: Dict[Tuple[str, str], List[str]] = {}
+        self._resolved: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, root: str, file_name: str) -> List[str]:
+        """Get the full paths of an executable, in the order they are searched."""
+        key = (root, file_name)
+        with self._lock:
+            if key not in self._found:
+                self._found[key] = self._search(root, executable_name(file_name))
+            return self._found[key]
+
+    def find(self, root: str, file_name: str) -> Optional[str]:
+        """Get the full path of an executable.
+
+        Returns:
+            str: None when the executable is not found.
+        """
+        candidates = self.candidates(root, file_name)
+        return candidates[0] if candidates else None
+
+    def _search(self, root: str, name: str) -> List[str]:
+        paths = []
+
+        path = os.path.join(root, name)
+        if os.path.isfile(path):
+            paths.append(path)
+
+        path = shutil.which(name)
+        if path is not None:
+            paths.append(os.path.abspath(path))
+
+        matches = []
+        for directory in self.driver_dirs:
+            for base, dirs, names in os.walk(directory):
+                if base[len(directory):].count(os.sep) >= MAX_DEPTH:
+                    dirs[:] = []
+                if name in names:
+                    matches.append(os.path.join(base, name))
+        paths.extend(sorted(matches, key=os.path.getmtime, reverse=True))
+
+        # The same executable can be in the root directory and PATH.
+        return list(dict.fromkeys(paths))
+
+    def resolve(self, root: str, file_name: str) -> str:
+        """Get the path of an executable, or its name when it is not found."""
+        key = (root, file_name)
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+
+        path = self._resolve(root, file_name)
+        with self._lock:
+            self._resolved[key] = path
+        return path
+
+    def _resolve(self, root: str, file_name: str) -> str:
+        candidates = self.candidates(root, file_name)
+        if not candidates:
+            return executable_name(file_name)
+
+        if not self.check_versions or file_name not in DRIVER_BROWSERS:
+            return candidates[0]
+
+        browser_version = self.browser_version(file_name)
+        if browser_version is None:
+            return candidates[0]
+
+        versions = {path: self.index.version(path) for path in candidates}
+        for path, version in versions.items():
+            if version is not None and _major(version) == _major(browser_version):
+                return path
+        if not any(versions.values()):
+            # The versions are unknown, the drivers may match.
+            return candidates[0]
+
+        path = self.manager(file_name)
+        if path is not None:
+            LOGGER.info(
+                f"No {file_name} matches the installed browser {browser_version}, "
+                f"using {path} from selenium-manager",
+            )
+            return path
+
+        warnings.warn(pytest.PytestWarning(
+            f"{candidates[0]} {versions[candidates[0]]} does not match the installed browser "
+            f"{browser_version}",
+        ))
+        return candidates[0]
+
+    def browser_version(self, file_name: str) -> Optional[str]:
+        """Get the version of the browser a driver drives, if it is installed."""
+        for browser in DRIVER_BROWSERS.get(file_name, ()):
+            path = shutil.which(browser)
+            if path is not None:
+                return self.index.version(path)
+        return None
+
+
+# Resolver of get_executable_path when none is given, keeping its results
+# for the whole process.
+_default_resolver = ExecutableResolver(check_versions=False)
+
+
+def get_executable_path(
+    root: str, file_name: str, resolver: Optional[ExecutableResolver] = None,
+) -> str:
+    """Find an executable in a directory, PATH or the driver directories.
+
+    If found, return the full path.
     If not, return the file name.
 
     Arguments:
         root (str): The assumed location of the file.
         file_path (str): The name of the file.
+        resolver (ExecutableResolver): Resolver keeping the results of the
+            search. A resolver shared by every call is used by default.
 
     Returns:
         str: An assumed valid path for the file.
@@ -20,14 +309,28 @@ def get_executable_path(root: str, file_name: str) -> str:
         >>> cwd = os.getcwd()
         >>> result = get_executable_path(cwd, 'chromedriver')
     """
-    os_correct_file_name = {
-        'nt': f'{file_name}.exe',
-        'posix': file_name,
-    }
-    _file_name = os_correct_file_name[os.name]
-    full_file_path = os.path.join(root, _file_name)
+    if resolver is None:
+        resolver = _default_resolver
+    return resolver.resolve(root, file_name)
 
-    if not os.path.isfile(full_file_path):
-        full_file_path = _file_name
 
-    return full_file_path
+executable_resolver_key = pytest.StashKey[ExecutableResolver]()
+
+
+def get_executable_resolver(config) -> ExecutableResolver:
+    """Get the ExecutableResolver of a pytest run, configured by the command line options.
+
+    Versions are kept in the pytest cache, when it is enabled.
+    """
+    if executable_resolver_key not in config.stash:
+        index_path = None
+        cache = getattr(config, "cache", None)
+        if cache is not None:
+            index_path = str(cache.mkdir("splinter") / "executables.json")
+
+        config.stash[executable_resolver_key] = ExecutableResolver(
+            driver_dirs=[*config.option.splinter_driver_dirs, *DEFAULT_DRIVER_DIRS],
+            index=ExecutableIndex(index_path),
+            check_versions=config.option.splinter_check_driver_version == "true",
+        )
+    return config.stash[executable_resolver_key]
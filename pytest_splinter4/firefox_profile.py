@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
+
+
+# Files which are not part of a profile.
+IGNORED_FILES = {".marker", "lock", "parent.lock", ".parentlock"}
+
+
+def _profile_files(directory: str) -> List[Tuple[str, str]]:
+    """Get the (path, name in the profile) of the files of a profile directory."""
+    files = []
+    for base, _, names in os.walk(directory):
+        for name in names:
+            if name not in IGNORED_FILES:
+                path = os.path.join(base, name)
+                files.append((path, os.path.relpath(path, directory)))
+    return sorted(files, key=lambda file: file[1])
+
+
+def profile_key(directory: str) -> str:
+    """Get the sha256 digest of a profile directory."""
+    digest = hashlib.sha256()
+    for path, name in _profile_files(directory):
+        digest.update(name.encode("utf-8"))
+        with open(path, "rb") as fd:
+            digest.update(fd.read())
+    return digest.hexdigest()
+
+
+def build_profile(directory: str) -> str:
+    """Zip a profile directory.
+
+    Preferences are not added to its user.js, they are sent with the options
+    and geckodriver writes them into the profile.
+
+    Returns:
+        str: The base64 encoded zip file, as geckodriver expects it.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipped:
+        for path, name in _profile_files(directory):
+            zipped.write(path, name)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class EncodedProfile(FirefoxProfile):
+    """Firefox profile built once, in the form sent to geckodriver.
+
+    A FirefoxProfile, so it can be given to the public `Options.profile`
+    setter, which only reads its `encoded` value. FirefoxProfile.__init__
+    is not called, as it copies the profile to a new directory.
+
+    Selenium deletes the directory of the profile when the browser quits,
+    the same empty directory is created again each time it is needed.
+    """
+
+    tempfolder = None
+
+    def __init__(self, encoded: str):
+        self._encoded = encoded
+        self._path: Optional[str] = None
+
+    @property
+    def encoded(self) -> str:
+        """Get the base64 encoded zip file of the profile."""
+        return self._encoded
+
+    @property
+    def path(self) -> str:
+        """Get an empty directory, for selenium to delete."""
+        if self._path is None:
+            self._path = tempfile.mkdtemp(prefix="splinter-profile-")
+        else:
+            os.makedirs(self._path, exist_ok=True)
+        return self._path
+
+    def cleanup(self) -> None:
+        """Remove the directory, if selenium did not."""
+        if self._path is not None:
+            shutil.rmtree(self._path, ignore_errors=True)
+
+
+class ProfileCache:
+    """Firefox profiles of a pytest run, built once per unique content."""
+
+    def __init__(self):
+        self._keys: Dict[str, str] = {}
+        self._profiles: Dict[str, Optional[EncodedProfile]] = {}
+        self._lock = threading.Lock()
+
+    def key(self, directory: str) -> str:
+        """Get the key of a profile, reading the directory once."""
+        with self._lock:
+            if directory not in self._keys:
+                self._keys[directory] = profile_key(directory)
+            return self._keys[directory]
+
+    def get(self, directory: str) -> Optional[EncodedProfile]:
+        """Get the profile for a directory.
+
+        Returns:
+            EncodedProfile: None when the directory is empty. Then geckodriver
+                creates a profile.
+        """
+        key = self.key(directory)
+        with self._lock:
+            if key in self._profiles:
+                return self._profiles[key]
+
+            profile = None
+            if _profile_files(directory):
+                profile = EncodedProfile(build_profile(directory))
+            self._profiles[key] = profile
+            return profile
+
+    def close(self) -> None:
+        """Remove the directories of the profiles."""
+        with self._lock:
+            profiles = [profile for profile in self._profiles.values() if profile is not None]
+        for profile in profiles:
+            profile.cleanup()
+
+
+profile_cache_key = pytest.StashKey[ProfileCache]()
+
+
+def get_profile_cache(config) -> ProfileCache:
+    """Get the ProfileCache of a pytest run, closed at the end of the run."""
+    if profile_cache_key not in config.stash:
+        config.stash[profile_cache_key] = ProfileCache()
+        config.add_cleanup(config.stash[profile_cache_key].close)
+    return config.stash[profile_cache_key]
@@ -0,0 +1,179 @@
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import pytest
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover
+    psutil = None
+
+
+MB = 1024 * 1024
+
+
+class HealthSample(NamedTuple):
+    """Resource usage of a driver process and its children, ie: the browser."""
+
+    memory: int
+    cpu_time: float
+    time: float
+
+
+def driver_pid(browser: Any) -> Optional[int]:
+    """Get the pid of the driver service of a browser, when it runs locally."""
+    driver = getattr(browser, "driver", None)
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    pid = getattr(process, "pid", None)
+    return pid if isinstance(pid, int) else None
+
+
+def sample_process_tree(pid: int) -> Optional[HealthSample]:
+    """Get the resident memory and CPU time of a process and its children.
+
+    Returns:
+        HealthSample: None when the process is gone.
+    """
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+
+    memory = 0
+    cpu_time = 0.0
+    for process in processes:
+        try:
+            memory += process.memory_info().rss
+            cpu_times = process.cpu_times()
+        except psutil.Error:
+            continue
+        cpu_time += cpu_times.user + cpu_times.system
+
+    return HealthSample(memory, cpu_time, time.monotonic())
+
+
+def check_psutil(max_memory: int = 0, max_cpu: float = 0) -> None:
+    """Raise a usage error when memory or CPU limits are set without psutil."""
+    if (max_memory or max_cpu) and psutil is None:
+        raise pytest.UsageError(
+            "--splinter-browser-max-memory and --splinter-browser-max-cpu "
+            "require the psutil package",
+        )
+
+
+class HealthMonitor:
+    """Decide when a pooled browser should be recycled.
+
+    The browser pool checks a browser before handing it to a test, so a
+    browser is replaced between tests instead of failing in the middle of one.
+    Memory and CPU are sampled on the driver service process tree, which
+    requires psutil. Remote browsers are only checked for uptime.
+
+    Arguments:
+        max_memory (int): Resident memory of the browser, in MB.
+        max_cpu (float): CPU usage of the browser since the previous check, in percent.
+        max_uptime (float): Seconds since the browser was started.
+
+    0 means no limit.
+
+    The number of recycled browsers is kept by reason, ie: 'memory', and
+    reported at the end of the test run.
+    """
+
+    def __init__(self, max_memory: int = 0, max_cpu: float = 0, max_uptime: float = 0):
+        self.recycled: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.set_limits(max_memory, max_cpu, max_uptime)
+
+    def set_limits(self, max_memory: int = 0, max_cpu: float = 0, max_uptime: float = 0) -> None:
+        """Change the limits browsers are checked against."""
+        check_psutil(max_memory, max_cpu)
+        self.max_memory = max_memory
+        self.max_cpu = max_cpu
+        self.max_uptime = max_uptime
+
+    @property
+    def enabled(self) -> bool:
+        """Check if any limit is set."""
+        return bool(self.max_memory or self.max_cpu or self.max_uptime)
+
+    def check(self, entry: Any) -> Optional[str]:
+        """Get the reason to recycle a pooled browser.
+
+        Arguments:
+            entry (PooledBrowser): The browser, with its start time and last sample.
+
+        Returns:
+            str: None when the browser is healthy.
+        """
+        reason = self._check(entry)
+        if reason is not None:
+            kind = reason.split()[0]
+            with self._lock:
+                self.recycled[kind] = self.recycled.get(kind, 0) + 1
+        return reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the counters, ie: to send them from a pytest-xdist worker."""
+        with self._lock:
+            return {"recycled": dict(self.recycled)}
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add counters collected elsewhere, ie: on a pytest-xdist worker."""
+        with self._lock:
+            for kind, count in data.get("recycled", {}).items():
+                self.recycled[kind] = self.recycled.get(kind, 0) + count
+
+    def write_terminal_summary(self, terminalreporter) -> None:
+        """Write the number of recycled browsers, by reason, to the pytest terminal."""
+        terminalreporter.write_sep("=", "splinter recycled browsers")
+        terminalreporter.write_line(f"{'reason':<24}{'count':>8}")
+        for kind, count in sorted(self.recycled.items()):
+            terminalreporter.write_line(f"{kind:<24}{count:>8}")
+
+    def _check(self, entry: Any) -> Optional[str]:
+        uptime = time.monotonic() - entry.created
+        if self.max_uptime and uptime > self.max_uptime:
+            return f"uptime {uptime:.0f}s over {self.max_uptime}s"
+
+        if not (self.max_memory or self.max_cpu):
+            return None
+
+        pid = driver_pid(entry.browser)
+        if pid is None:
+            return None
+
+        sample = sample_process_tree(pid)
+        if sample is None:
+            return None
+        previous, entry.sample = entry.sample, sample
+
+        if self.max_memory and sample.memory > self.max_memory * MB:
+            return f"memory {sample.memory // MB}MB over {self.max_memory}MB"
+
+        if self.max_cpu and previous is not None:
+            elapsed = sample.time - previous.time
+            if elapsed > 0:
+                # Processes which exited since the previous sample take their CPU time along.
+                cpu = max(sample.cpu_time - previous.cpu_time, 0) / elapsed * 100
+                if cpu > self.max_cpu:
+                    return f"cpu {cpu:.0f}% over {self.max_cpu}%"
+
+        return None
+
+
+health_monitor_key = pytest.StashKey[HealthMonitor]()
+
+
+def get_health_monitor(config) -> HealthMonitor:
+    """Get the HealthMonitor of a pytest run, configured by the command line options."""
+    if health_monitor_key not in config.stash:
+        config.stash[health_monitor_key] = HealthMonitor(
+            max_memory=config.option.splinter_browser_max_memory,
+            max_cpu=config.option.splinter_browser_max_cpu,
+            max_uptime=config.option.splinter_browser_max_uptime,
+        )
+    return config.stash[health_monitor_key]
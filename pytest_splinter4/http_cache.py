@@ -0,0 +1,438 @@
+import collections
+import hashlib
+import json
+import logging
+import os
+import re
+import select
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import urllib3
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+MODES = ("off", "cache", "record", "replay")
+
+
+# Headers which only apply to a single connection.
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+STATIC_CONTENT_TYPES = (
+    "application/javascript",
+    "application/x-javascript",
+    "application/font",
+    "application/vnd.ms-fontobject",
+    "application/wasm",
+    "font/",
+    "image/",
+    "text/css",
+    "text/javascript",
+)
+
+STATIC_EXTENSIONS = (
+    ".css", ".js", ".mjs", ".map", ".wasm",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".avif",
+)
+
+
+class CachedResponse(NamedTuple):
+    """HTTP response kept by the cache."""
+
+    status: int
+    reason: str
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+def compile_url_pattern(pattern: str) -> re.Pattern:
+    """Compile a blocked url pattern, where only `*` is a wildcard, like Chromium does.
+
+    Unlike fnmatch, `?` and `[` match themselves, ie: in query strings.
+    """
+    return re.compile(".*".join(re.escape(part) for part in pattern.split("*")), re.DOTALL)
+
+
+def is_static(url: str, response: CachedResponse) -> bool:
+    """Check if a response is a static asset which can be cached."""
+    if response.status != 200:
+        return False
+
+    headers = {name.lower(): value for name, value in response.headers}
+    if "set-cookie" in headers:
+        return False
+
+    cache_control = headers.get("cache-control", "").lower()
+    if any(directive in cache_control for directive in ("no-store", "no-cache", "private")):
+        return False
+
+    content_type = headers.get("content-type", "").lower()
+    path = urlsplit(url).path.lower()
+    return content_type.startswith(STATIC_CONTENT_TYPES) or path.endswith(STATIC_EXTENSIONS)
+
+
+class ResponseCache:
+    """Least recently used cache of HTTP responses.
+
+    Responses are kept in memory, up to max_bytes. With a directory, they are
+    also saved to disk, and read back when they are not in memory.
+
+    Arguments:
+        max_bytes (int): Size of the bodies kept in memory.
+        directory (str): Directory to save responses in.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, directory: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.size = 0
+        self._entries: "collections.OrderedDict[str, CachedResponse]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a response, or None."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                return response
+
+        if not self.directory:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(f"{path}.json") as fd:
+                meta = json.load(fd)
+            with open(f"{path}.body", "rb") as fd:
+                body = fd.read()
+        except (OSError, ValueError):
+            return None
+
+        response = CachedResponse(
+            meta["status"], meta["reason"], [tuple(header) for header in meta["headers"]], body,
+        )
+        self._remember(key, response)
+        return response
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        """Add a response."""
+        self._remember(key, response)
+
+        if self.directory:
+            path = self._path(key)
+            with open(f"{path}.body", "wb") as fd:
+                fd.write(response.body)
+            with open(f"{path}.json", "w") as fd:
+                json.dump({
+                    "url": key,
+                    "status": response.status,
+                    "reason": response.reason,
+                    "headers": response.headers,
+                }, fd)
+
+    def _remember(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+
+            if len(response.body) > self.max_bytes:
+                return
+
+            self._entries[key] = response
+            self.size += len(response.body)
+
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def __len__(self) -> int:
+        """Get the number of responses in memory."""
+        return len(self._entries)
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # NOQA N802
+        self.server.proxy.forward(self)
+
+    do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_GET  # NOQA N815
+
+    def do_CONNECT(self):  # NOQA N802
+        self.server.proxy.tunnel(self)
+
+    def log_message(self, format, *args):  # NOQA A002
+        LOGGER.debug(format, *args)
+
+
+class CachingProxy:
+    """HTTP proxy serving repeated static responses from a cache.
+
+    Modes:
+
+    * cache: static responses are cached, everything else goes to the network.
+    * record: every GET response is saved to the cache directory.
+    * replay: GET requests are only served from the cache directory.
+
+    * off: nothing is cached, the proxy only blocks urls.
+
+    HTTPS requests are tunnelled to the server, and are not cached.
+    Requests matching a blocked url pattern get an empty response.
+
+    Arguments:
+        mode (str): One of 'off', 'cache', 'record' or 'replay'.
+        cache (ResponseCache): Where responses are kept.
+        host (str): Address to listen on.
+        blocked_url_patterns: Url patterns with `*` wildcards, other characters
+            match themselves.
+    """
+
+    def __init__(
+        self,
+        mode: str = "cache",
+        cache: Optional[ResponseCache] = None,
+        host: str = "127.0.0.1",
+        blocked_url_patterns: Iterable[str] = (),
+    ):
+        self.mode = mode
+        self.blocked_url_patterns = list(blocked_url_patterns)
+        self._blocked_url_regexes = [
+            compile_url_pattern(pattern) for pattern in self.blocked_url_patterns
+        ]
+        self.blocked = 0
+        self.cache = cache if cache is not None else ResponseCache()
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._http = urllib3.PoolManager(maxsize=16)
+        self._server = ThreadingHTTPServer((host, 0), _ProxyHandler)
+        self._server.daemon_threads = True
+        self._server.proxy = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Get the (host, port) the proxy listens on."""
+        return self._server.server_address[:2]
+
+    @property
+    def url(self) -> str:
+        """Get the url of the proxy."""
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "CachingProxy":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="splinter-http-cache", daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self._http.clear()
+
+    def forward(self, handler: BaseHTTPRequestHandler) -> None:
+        """Answer a request from the cache or from the server."""
+        url = handler.path
+        method = handler.command
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else None
+
+        if not url.startswith("http://"):
+            self._send(handler, CachedResponse(400, "Bad Request", [], b""))
+            return
+
+        if self.is_blocked(url):
+            self._send(handler, CachedResponse(204, "Blocked", [], b""))
+            return
+
+        if method == "GET" and self.mode != "off":
+            cached = self.cache.get(url)
+            with self._stats_lock:
+                if cached is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            if cached is not None:
+                self._send(handler, cached)
+                return
+
+            if self.mode == "replay":
+                self._send(handler, CachedResponse(504, "Not Recorded", [], b""))
+                return
+
+        headers = {
+            name: value for name, value in handler.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        try:
+            upstream = self._http.request(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                redirect=False,
+                retries=False,
+                decode_content=False,
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            LOGGER.warning(f"Proxy request to {url} failed: {e}")
+            self._send(handler, CachedResponse(502, "Bad Gateway", [], b""))
+            return
+
+        response = CachedResponse(
+            upstream.status,
+            upstream.reason or "",
+            [
+                (name, value) for name, value in upstream.headers.items()
+                if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != "content-length"
+            ],
+            b"",
+        )
+
+        cacheable = method == "GET" and self.mode != "off"
+        if not (cacheable and (self.mode == "record" or is_static(url, response))):
+            self._stream(handler, upstream, response, head=method == "HEAD")
+            return
+
+        try:
+            response = response._replace(body=upstream.read())
+        finally:
+            upstream.release_conn()
+        self.cache.put(url, response)
+        self._send(handler, response)
+
+    def _send(self, handler: BaseHTTPRequestHandler, response: CachedResponse):
+        handler.send_response(response.status, response.reason)
+        for name, value in response.headers:
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(response.body)))
+        handler.end_headers()
+        handler.wfile.write(response.body)
+
+    def _stream(
+        self,
+        handler: BaseHTTPRequestHandler,
+        upstream: urllib3.HTTPResponse,
+        response: CachedResponse,
+        head: bool = False,
+    ):
+        """Send a response which is not cached as it arrives, ie: server-sent events."""
+        try:
+            handler.send_response(response.status, response.reason)
+            for name, value in response.headers:
+                handler.send_header(name, value)
+
+            length = upstream.headers.get("Content-Length")
+            chunked = False
+            if length is not None:
+                handler.send_header("Content-Length", length)
+            elif head or response.status in (204, 304):
+                pass
+            elif handler.request_version == "HTTP/1.1":
+                handler.send_header("Transfer-Encoding", "chunked")
+                chunked = True
+            else:
+                # The end of the body is the end of the connection.
+                handler.send_header("Connection", "close")
+                handler.close_connection = True
+            handler.end_headers()
+
+            if head:
+                return
+            # Chunked responses are sent one chunk at a time.
+            for chunk in upstream.stream(None, decode_content=False):
+                if not chunk:
+                    continue
+                if chunked:
+                    chunk = b"%x\r\n%s\r\n" % (len(chunk), chunk)
+                handler.wfile.write(chunk)
+                handler.wfile.flush()
+            if chunked:
+                handler.wfile.write(b"0\r\n\r\n")
+        finally:
+            upstream.release_conn()
+
+    def is_blocked(self, url: str) -> bool:
+        """Check if a url matches a blocked url pattern."""
+        blocked = any(regex.fullmatch(url) for regex in self._blocked_url_regexes)
+        if blocked:
+            with self._stats_lock:
+                self.blocked += 1
+        return blocked
+
+    def tunnel(self, handler: BaseHTTPRequestHandler) -> None:
+        """Connect the browser to a HTTPS server."""
+        if self.mode == "replay":
+            self._send(handler, CachedResponse(502, "Offline", [], b""))
+            return
+
+        host, _, port = handler.path.rpartition(":")
+
+        # The path is not known, match the server only.
+        if self.is_blocked(f"https://{host}/"):
+            self._send(handler, CachedResponse(403, "Blocked", [], b""))
+            return
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=30)
+        except (OSError, ValueError):
+            self._send(handler, CachedResponse(502, "Bad Gateway", [], b""))
+            return
+
+        handler.send_response(200, "Connection Established")
+        handler.end_headers()
+        handler.close_connection = True
+
+        client = handler.connection
+        sockets = [client, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, 30)
+                if errored or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is client else client).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of cache hits and misses."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.cache)}
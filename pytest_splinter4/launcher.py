@@ -0,0 +1,125 @@
+import collections
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BrowserLauncher:
+    """Launch browsers in background threads ahead of demand.
+
+    Browsers are created by the factory, which receives the name of the
+    webdriver to use. When `prewarm` is set, that many browsers are kept
+    launching in the background, so that a new browser is ready when a test
+    asks for one.
+
+    `prepare` is called in the calling thread before a webdriver is first
+    launched, to resolve what the factory needs, ie: pytest fixtures, which
+    can not be resolved in worker threads.
+
+    Arguments:
+        factory: Callable creating a new browser for a webdriver name.
+        prewarm (int): Number of browsers to keep launching ahead of demand.
+        max_workers (int): Maximum number of browsers launched at the same time.
+            Defaults to the ThreadPoolExecutor default.
+        prepare: Callable taking a webdriver name, called once per webdriver.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        prewarm: int = 0,
+        max_workers: Optional[int] = None,
+        prepare: Optional[Callable[[str], None]] = None,
+    ):
+        self.factory = factory
+        self.prepare = prepare
+        self.prewarm = prewarm
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ready: Dict[str, Deque[Future]] = collections.defaultdict(collections.deque)
+        self._prepared = set()
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="splinter-launcher",
+            )
+        return self._executor
+
+    def _prepare(self, driver_name: str) -> None:
+        if self.prepare is not None and driver_name not in self._prepared:
+            self.prepare(driver_name)
+            self._prepared.add(driver_name)
+
+    def launch(self, driver_name: str, count: int = 1) -> None:
+        """Start launching browsers in the background.
+
+        Must be called from the thread using the launcher, ie: the main thread.
+
+        Arguments:
+            driver_name (str): Name of the webdriver to launch.
+            count (int): Number of browsers to launch.
+        """
+        self._prepare(driver_name)
+        with self._lock:
+            for _ in range(count):
+                self._ready[driver_name].append(
+                    self.executor.submit(self.factory, driver_name),
+                )
+
+    def pending(self, driver_name: str) -> int:
+        """Get the number of browsers launched but not handed out yet."""
+        return len(self._ready[driver_name])
+
+    def get(self, driver_name: str, ahead: int = 0, prewarm: bool = True) -> Any:
+        """Get a browser, from the background launches if one is available.
+
+        Arguments:
+            driver_name (str): Name of the webdriver to use.
+            ahead (int): Number of browsers the caller is about to ask for.
+                They are launched in parallel with this one.
+            prewarm (bool): Keep `prewarm` browsers launching for the next
+                callers. Callers reusing their browsers do not need them.
+
+        Returns:
+            A new browser instance.
+        """
+        self._prepare(driver_name)
+        with self._lock:
+            queue = self._ready[driver_name]
+            future = queue.popleft() if queue else None
+            missing = max(self.prewarm if prewarm else 0, ahead) - len(queue)
+
+        # The other browsers start before this one is created.
+        if missing > 0:
+            self.launch(driver_name, missing)
+
+        if future is None:
+            return self.factory(driver_name)
+        return future.result()
+
+    def close(self) -> None:
+        """Stop launching browsers and quit the ones that were never used."""
+        with self._lock:
+            futures = [f for queue in self._ready.values() for f in queue]
+            self._ready.clear()
+
+        for future in futures:
+            if future.cancel():
+                continue
+            try:
+                future.result().quit()
+            except Exception:  # NOQA
+                LOGGER.warning("Error closing prewarmed browser", exc_info=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,3 +1,5 @@
+import copy
+
 import pytest
 
 from selenium import webdriver
@@ -30,6 +32,27 @@ def pytest_addoption(parser):
     )
 
 
+def copy_options(options):
+    """Copy an Options object for a single browser launch.
+
+    Splinter adds arguments and preferences to the options it is given.
+    The copy gets its own lists and dicts, so the session Options object is
+    left untouched, while the rest, ie: a built Firefox profile, is shared.
+
+    Returns:
+        Options: The copy of the options.
+
+    """
+    if options is None:
+        return None
+
+    options_copy = copy.copy(options)
+    for name, value in vars(options).items():
+        if isinstance(value, (dict, list, set)):
+            setattr(options_copy, name, copy.copy(value))
+    return options_copy
+
+
 @pytest.fixture(scope='session')
 def chrome_options(request):
     """Create a new Webdriver Chrome Options instance.
@@ -9,22 +9,62 @@ import logging
 import mimetypes  # pragma: no cover
 import os.path
 import re
+import tempfile
+import time
 import warnings
 from http.client import HTTPException
+from typing import List, Optional
 
 from _pytest import junitxml
 
 import pytest  # pragma: no cover
 
-from selenium.common.exceptions import WebDriverException
-from selenium.webdriver.support import wait
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
 
 import splinter  # pragma: no cover
 
 from urllib3.exceptions import MaxRetryError
 
-from .executable_path import get_executable_path
-from .webdriver_patches import patch_webdriver  # pragma: no cover
+from .artifact_store import (
+    ArtifactStore,
+    COMPRESSIONS,
+    content_digest,
+    get_artifact_store,
+    get_sent_digests,
+    store_key,
+)
+from .browser_pool import BrowserPool
+from .driver_kwargs import DriverKwargs
+from .driver_service import DriverServiceManager
+from .executable_path import get_executable_path, get_executable_resolver
+from .firefox_profile import get_profile_cache
+from .health import get_health_monitor
+from .http_cache import CachingProxy, MODES, ResponseCache
+from .launcher import BrowserLauncher
+from .options import copy_options
+from .remote import (
+    BALANCE_STRATEGIES,
+    RemoteConnections,
+    RemoteSessionRegistry,
+    RemoteUrlBalancer,
+    get_session_registry,
+    parse_remote_urls,
+    session_registry_key,
+)
+from .reset import BrowserReset
+from .retry import get_retry_policy
+from .screenshots import (
+    ScreenshotWriter,
+    decode_png,
+    queue_for_controller,
+    screenshot_extraline,
+)
+from .timings import get_command_profiler, get_timings
+from .webdriver_patches import THROTTLED_COMMANDS, patch_webdriver  # pragma: no cover
 from .xdist_plugin import SplinterXdistPlugin
 
 LOGGER = logging.getLogger(__name__)
@@ -32,6 +72,10 @@ LOGGER = logging.getLogger(__name__)
 
 NAME_RE = re.compile(r"[\W]")
 
+# Poll interval of wait_for_condition, in seconds.
+DEFAULT_WAIT_POLL_INITIAL = 0.01
+DEFAULT_WAIT_POLL_MAX = 0.5
+
 
 pytest_plugins = [
     'pytest_splinter4.options',
@@ -46,36 +90,52 @@ def _visit(self, old_visit, url):
 
 
 def _wait_for_condition(
-    self, condition=None, timeout=None, poll_frequency=0.5, ignored_exceptions=None,
+    self, condition=None, timeout=None, poll_frequency=None, ignored_exceptions=None,
 ):
-    """Wait for given javascript condition."""
+    """Wait for given javascript condition.
+
+    The condition is checked right away. Then the poll interval starts at
+    `wait_poll_initial` seconds and doubles up to `wait_poll_max` seconds,
+    unless a fixed poll_frequency is given.
+    """
     condition = functools.partial(condition or self.visit_condition, self)
 
     timeout = timeout or self.wait_time
 
-    return wait.WebDriverWait(
-        self.driver,
-        timeout,
-        poll_frequency=poll_frequency,
-        ignored_exceptions=ignored_exceptions,
-    ).until(lambda browser: condition())
-
-
-def _screenshot_extraline(screenshot_png_file_name, screenshot_html_file_name):
-    return f"""
-===========================
-pytest-splinter screenshots
-===========================
-png:  {screenshot_png_file_name}
-html: {screenshot_html_file_name}
-"""
+    ignored = (NoSuchElementException, *(ignored_exceptions or ()))
+
+    if poll_frequency:
+        poll, poll_max = poll_frequency, poll_frequency
+    else:
+        poll = getattr(self, "wait_poll_initial", DEFAULT_WAIT_POLL_INITIAL)
+        poll_max = getattr(self, "wait_poll_max", DEFAULT_WAIT_POLL_MAX)
+
+    end_time = time.time() + timeout
+    error = None
+    while True:
+        try:
+            value = condition()
+            if value:
+                return value
+        except ignored as e:
+            error = e
+
+        now = time.time()
+        if now > end_time:
+            raise TimeoutException(
+                f"Condition was not met in {timeout} seconds",
+            ) from error
+
+        time.sleep(min(poll, max(end_time - now, 0)))
+        poll = min(poll * 2, poll_max)
 
 
 def Browser(*args, **kwargs):  # NOQA N802
     """Emulate splinter's Browser."""
     visit_condition = kwargs.pop("visit_condition")
     visit_condition_timeout = kwargs.pop("visit_condition_timeout")
-    browser = splinter.Browser(*args, retry_count=6, **kwargs)
+    # Failed launches are retried by the RetryPolicy of pytest-splinter.
+    browser = splinter.Browser(*args, retry_count=1, **kwargs)
     browser.wait_for_condition = functools.partial(
         _wait_for_condition, browser)
     if hasattr(browser, "driver"):
@@ -126,6 +186,34 @@ def splinter_remote_name(request) -> str:
     return request.config.option.splinter_remote_name
 
 
+@pytest.fixture(scope="session")
+def splinter_remote_balance(request) -> str:
+    """Get the strategy to spread remote sessions across several remote urls.
+
+    Returns:
+        str: 'round-robin', 'least-loaded' or 'worker'.
+    """
+    return request.config.option.splinter_remote_balance
+
+
+@pytest.fixture(scope="session")
+def _splinter_remote_balancer(request, splinter_remote_url, splinter_remote_balance):
+    """Get the balancer of remote sessions, when there are several remote urls."""
+    urls = parse_remote_urls(splinter_remote_url)
+    if len(urls) < 2:
+        return None
+
+    workerid = getattr(request.config, "workerinput", {}).get("workerid", "")
+    balancer = RemoteUrlBalancer(
+        urls,
+        strategy=splinter_remote_balance,
+        cooldown=request.config.option.splinter_remote_cooldown,
+        worker_index=int(re.sub(r"\D", "", workerid) or 0),
+    )
+    request.addfinalizer(balancer.close)
+    return balancer
+
+
 @pytest.fixture(scope="session")  # pragma: no cover
 def splinter_selenium_socket_timeout(request) -> int:
     """Set the internal Selenium socket timeout.
@@ -159,15 +247,28 @@ def splinter_wait_time(request) -> int:
 
 
 @pytest.fixture(scope="session")  # pragma: no cover
-def splinter_selenium_speed(request) -> int:
+def splinter_selenium_speed(request) -> float:
     """Selenium speed, in seconds.
 
+    Navigation and interactions, see `splinter_selenium_speed_commands`, are
+    sent at most once every `speed` seconds.
+
     Returns:
-        int
+        float
     """
     return request.config.option.splinter_webdriver_speed
 
 
+@pytest.fixture(scope="session")
+def splinter_selenium_speed_commands():
+    """Get the Selenium commands slowed down by the speed.
+
+    Returns:
+        set: Names of the commands, ie: 'get' or 'clickElement'.
+    """
+    return set(THROTTLED_COMMANDS)
+
+
 @pytest.fixture(scope="session")  # pragma: no cover
 def splinter_browser_load_condition():
     """Return the condition that has to be `True` to assume that the page is fully loaded.
@@ -191,6 +292,28 @@ def splinter_browser_load_timeout():
     return 10
 
 
+@pytest.fixture(scope="session")
+def splinter_wait_poll_initial() -> float:
+    """First poll interval of `wait_for_condition`, in seconds.
+
+    The interval doubles after each check of the condition.
+
+    Returns:
+        float
+    """
+    return DEFAULT_WAIT_POLL_INITIAL
+
+
+@pytest.fixture(scope="session")
+def splinter_wait_poll_max() -> float:
+    """Longest poll interval of `wait_for_condition`, in seconds.
+
+    Returns:
+        float
+    """
+    return DEFAULT_WAIT_POLL_MAX
+
+
 @pytest.fixture(scope="session")  # pragma: no cover
 def splinter_file_download_dir(session_tmpdir):
     """Browser file download directory."""
@@ -258,43 +381,51 @@ def splinter_logs_dir():
 
 
 @pytest.fixture(scope='session')
-def _splinter_driver_default_kwargs(splinter_logs_dir, splinter_remote_name):
-    """Sane defaults for the various driver arguments."""
-    os.makedirs(splinter_logs_dir, exist_ok=True)
-
-    options = {
-        'chrome': {},
-        'firefox': {},
-        'edge': {},
-    }
+def _splinter_driver_default_kwargs(request, splinter_logs_dir, splinter_remote_name):
+    """Sane defaults for the various driver arguments.
 
+    The arguments of a driver, ie: its executable path, are resolved when
+    the driver is first used.
+    """
     cwd = os.getcwd()
+    resolver = get_executable_resolver(request.config)
+
+    def logs_dir():
+        os.makedirs(splinter_logs_dir, exist_ok=True)
+        return splinter_logs_dir
 
-    driver_kwargs = {
-        'chrome': {
-            'executable_path': get_executable_path(cwd, 'chromedriver'),
+    def chrome():
+        return {
+            'executable_path': get_executable_path(cwd, 'chromedriver', resolver),
             'service_args': [
                 '--verbose',
-                f"--log-path={splinter_logs_dir}/chromedriver.log",
+                f"--log-path={logs_dir()}/chromedriver.log",
             ],
-            'options': options['chrome'],
-        },
-        'firefox': {
-            'executable_path': get_executable_path(cwd, 'geckodriver'),
-            'service_log_path': f"{splinter_logs_dir}/geckodriver.log",
-            'options': options['firefox'],
-        },
-        'edge': {
-            'executable_path': get_executable_path(cwd, 'edgedriver'),
-            'options': options['edge'],
-        },
-        'remote': {},
-        'django': {},
-        'flask': {},
-        'zope.testbrowser': {},
-    }
-
-    return driver_kwargs
+            'options': {},
+        }
+
+    def firefox():
+        return {
+            'executable_path': get_executable_path(cwd, 'geckodriver', resolver),
+            'service_log_path': f"{logs_dir()}/geckodriver.log",
+            'options': {},
+        }
+
+    def edge():
+        return {
+            'executable_path': get_executable_path(cwd, 'edgedriver', resolver),
+            'options': {},
+        }
+
+    return DriverKwargs({
+        'chrome': chrome,
+        'firefox': firefox,
+        'edge': edge,
+        'remote': dict,
+        'django': dict,
+        'flask': dict,
+        'zope.testbrowser': dict,
+    })
 
 
 @pytest.fixture(scope="session")
@@ -321,6 +452,27 @@ def splinter_screenshot_dir(request):
     return os.path.abspath(request.config.option.splinter_screenshot_dir)
 
 
+@pytest.fixture(scope="session")
+def splinter_screenshot_async(request) -> bool:
+    """Flag to write screenshots in a background thread.
+
+    Returns:
+        bool
+    """
+    return request.config.option.splinter_screenshot_async
+
+
+@pytest.fixture(scope="session")
+def _splinter_screenshot_writer(request, splinter_screenshot_async):
+    """Background writer for screenshots, if enabled."""
+    if not splinter_screenshot_async:
+        return None
+
+    writer = ScreenshotWriter()
+    request.addfinalizer(writer.close)
+    return writer
+
+
 @pytest.fixture(scope="session")
 def splinter_headless(request):
     """Flag to start the browser in headless mode."""
@@ -334,27 +486,308 @@ def splinter_screenshot_encoding(request):
 
 
 @pytest.fixture(scope="session")
-def browser_pool(request, splinter_close_browser):
-    """Browser 'pool' to emulate session scope but with possibility to recreate browser."""
-    pool = {}
+def splinter_browser_pool_size(request) -> int:
+    """Maximum number of browsers kept alive by the browser pool.
 
-    def fin():
-        for browser in pool.values():
-            try:
-                browser.quit()
-            except Exception:  # NOQA
-                pass
+    When set, function scoped browsers are returned to the pool after each test
+    and reused instead of being closed. 0 disables reuse of function scoped
+    browsers and does not limit session scoped ones.
+
+    Returns:
+        int
+    """
+    return request.config.option.splinter_browser_pool_size
+
+
+@pytest.fixture(scope="session")
+def splinter_browser_pool_max_uses(request) -> int:
+    """Get the number of tests a pooled browser serves before it is replaced.
+
+    Returns:
+        int: 0 means no limit.
+    """
+    return request.config.option.splinter_browser_pool_max_uses
+
+
+@pytest.fixture(scope="session")
+def splinter_browser_max_memory(request) -> int:
+    """Get the resident memory, in MB, above which a pooled browser is replaced.
+
+    Returns:
+        int: 0 means no limit.
+    """
+    return request.config.option.splinter_browser_max_memory
+
+
+@pytest.fixture(scope="session")
+def splinter_browser_max_cpu(request) -> float:
+    """Get the CPU usage, in percent, above which a pooled browser is replaced.
+
+    The usage is measured between two checkouts of the browser.
+
+    Returns:
+        float: 0 means no limit.
+    """
+    return request.config.option.splinter_browser_max_cpu
+
+
+@pytest.fixture(scope="session")
+def splinter_browser_max_uptime(request) -> float:
+    """Get the number of seconds after which a pooled browser is replaced.
+
+    Returns:
+        float: 0 means no limit.
+    """
+    return request.config.option.splinter_browser_max_uptime
+
+
+@pytest.fixture(scope="session")
+def splinter_retry_policy(request):
+    """Get the policy for retrying failed browser launches and replacements.
+
+    Returns:
+        RetryPolicy
+    """
+    return get_retry_policy(request.config)
+
+
+@pytest.fixture(scope="session")
+def splinter_browser_prewarm(request) -> int:
+    """Get the number of browsers to keep launching in the background.
+
+    Prewarmed browsers are handed out when a new browser is needed, so tests
+    do not wait for the driver to start. Useful with function scoped browsers,
+    browsers reused from the session or the pool are not prewarmed.
+
+    Returns:
+        int: 0 disables prewarming.
+    """
+    return request.config.option.splinter_browser_prewarm
+
+
+@pytest.fixture(scope="session")
+def splinter_http_cache(request) -> str:
+    """Mode of the caching proxy between the browser and the network.
+
+    * off: No proxy.
+    * cache: Static responses are cached.
+    * record: Every GET response is saved to `splinter_http_cache_dir`.
+    * replay: GET requests are only served from `splinter_http_cache_dir`.
+
+    Returns:
+        str
+    """
+    return request.config.option.splinter_http_cache
+
+
+@pytest.fixture(scope="session")
+def splinter_http_cache_dir(request, splinter_http_cache) -> Optional[str]:
+    """Directory the caching proxy saves responses in.
+
+    Responses are only kept in memory when None.
+
+    Returns:
+        str
+    """
+    cache_dir = request.config.option.splinter_http_cache_dir
+    if cache_dir is None and splinter_http_cache in ("record", "replay"):
+        cache_dir = ".splinter-http-cache"
+    return cache_dir
+
+
+@pytest.fixture(scope="session")
+def splinter_blocked_url_patterns(request) -> List[str]:
+    """Url patterns the browser does not load, ie: analytics, ads or fonts.
+
+    Patterns use `*` wildcards, ie: `*://*.doubleclick.net/*` or `*.woff2`,
+    other characters match themselves. Chromium browsers block them with
+    DevTools, in the tab of the test only, other local browsers with a proxy.
+    Only the server is matched for HTTPS requests going through the proxy.
+    Remote browsers do not block urls.
+
+    Returns:
+        list
+    """
+    return request.config.option.splinter_blocked_url_patterns
+
+
+@pytest.fixture(scope="session")
+def _splinter_http_proxy(
+    request,
+    splinter_http_cache,
+    splinter_http_cache_dir,
+    splinter_blocked_url_patterns,
+):
+    """Start the caching proxy, if enabled or needed to block urls.
+
+    Only requested by the browsers using it, ie: chrome blocks urls itself.
+    """
+    if splinter_http_cache == "off" and not splinter_blocked_url_patterns:
+        return None
+
+    cache = ResponseCache(
+        max_bytes=request.config.option.splinter_http_cache_size * 1024 * 1024,
+        directory=splinter_http_cache_dir,
+    )
+    proxy = CachingProxy(
+        mode=splinter_http_cache,
+        cache=cache,
+        blocked_url_patterns=splinter_blocked_url_patterns,
+    ).start()
+    request.addfinalizer(proxy.stop)
+    return proxy
+
+
+def _setup_http_proxy(proxy, driver_name, options):
+    """Send the requests of a local browser through a proxy."""
+    host, port = proxy.address
+
+    if driver_name == "chrome":
+        # Chromium blocks urls itself, the proxy is only needed to cache.
+        if proxy.mode != "off":
+            options.add_argument(f"--proxy-server={proxy.url}")
+            # Include the application under test running on localhost.
+            options.add_argument("--proxy-bypass-list=<-loopback>")
+        return
+
+    options.set_preference("network.proxy.type", 1)
+    options.set_preference("network.proxy.http", host)
+    options.set_preference("network.proxy.http_port", port)
+    options.set_preference("network.proxy.ssl", host)
+    options.set_preference("network.proxy.ssl_port", port)
+    options.set_preference("network.proxy.no_proxies_on", "")
+    # Blocked urls are third party, the application under test on localhost
+    # only goes through the proxy to be cached.
+    options.set_preference("network.proxy.allow_hijacking_localhost", proxy.mode != "off")
+
+
+def _warn_remote_http_proxy(http_cache, blocked_url_patterns):
+    """Warn that remote browsers do not use the proxy, nor block urls.
+
+    The proxy listens on the loopback interface of this host, which is the
+    grid node for a remote browser, and remote webdrivers do not have the
+    DevTools commands Chromium browsers block urls with.
+    """
+    if http_cache != "off":
+        warnings.warn(pytest.PytestWarning(
+            "--splinter-http-cache only applies to local browsers, "
+            "remote browsers can not reach the proxy",
+        ))
+    if blocked_url_patterns:
+        warnings.warn(pytest.PytestWarning(
+            "--splinter-block-url only applies to local browsers, "
+            "remote browsers load every url",
+        ))
+
+
+@pytest.fixture(scope="session")
+def splinter_isolation(request) -> str:
+    """Isolation of the browser state between tests.
+
+    * process: Each test gets a new browser.
+    * context: Each test gets a new browser context. Chromium only, other
+      browsers are cleaned like with 'cookies'.
+    * cookies: Browsers are reused, after deleting cookies and web storage.
+
+    Returns:
+        str
+    """
+    return request.config.option.splinter_isolation
+
+
+@pytest.fixture(scope="session")
+def splinter_concurrent_commands(request) -> int:
+    """Get the maximum number of setup commands sent at the same time to a remote grid.
+
+    Settings and cleaning commands which do not depend on each other are
+    sent concurrently between tests, so they cost about one round trip.
+
+    Returns:
+        int: 0 sends commands one by one.
+    """
+    return request.config.option.splinter_concurrent_commands
+
+
+@pytest.fixture(scope="session")
+def splinter_driver_service_reuse(request) -> bool:
+    """Flag to keep driver services, ie: chromedriver, running for the next browser.
+
+    Returns:
+        bool
+    """
+    return request.config.option.splinter_driver_service_reuse == "true"
+
+
+@pytest.fixture(scope="session")
+def _splinter_driver_services(request, splinter_close_browser, splinter_driver_service_reuse):
+    """Get the manager of the driver services shared by browsers."""
+    if not splinter_driver_service_reuse:
+        return None
+
+    manager = DriverServiceManager()
+
+    # Stopping a driver service closes its browser.
+    if splinter_close_browser:
+        request.addfinalizer(manager.close)
+
+    return manager
+
+
+@pytest.fixture(scope="session")
+def _splinter_remote_connections(request):
+    """Get the connections to Selenium grids shared by remote browsers."""
+    connections = RemoteConnections(
+        pool_size=request.config.option.splinter_remote_pool_size,
+        registry=get_session_registry(request.config),
+    )
+    request.addfinalizer(connections.close)
+    return connections
+
+
+@pytest.fixture(scope="session")
+def browser_pool(
+    request,
+    splinter_close_browser,
+    splinter_browser_pool_size,
+    splinter_browser_pool_max_uses,
+    splinter_browser_max_memory,
+    splinter_browser_max_cpu,
+    splinter_browser_max_uptime,
+    _splinter_driver_services,
+    _splinter_remote_connections,
+):
+    """Browser pool to emulate session scope but with possibility to recreate browser.
+
+    The pool is closed before the driver services and remote connections used by its browsers.
+    """
+    monitor = get_health_monitor(request.config)
+    # The limit fixtures can be overridden.
+    monitor.set_limits(
+        max_memory=splinter_browser_max_memory,
+        max_cpu=splinter_browser_max_cpu,
+        max_uptime=splinter_browser_max_uptime,
+    )
+
+    pool = BrowserPool(
+        max_size=splinter_browser_pool_size,
+        max_uses=splinter_browser_pool_max_uses,
+        health_check=monitor.check if monitor.enabled else None,
+    )
 
     if splinter_close_browser:
-        request.addfinalizer(fin)
+        request.addfinalizer(pool.close)
 
     return pool
 
 
 @pytest.fixture(scope="session")
-def browser_patches():
+def browser_patches(request):
     """Browser monkey patches."""
-    patch_webdriver()
+    profiler = None
+    if request.config.option.splinter_profile_commands:
+        profiler = get_command_profiler(request.config)
+
+    patch_webdriver(profiler=profiler)
 
 
 @pytest.fixture(scope="session")
@@ -401,11 +834,113 @@ def splinter_clean_cookies_urls():
     return []
 
 
+def _take_screenshot_in_memory(
+    request,
+    browser_instance,
+    screenshot_path,
+    classname,
+    screenshot_writer=None,
+    artifact_store=None,
+):
+    """Capture a screenshot as .png and .html without going through files.
+
+    The content is sent to the xdist controller, saved in the artifact store
+    or left to the screenshot writer.
+    """
+    encoding = request.getfixturevalue('splinter_screenshot_encoding')
+    slaveoutput = getattr(request.config, "workeroutput", None)
+    use_store = request.config.option.splinter_artifact_store
+
+    screenshot_html_path = f"{screenshot_path}.html"
+    screenshot_png_path = f"{screenshot_path}.png"
+    files = []
+
+    try:
+        files.append({
+            "file_name": screenshot_html_path,
+            "content": browser_instance.html,
+            "encoding": encoding,
+        })
+    except Exception as e:  # NOQA
+        screenshot_html_path = ''
+        warnings.warn(pytest.PytestWarning(
+            "Could not save html snapshot: {}".format(e)))
+
+    try:
+        png_base64 = browser_instance.driver.get_screenshot_as_base64()
+        if use_store:
+            png = {"content": decode_png(png_base64)}
+        else:
+            png = {"content": png_base64, "base64": True}
+        files.append({"file_name": screenshot_png_path, **png})
+    except Exception as e:  # NOQA
+        screenshot_png_path = ''
+        warnings.warn(pytest.PytestWarning(
+            "Could not save screenshot: {}".format(e)))
+
+    if use_store:
+        # Blobs are addressed by the digest of the content.
+        for file in files:
+            file["digest"] = content_digest(file["content"], file.get("encoding"))
+
+        if artifact_store is not None:
+            for file in files:
+                blob_path = artifact_store.blob_path(file["digest"], file["file_name"])
+                if file["file_name"] == screenshot_html_path:
+                    screenshot_html_path = blob_path
+                else:
+                    screenshot_png_path = blob_path
+
+    # Under xdist, the controller adds the paths of the files it writes to the report.
+    if slaveoutput is None and request.node.splinter_failure.longrepr:
+        reprtraceback = request.node.splinter_failure.longrepr.reprtraceback
+        reprtraceback.extraline = screenshot_extraline(
+            screenshot_png_path, screenshot_html_path,
+        )
+
+    if slaveoutput is not None:
+        # The controller decodes and writes the files.
+        sent_digests = get_sent_digests(request.config)
+        for file in files:
+            file["file_name"] = os.path.basename(file["file_name"])
+            if "digest" in file:
+                # The controller already has this blob.
+                if file["digest"] in sent_digests:
+                    del file["content"]
+                sent_digests.add(file["digest"])
+        queue_for_controller(request.node, classname, files)
+        return
+
+    if artifact_store is not None:
+        for file in files:
+            save = functools.partial(
+                artifact_store.add,
+                request.node.nodeid,
+                classname,
+                os.path.basename(file["file_name"]),
+                file["content"],
+                file.get("encoding"),
+                file["digest"],
+            )
+            if screenshot_writer is not None:
+                screenshot_writer.submit(save)
+            else:
+                save()
+        return
+
+    for file in files:
+        if file.get("base64"):
+            screenshot_writer.write_png(file["file_name"], file["content"])
+        else:
+            screenshot_writer.write(file["file_name"], file["content"], encoding)
+
+
 def _take_screenshot(
     request,
     browser_instance,
     fixture_name,
     session_tmpdir,
+    screenshot_writer=None,
 ):
     """Capture a screenshot as .png and .html.
 
@@ -424,7 +959,7 @@ def _take_screenshot(
     screenshot_file_name = f"{name_0}-{fixture_name}".replace(os.path.sep, "-")
 
     slaveoutput = getattr(request.config, "workeroutput", None)
-    if not slaveoutput:
+    if slaveoutput is None:
         os.makedirs(screenshot_dir, exist_ok=True)
     else:
         screenshot_dir = session_tmpdir.ensure("screenshots", dir=True).strpath
@@ -433,6 +968,18 @@ def _take_screenshot(
 
     LOGGER.info(f"Saving screenshot to {screenshot_dir}")
 
+    artifact_store = get_artifact_store(request.config)
+    in_memory = screenshot_writer is not None or request.config.option.splinter_artifact_store
+    if in_memory and hasattr(browser_instance, "driver"):
+        return _take_screenshot_in_memory(
+            request,
+            browser_instance,
+            screenshot_path,
+            classname,
+            screenshot_writer,
+            artifact_store,
+        )
+
     screenshot_html_path: str = ''
     screenshot_png_path: str = ''
 
@@ -452,9 +999,10 @@ def _take_screenshot(
         warnings.warn(pytest.PytestWarning(
             "Could not save screenshot: {}".format(e)))
 
-    if request.node.splinter_failure.longrepr:
+    # Under xdist, the controller adds the paths of the files it writes to the report.
+    if slaveoutput is None and request.node.splinter_failure.longrepr:
         reprtraceback = request.node.splinter_failure.longrepr.reprtraceback
-        reprtraceback.extraline = _screenshot_extraline(
+        reprtraceback.extraline = screenshot_extraline(
             screenshot_png_path, screenshot_html_path,
         )
 
@@ -466,21 +1014,20 @@ def _take_screenshot(
                 screenshot_html_path, encoding=encoding,
             ) as html_fd:
                 with open(screenshot_png_path, "rb") as fd:
-                    slaveoutput.setdefault("screenshots", []).append(
-                        {
-                            "class_name": classname,
-                            "files": [
-                                {
-                                    "file_name": screenshot_png_path,
-                                    "content": fd.read(),
-                                },
-                                {
-                                    "file_name": screenshot_html_path,
-                                    "content": html_fd.read(),
-                                    "encoding": encoding,
-                                },
-                            ],
-                        },
+                    queue_for_controller(
+                        request.node,
+                        classname,
+                        [
+                            {
+                                "file_name": os.path.basename(screenshot_png_path),
+                                "content": fd.read(),
+                            },
+                            {
+                                "file_name": os.path.basename(screenshot_html_path),
+                                "content": html_fd.read(),
+                                "encoding": encoding,
+                            },
+                        ],
                     )
     except Exception as e:  # NOQA
         warnings.warn(pytest.PytestWarning(
@@ -493,6 +1040,7 @@ def _browser_screenshot_session(
     session_tmpdir,
     splinter_session_scoped_browser,
     splinter_make_screenshot_on_failure,
+    _splinter_screenshot_writer,
 ):
     """Make browser screenshot on test failure."""
     yield
@@ -511,16 +1059,47 @@ def _browser_screenshot_session(
         )
 
         if should_take_screenshot:
-            _take_screenshot(
-                request=request,
-                fixture_name=name,
-                session_tmpdir=session_tmpdir,
-                browser_instance=value,
-            )
+            with get_timings(request.config).measure("take_screenshot"):
+                _take_screenshot(
+                    request=request,
+                    fixture_name=name,
+                    session_tmpdir=session_tmpdir,
+                    browser_instance=value,
+                    screenshot_writer=_splinter_screenshot_writer,
+                )
+
+
+def _pending_browser_fixtures(request) -> List[str]:
+    """Get the browser fixtures of the current test that are not set up yet.
+
+    Browser fixtures are the ones using `browser_instance_getter`.
+    """
+    item = getattr(request, "_pyfuncitem", None)
+    if item is None:
+        return []
+
+    names = []
+    for name, fixturedefs in item._fixtureinfo.name2fixturedefs.items():
+        if name == request.fixturename or not fixturedefs:
+            continue
+
+        fixturedef = fixturedefs[-1]
+        if (
+            "browser_instance_getter" in fixturedef.argnames
+            and fixturedef.cached_result is None
+        ):
+            names.append(name)
+
+    return names
 
 
 def _setup_firefox_profile(request, options):
-    """Put custom Firefox profile into an options object."""
+    """Put custom Firefox profile into an options object.
+
+    The profile is built once per unique directory, and applied once to each
+    options object. Preferences are only sent with the options, geckodriver
+    writes them into the profile.
+    """
     splinter_firefox_profile_directory = request.getfixturevalue(
         'splinter_firefox_profile_directory',
     )
@@ -528,12 +1107,27 @@ def _setup_firefox_profile(request, options):
         'splinter_firefox_profile_preferences',
     )
 
-    # Create custom profile
-    options.set_preference('profile', splinter_firefox_profile_directory)
+    profile_cache = get_profile_cache(request.config)
+    key = (
+        profile_cache.key(splinter_firefox_profile_directory),
+        sorted(splinter_firefox_profile_preferences.items()),
+    )
+    if getattr(options, "_splinter_profile_key", None) == key:
+        return
 
     # Set profile preferences
-    for key, value in splinter_firefox_profile_preferences.items():
-        options.set_preference(key, value)
+    for name, value in splinter_firefox_profile_preferences.items():
+        options.set_preference(name, value)
+
+    # Create custom profile
+    profile = profile_cache.get(splinter_firefox_profile_directory)
+    if profile is not None:
+        # Selenium 4.8 deprecates the setter, but it is kept by later versions.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            options.profile = profile
+
+    options._splinter_profile_key = key
 
 
 @pytest.fixture(scope="session")
@@ -543,6 +1137,8 @@ def browser_instance_getter(
     splinter_session_scoped_browser,
     splinter_browser_load_condition,
     splinter_browser_load_timeout,
+    splinter_wait_poll_initial,
+    splinter_wait_poll_max,
     splinter_driver_kwargs,
     splinter_remote_name,
     splinter_make_screenshot_on_failure,
@@ -551,12 +1147,24 @@ def browser_instance_getter(
     splinter_wait_time,
     splinter_selenium_socket_timeout,
     splinter_selenium_speed,
+    splinter_selenium_speed_commands,
     splinter_window_size,
     splinter_browser_class,
     splinter_clean_cookies_urls,
     splinter_headless,
+    splinter_browser_prewarm,
     session_tmpdir,
     browser_pool,
+    _splinter_screenshot_writer,
+    _splinter_driver_services,
+    _splinter_remote_connections,
+    _splinter_remote_balancer,
+    splinter_isolation,
+    splinter_blocked_url_patterns,
+    splinter_http_cache,
+    splinter_retry_policy,
+    splinter_concurrent_commands,
+    _splinter_driver_default_kwargs,
 ):
     """Splinter browser instance getter.
 
@@ -564,40 +1172,90 @@ def browser_instance_getter(
 
     :return: function(parent). New instance of plugin.Browser class.
     """
-    _chrome_options = request.getfixturevalue('chrome_options')
-    _firefox_options = request.getfixturevalue('firefox_options')
+    timings = get_timings(request.config)
 
-    _default_kwargs = request.getfixturevalue(
-        '_splinter_driver_default_kwargs')
+    session_options = {}
 
-    def get_browser(splinter_webdriver, retry_count=3):
+    def prepare_driver(splinter_webdriver):
+        """Resolve and prepare the session options of a webdriver.
 
-        # Set options objects into kwargs
-        if splinter_webdriver == 'chrome':
-            _default_kwargs['chrome']['options'] = _chrome_options
+        Called by the launcher in the main thread before the webdriver is
+        first launched, as pytest fixtures can not be resolved from the
+        threads launching browsers in the background.
+        """
+        if splinter_webdriver == 'remote':
+            driver_name = splinter_remote_name
+        else:
+            driver_name = splinter_webdriver
+
+        if splinter_webdriver == 'remote':
+            _warn_remote_http_proxy(splinter_http_cache, splinter_blocked_url_patterns)
+
+        if driver_name not in ('chrome', 'firefox'):
+            return
+
+        options = request.getfixturevalue(f'{driver_name}_options')
+        if driver_name == 'firefox':
+            _setup_firefox_profile(request, options)
+
+        # The proxy is only started for the browsers using it.
+        uses_proxy = splinter_http_cache != "off" or (
+            driver_name == 'firefox' and splinter_blocked_url_patterns
+        )
+        if splinter_webdriver != 'remote' and uses_proxy:
+            # The options fixture is shared with remote browsers.
+            options = copy_options(options)
+            proxy = request.getfixturevalue('_splinter_http_proxy')
+            _setup_http_proxy(proxy, driver_name, options)
 
-        elif splinter_webdriver == 'firefox':
-            _default_kwargs['firefox']['options'] = _firefox_options
-            _setup_firefox_profile(request, _firefox_options)
+        session_options[splinter_webdriver] = options
 
-        if splinter_remote_name == 'chrome':
-            _default_kwargs['remote']['options'] = _chrome_options
+    def get_options(splinter_webdriver):
+        """Get a copy of the session options of a webdriver.
 
-        elif splinter_remote_name == 'firefox':
-            _default_kwargs['remote']['options'] = _firefox_options
-            _setup_firefox_profile(request, _firefox_options)
+        The session options are never given to splinter, so browsers started
+        concurrently do not share state.
+        """
+        return copy_options(session_options.get(splinter_webdriver))
+
+    def launch_browser(splinter_webdriver):
+        driver_kwargs = dict(_splinter_driver_default_kwargs.get(splinter_webdriver, {}))
+
+        # Set options objects into kwargs
+        options = get_options(splinter_webdriver)
+        if options is not None:
+            driver_kwargs['options'] = options
+
+        # Each attempt can go to another grid.
+        balancer = _splinter_remote_balancer if splinter_webdriver == 'remote' else None
+        remote_url = balancer.choose() if balancer is not None else splinter_remote_url
 
         kwargs = get_args(
             driver=splinter_webdriver,
-            remote_url=splinter_remote_url,
+            remote_url=remote_url,
             headless=splinter_headless,
             driver_kwargs={
-                **_default_kwargs.get(splinter_webdriver, {}),
+                **driver_kwargs,
                 **splinter_driver_kwargs,
             },
         )
+
+        service = None
+        if (
+            _splinter_driver_services is not None
+            and _splinter_driver_services.supports(splinter_webdriver)
+            and "service" not in kwargs
+        ):
+            service = _splinter_driver_services.acquire(splinter_webdriver, kwargs)
+            kwargs["service"] = service
+
+        if splinter_webdriver == "remote" and isinstance(kwargs.get("command_executor"), str):
+            kwargs["command_executor"] = _splinter_remote_connections.get(
+                kwargs["command_executor"],
+            )
+
         try:
-            return splinter_browser_class(
+            browser = splinter_browser_class(
                 splinter_webdriver,
                 visit_condition=splinter_browser_load_condition,
                 visit_condition_timeout=splinter_browser_load_timeout,
@@ -605,27 +1263,88 @@ def browser_instance_getter(
                 **kwargs,
             )
         except Exception:  # NOQA
-            if retry_count > 1:
-                return get_browser(splinter_webdriver, retry_count - 1)
-            else:
-                raise
+            if balancer is not None:
+                balancer.failed(remote_url)
+            # The service is left running for the next attempt.
+            if service is not None:
+                _splinter_driver_services.release(service)
+            raise
+
+        if balancer is not None:
+            balancer.succeeded(remote_url)
+
+        if hasattr(browser, "wait_for_condition"):
+            browser.wait_for_condition = timings.wrap(
+                "wait_for_condition", browser.wait_for_condition,
+            )
+        return browser
 
-    def prepare_browser(request, parent, retry_count=3):
+    def get_browser(splinter_webdriver):
+        return splinter_retry_policy.call("get_browser", launch_browser, splinter_webdriver)
+
+    launcher = BrowserLauncher(
+        timings.wrap("get_browser", get_browser),
+        prewarm=splinter_browser_prewarm,
+        prepare=prepare_driver,
+    )
+    request.addfinalizer(launcher.close)
+
+    # Pool keys of the browser fixtures, by fixture name.
+    pool_keys = {}
+
+    reset_browser = BrowserReset(
+        implicit_wait=splinter_selenium_implicit_wait,
+        speed=splinter_selenium_speed,
+        speed_commands=splinter_selenium_speed_commands,
+        socket_timeout=splinter_selenium_socket_timeout,
+        window_size=splinter_window_size,
+        clean_cookies_urls=splinter_clean_cookies_urls,
+        isolation=splinter_isolation,
+        blocked_url_patterns=splinter_blocked_url_patterns,
+        concurrent_commands=splinter_concurrent_commands,
+    )
+    request.addfinalizer(reset_browser.close)
+
+    def prepare_browser(request, parent, retry=None):
+        retry = retry or splinter_retry_policy.start("prepare_browser")
         splinter_webdriver = request.getfixturevalue("splinter_webdriver")
         splinter_session_scoped_browser = request.getfixturevalue(
             "splinter_session_scoped_browser",
         )
         splinter_close_browser = request.getfixturevalue(
             "splinter_close_browser")
-        browser_key = id(parent)
-        browser = browser_pool.get(browser_key)
-        if not splinter_session_scoped_browser:
-            browser = get_browser(splinter_webdriver)
+
+        # Browsers are shared between tests, unless each test needs its own process.
+        reuse_browsers = splinter_isolation != "process" and (
+            splinter_session_scoped_browser or browser_pool.max_size
+        )
+
+        def new_browser():
+            # Other browsers needed by the test start at the same time,
+            # unless the pool has one for them.
+            pending = _pending_browser_fixtures(request)
+            if reuse_browsers:
+                pending = [
+                    name for name in pending
+                    if not (name in pool_keys and browser_pool.reusable(pool_keys[name]))
+                ]
+            # Reused browsers are only replaced once in a while, prewarmed
+            # browsers would wait for them for the whole session.
+            return launcher.get(
+                splinter_webdriver, ahead=len(pending), prewarm=not reuse_browsers,
+            )
+
+        if reuse_browsers:
+            pool_keys[request.fixturename] = id(parent)
+            browser = browser_pool.checkout(id(parent), new_browser)
+            if request.scope == "function":
+                request.addfinalizer(
+                    functools.partial(browser_pool.checkin, browser),
+                )
+        else:
+            browser = new_browser()
             if splinter_close_browser:
                 request.addfinalizer(browser.quit)
-        elif not browser:
-            browser = browser_pool[browser_key] = get_browser(
-                splinter_webdriver)
 
         if request.scope == "function":
 
@@ -633,78 +1352,54 @@ def browser_instance_getter(
                 if splinter_make_screenshot_on_failure and getattr(
                     request.node, "splinter_failure", True,
                 ):
-                    _take_screenshot(
-                        request=request,
-                        fixture_name=parent.__name__,
-                        session_tmpdir=session_tmpdir,
-                        browser_instance=browser,
-                    )
+                    with timings.measure("take_screenshot"):
+                        _take_screenshot(
+                            request=request,
+                            fixture_name=parent.__name__,
+                            session_tmpdir=session_tmpdir,
+                            browser_instance=browser,
+                            screenshot_writer=_splinter_screenshot_writer,
+                        )
 
             request.addfinalizer(_take_screenshot_on_failure)
 
         try:
             if splinter_webdriver not in browser.driver_name.lower():
-                return _replace_browser(
-                    request, browser, retry_count, browser_pool, browser_key, parent,
+                raise WebDriverException(
+                    f"Expected a {splinter_webdriver} browser, got {browser.driver_name}",
                 )
 
-            if hasattr(browser, "driver"):
-                browser.driver.implicitly_wait(splinter_selenium_implicit_wait)
-                browser.driver.set_speed(splinter_selenium_speed)
-                browser.driver.command_executor.set_timeout(
-                    splinter_selenium_socket_timeout,
-                )
-                browser.driver.command_executor._conn.timeout = (
-                    splinter_selenium_socket_timeout
-                )
-                if splinter_window_size:
-                    browser.driver.set_window_size(*splinter_window_size)
-
-            try:
-                browser.cookies.delete_all()
-            except (IOError, HTTPException, WebDriverException):
-                LOGGER.warning("Error cleaning browser cookies", exc_info=True)
-
-            for url in splinter_clean_cookies_urls:
-                browser.visit(url)
-                browser.cookies.delete_all()
+            with timings.measure("reset_browser"):
+                reset_browser(browser, splinter_webdriver)
 
             if hasattr(browser, "driver"):
                 browser.visit_condition = splinter_browser_load_condition
                 browser.visit_condition_timeout = splinter_browser_load_timeout
+                browser.wait_poll_initial = splinter_wait_poll_initial
+                browser.wait_poll_max = splinter_wait_poll_max
 
-                # Let firefox preferences handle this.
-                if splinter_webdriver != 'firefox':
-                    browser.visit("about:blank")
-
-        except (HTTPException, WebDriverException, MaxRetryError):
-            return _replace_browser(
-                request, browser, retry_count, browser_pool, browser_key, parent,
-            )
+        except (HTTPException, WebDriverException, MaxRetryError) as e:
+            return _replace_browser(request, browser, retry, parent, e)
 
         return browser
 
-    def _replace_browser(request, browser, retry_count, browser_pool, browser_key, parent):
-        splinter_webdriver = request.getfixturevalue("splinter_webdriver")
-
+    def _replace_browser(request, browser, retry, parent, error):
         # we lost browser, try to restore the justice
-        try:
-            browser.quit()
-        except Exception:  # NOQA
-            pass
+        browser_pool.discard(browser)
+        with timings.measure("replace_browser"):
+            try:
+                browser.quit()
+            except Exception:  # NOQA
+                pass
 
-        LOGGER.warning("Error preparing the browser", exc_info=True)
+        LOGGER.warning("Error preparing the browser", exc_info=error)
 
-        if retry_count < 1:
-            raise
-        else:
-            browser = browser_pool[browser_key] = get_browser(
-                splinter_webdriver)
-            prepare_browser(request, parent, retry_count - 1)
+        if not retry.again(error):
+            raise error
 
-        return browser
+        return prepare_browser(request, parent, retry)
 
-    return prepare_browser
+    return timings.wrap("prepare_browser", prepare_browser)
 
 
 @pytest.fixture
@@ -721,7 +1416,10 @@ def session_browser(request, browser_instance_getter):
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Assign the report to the item for futher usage."""
+    """Assign the report to the item for futher usage.
+
+    Under xdist, screenshots of the test are attached to its teardown report.
+    """
     outcome = yield
     rep = outcome.get_result()
     if rep.outcome == "failed":
@@ -729,13 +1427,113 @@ def pytest_runtest_makereport(item, call):
     else:
         item.splinter_failure = None
 
+    # Screenshots are taken during teardown, send them to the xdist controller.
+    if call.when == "teardown":
+        screenshots = item.__dict__.pop("splinter_screenshots", None)
+        if screenshots:
+            rep.splinter_screenshots = screenshots
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Attribute the browser timings to the test being run."""
+    timings = get_timings(item.config)
+    timings.nodeid = item.nodeid
+    yield
+    timings.nodeid = None
+
+
+def pytest_sessionfinish(session):
+    """Write the browser timings, or send them to the controller under xdist.
+
+    Also write the manifest of the artifact store.
+    """
+    config = session.config
+    workeroutput = getattr(config, "workeroutput", None)
+
+    artifact_store = get_artifact_store(config)
+    if artifact_store is not None:
+        artifact_store.write_manifest()
+
+    # Workers are done with the parked sessions once the controller finishes.
+    session_registry = get_session_registry(config)
+    if session_registry is not None and workeroutput is None:
+        session_registry.close()
+
+    if config.option.splinter_profile_commands and workeroutput is not None:
+        workeroutput["splinter_commands"] = get_command_profiler(config).to_dict()
+
+    retry_policy = get_retry_policy(config)
+    if retry_policy.failures and workeroutput is not None:
+        workeroutput["splinter_retries"] = retry_policy.to_dict()
+
+    health_monitor = get_health_monitor(config)
+    if health_monitor.recycled and workeroutput is not None:
+        workeroutput["splinter_recycled"] = health_monitor.to_dict()
+
+    if not (config.option.splinter_timings or config.option.splinter_timings_json):
+        return
+
+    timings = get_timings(config)
+    if workeroutput is not None:
+        workeroutput["splinter_timings"] = timings.records
+    elif config.option.splinter_timings_json:
+        timings.write_json(config.option.splinter_timings_json)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Print the browser timings, retries, recycled browsers and webdriver commands summaries."""
+    if config.option.splinter_timings:
+        get_timings(config).write_terminal_summary(terminalreporter)
+
+    retry_policy = get_retry_policy(config)
+    if retry_policy.failures:
+        retry_policy.write_terminal_summary(terminalreporter)
+
+    health_monitor = get_health_monitor(config)
+    if health_monitor.recycled:
+        health_monitor.write_terminal_summary(terminalreporter)
+
+    if config.option.splinter_profile_commands:
+        get_command_profiler(config).write_terminal_summary(terminalreporter)
+
 
 def pytest_configure(config):
-    """Register pytest-splinter's deferred plugin."""
-    if config.pluginmanager.getplugin("xdist"):
-        screenshot_dir = os.path.abspath(config.option.splinter_screenshot_dir)
+    """Create the artifact store and register pytest-splinter's deferred plugin."""
+    is_worker = hasattr(config, "workeroutput")
+    screenshot_dir = os.path.abspath(config.option.splinter_screenshot_dir)
+
+    # Check the browser health options before any test starts.
+    get_health_monitor(config)
+
+    # Workers send their screenshots to the store of the controller.
+    if config.option.splinter_artifact_store and not is_worker:
+        config.stash[store_key] = ArtifactStore(
+            screenshot_dir, compression=config.option.splinter_artifact_compression,
+        )
+
+    # Workers park remote sessions in the directory of the controller.
+    if is_worker:
+        registry_dir = config.workerinput.get("splinter_session_registry")
+    elif config.option.splinter_remote_session_reuse == "true":
+        registry_dir = tempfile.mkdtemp(prefix="splinter-sessions-")
+    else:
+        registry_dir = None
+
+    if registry_dir is not None:
+        config.stash[session_registry_key] = RemoteSessionRegistry(registry_dir)
+
+    if config.pluginmanager.getplugin("xdist") and not is_worker:
         config.pluginmanager.register(
-            SplinterXdistPlugin(screenshot_dir=screenshot_dir),
+            SplinterXdistPlugin(
+                screenshot_dir=screenshot_dir,
+                timings=get_timings(config),
+                profiler=get_command_profiler(config),
+                retry_policy=get_retry_policy(config),
+                health_monitor=get_health_monitor(config),
+                artifact_store=get_artifact_store(config),
+                session_registry=get_session_registry(config),
+            ),
         )
 
 
@@ -754,7 +1552,8 @@ def pytest_addoption(parser):  # pragma: no cover
     )
     group.addoption(
         "--splinter-remote-url",
-        help="splinter: URL for Remote Webdriver.",
+        help="splinter: URL for Remote Webdriver. Several comma separated urls spread "
+             "sessions across grids.",
         metavar="URL",
         dest="splinter_remote_url",
         default=None,
@@ -766,6 +1565,43 @@ def pytest_addoption(parser):  # pragma: no cover
         dest="splinter_remote_name",
         default="chrome",
     )
+    group.addoption(
+        "--splinter-remote-balance",
+        help="splinter: How sessions are spread across several remote urls. "
+             "Defaults to round-robin.",
+        dest="splinter_remote_balance",
+        metavar="round-robin|least-loaded|worker",
+        type=str,
+        choices=BALANCE_STRATEGIES,
+        default="round-robin",
+    )
+    group.addoption(
+        "--splinter-remote-cooldown",
+        help="splinter: Seconds a remote url is left out after failing to create a session. "
+             "Defaults to 30.",
+        type=float,
+        dest="splinter_remote_cooldown",
+        metavar="SECONDS",
+        default=30,
+    )
+    group.addoption(
+        "--splinter-remote-pool-size",
+        help="splinter: Number of connections kept open to each Selenium grid. Defaults to 10.",
+        type=int,
+        dest="splinter_remote_pool_size",
+        metavar="SIZE",
+        default=10,
+    )
+    group.addoption(
+        "--splinter-remote-session-reuse",
+        help="splinter: Park remote sessions when a browser quits, for the next browser on "
+             "the same host, ie: another pytest-xdist worker, to reuse.",
+        dest="splinter_remote_session_reuse",
+        metavar="false|true",
+        type=str,
+        choices=["false", "true"],
+        default="false",
+    )
     group.addoption(
         "--splinter-wait-time",
         help="splinter: Explicit wait, in seconds.",
@@ -784,8 +1620,9 @@ def pytest_addoption(parser):  # pragma: no cover
     )
     group.addoption(
         "--splinter-speed",
-        help="splinter: selenium speed, in seconds",
-        type=int,
+        help="splinter: selenium speed, in seconds. Navigation and interactions are "
+             "sent at most once every SECONDS.",
+        type=float,
         dest="splinter_webdriver_speed",
         metavar="SECONDS",
         default=0,
@@ -808,6 +1645,175 @@ def pytest_addoption(parser):  # pragma: no cover
         choices=["false", "true"],
         default="true",
     )
+    group.addoption(
+        "--splinter-http-cache",
+        help="splinter: Send browser requests through a caching proxy. 'cache' caches "
+             "static responses, 'record' saves every GET response to the cache directory "
+             "and 'replay' only serves responses from it. Defaults to off.",
+        action="store",
+        dest="splinter_http_cache",
+        choices=MODES,
+        default="off",
+    )
+    group.addoption(
+        "--splinter-http-cache-dir",
+        help="splinter: Directory the caching proxy saves responses in. "
+             "Defaults to .splinter-http-cache for record and replay, memory only otherwise.",
+        action="store",
+        dest="splinter_http_cache_dir",
+        metavar="DIR",
+        default=None,
+    )
+    group.addoption(
+        "--splinter-http-cache-size",
+        help="splinter: Size of the responses the caching proxy keeps in memory, in MB.",
+        action="store",
+        dest="splinter_http_cache_size",
+        type=int,
+        default=256,
+    )
+    group.addoption(
+        "--splinter-block-url",
+        help="splinter: Url pattern local browsers do not load, with * wildcards. "
+             "Can be used multiple times.",
+        action="append",
+        dest="splinter_blocked_url_patterns",
+        metavar="PATTERN",
+        default=[],
+    )
+    group.addoption(
+        "--splinter-isolation",
+        help="splinter: Isolation of the browser state between tests. "
+             "'process' starts a new browser for each test, 'context' opens a new "
+             "browser context (Chromium only) and 'cookies' deletes cookies and storage. "
+             "Defaults to cookies.",
+        action="store",
+        dest="splinter_isolation",
+        choices=["process", "context", "cookies"],
+        default="cookies",
+    )
+    group.addoption(
+        "--splinter-concurrent-commands",
+        help="splinter: Maximum number of setup commands sent at the same time to a remote grid "
+             "between tests. 0 sends them one by one. Defaults to 4.",
+        type=int,
+        dest="splinter_concurrent_commands",
+        metavar="COUNT",
+        default=4,
+    )
+    group.addoption(
+        "--splinter-driver-dir",
+        help="splinter: Directory searched for driver executables after the current directory "
+             "and PATH, with its subdirectories. Can be used multiple times. "
+             "~/.cache/selenium is always searched.",
+        action="append",
+        dest="splinter_driver_dirs",
+        metavar="DIR",
+        default=[],
+    )
+    group.addoption(
+        "--splinter-check-driver-version",
+        help="splinter: Use the driver executable matching the major version of the "
+             "installed browser, or the one provided by selenium-manager when none does. "
+             "Defaults to true.",
+        action="store",
+        dest="splinter_check_driver_version",
+        metavar="false|true",
+        type=str,
+        choices=["false", "true"],
+        default="true",
+    )
+    group.addoption(
+        "--splinter-reuse-driver-service",
+        help="splinter: Keep driver services, ie: chromedriver, running for the next browser. "
+             "Defaults to false.",
+        action="store",
+        dest="splinter_driver_service_reuse",
+        metavar="false|true",
+        type=str,
+        choices=["false", "true"],
+        default="false",
+    )
+    group.addoption(
+        "--splinter-browser-pool-size",
+        help="splinter: Maximum number of browsers kept alive for reuse. "
+             "When set, function scoped browsers are reused between tests. Defaults to 0.",
+        type=int,
+        dest="splinter_browser_pool_size",
+        metavar="SIZE",
+        default=0,
+    )
+    group.addoption(
+        "--splinter-browser-pool-max-uses",
+        help="splinter: Number of tests a pooled browser serves before it is replaced. "
+             "Defaults to 0 (no limit).",
+        type=int,
+        dest="splinter_browser_pool_max_uses",
+        metavar="COUNT",
+        default=0,
+    )
+    group.addoption(
+        "--splinter-browser-max-memory",
+        help="splinter: Resident memory, in MB, above which a browser is replaced between "
+             "tests. Requires psutil. Defaults to 0 (no limit).",
+        type=int,
+        dest="splinter_browser_max_memory",
+        metavar="MB",
+        default=0,
+    )
+    group.addoption(
+        "--splinter-browser-max-cpu",
+        help="splinter: CPU usage, in percent, above which a browser is replaced between "
+             "tests. Requires psutil. Defaults to 0 (no limit).",
+        type=float,
+        dest="splinter_browser_max_cpu",
+        metavar="PERCENT",
+        default=0,
+    )
+    group.addoption(
+        "--splinter-browser-max-uptime",
+        help="splinter: Seconds after which a browser is replaced between tests. "
+             "Defaults to 0 (no limit).",
+        type=float,
+        dest="splinter_browser_max_uptime",
+        metavar="SECONDS",
+        default=0,
+    )
+    group.addoption(
+        "--splinter-retry-attempts",
+        help="splinter: Number of attempts to launch or prepare a browser. Defaults to 3.",
+        type=int,
+        dest="splinter_retry_attempts",
+        metavar="COUNT",
+        default=3,
+    )
+    group.addoption(
+        "--splinter-retry-backoff",
+        help="splinter: Seconds to wait before retrying a failed browser launch, doubled "
+             "after each failure. Defaults to 0.5.",
+        type=float,
+        dest="splinter_retry_backoff",
+        metavar="SECONDS",
+        default=0.5,
+    )
+    group.addoption(
+        "--splinter-retry-budget",
+        help="splinter: Seconds after which a failed browser launch is not retried anymore. "
+             "Defaults to 60, 0 means no limit.",
+        type=float,
+        dest="splinter_retry_budget",
+        metavar="SECONDS",
+        default=60,
+    )
+    group.addoption(
+        "--splinter-prewarm",
+        help="splinter: Number of browsers to keep launching in the background, "
+             "ahead of demand. Defaults to 0.",
+        type=int,
+        dest="splinter_browser_prewarm",
+        metavar="COUNT",
+        default=0,
+    )
     group.addoption(
         "--splinter-make-screenshot-on-failure",
         help="splinter: Take browser screenshots on test failure. Defaults to true.",
@@ -826,6 +1832,48 @@ def pytest_addoption(parser):  # pragma: no cover
         metavar="DIR",
         default="logs",
     )
+    group.addoption(
+        "--splinter-screenshot-async",
+        help="splinter: Write screenshots in a background thread, "
+             "instead of during test teardown.",
+        action="store_true",
+        dest="splinter_screenshot_async",
+    )
+    group.addoption(
+        "--splinter-artifact-store",
+        help="splinter: Save screenshots once per unique content, as blobs in the "
+             "screenshot directory, with a manifest mapping tests to blobs.",
+        action="store_true",
+        dest="splinter_artifact_store",
+    )
+    group.addoption(
+        "--splinter-artifact-compression",
+        help="splinter: Compression of the blobs in the artifact store.",
+        choices=COMPRESSIONS,
+        default="none",
+        dest="splinter_artifact_compression",
+    )
+    group.addoption(
+        "--splinter-timings",
+        help="splinter: Print how long each phase of the browser lifecycle took.",
+        action="store_true",
+        dest="splinter_timings",
+    )
+    group.addoption(
+        "--splinter-timings-json",
+        help="splinter: Write the browser lifecycle timings to a JSON file.",
+        action="store",
+        dest="splinter_timings_json",
+        metavar="PATH",
+        default=None,
+    )
+    group.addoption(
+        "--splinter-profile-commands",
+        help="splinter: Record the latency and payload size of every webdriver command "
+             "and print the slowest ones.",
+        action="store_true",
+        dest="splinter_profile_commands",
+    )
     group.addoption(
         "--splinter-headless",
         help="splinter: Run the browser in headless mode.",
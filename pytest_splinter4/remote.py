@@ -0,0 +1,437 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pytest
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+import urllib3
+from urllib3.exceptions import HTTPError
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+BALANCE_STRATEGIES = ("round-robin", "least-loaded", "worker")
+
+
+def parse_remote_urls(value: Union[str, Sequence[str], None]) -> List[str]:
+    """Get the urls of a comma separated list, or a list, of urls."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [url.strip() for url in value if url.strip()]
+
+
+def free_slots(status: Dict[str, Any]) -> int:
+    """Get the number of free session slots from the /status response of a grid."""
+    value = status.get("value") or {}
+    if not value.get("ready", True):
+        return 0
+
+    nodes = value.get("nodes")
+    # Standalone servers without node details.
+    if nodes is None:
+        return 1
+
+    return sum(
+        1
+        for node in nodes if node.get("availability", "UP") == "UP"
+        for slot in node.get("slots", []) if slot.get("session") is None
+    )
+
+
+class RemoteUrlBalancer:
+    """Spread new remote sessions across several grids.
+
+    Strategies:
+
+    * round-robin: each grid in turn.
+    * least-loaded: the grid with the most free slots, from its /status endpoint.
+    * worker: each pytest-xdist worker sticks to one grid.
+
+    A grid failing to create a session, or to answer its /status endpoint,
+    is left out for `cooldown` seconds, unless every grid is cooling down.
+
+    The grids are asked for their status at the same time, and their
+    answers are kept for `status_ttl` seconds, counting the sessions sent
+    to them meanwhile.
+
+    Arguments:
+        urls: Urls of the grids.
+        strategy (str): One of 'round-robin', 'least-loaded' or 'worker'.
+        cooldown (float): Seconds a failing grid is left out.
+        worker_index (int): Number of the pytest-xdist worker.
+        status_ttl (float): Seconds the status of a grid is kept.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: str = "round-robin",
+        cooldown: float = 30,
+        worker_index: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        status_ttl: float = 2,
+    ):
+        self.urls = list(urls)
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.worker_index = worker_index
+        self.clock = clock
+        self.status_ttl = status_ttl
+        self._next = 0
+        self._cooling: Dict[str, float] = {}
+        self._slots: Dict[str, Tuple[float, int]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._http = urllib3.PoolManager(timeout=urllib3.Timeout(total=2))
+        self._lock = threading.Lock()
+
+    def available(self) -> List[str]:
+        """Get the urls which are not cooling down, in their original order."""
+        now = self.clock()
+        with self._lock:
+            urls = [url for url in self.urls if self._cooling.get(url, 0) <= now]
+            if not urls:
+                # Every grid failed recently, try the one which failed first.
+                urls = [min(self.urls, key=lambda url: self._cooling[url])]
+        return urls
+
+    def _round_robin(self, urls: List[str]) -> List[str]:
+        with self._lock:
+            start = self._next % len(urls)
+            self._next += 1
+        return urls[start:] + urls[:start]
+
+    def status(self, url: str) -> int:
+        """Get the number of free slots of a grid, or -1 when it does not answer."""
+        try:
+            response = self._http.request("GET", f"{url.rstrip('/')}/status", retries=False)
+            return free_slots(json.loads(response.data.decode("utf-8")))
+        except (HTTPError, ValueError, AttributeError):
+            return -1
+
+    def free_slots(self, urls: List[str]) -> Dict[str, int]:
+        """Get the free slots of grids, asking the ones without a recent status at once.
+
+        Grids which do not answer are left out, see failed.
+        """
+        now = self.clock()
+        with self._lock:
+            slots = {
+                url: self._slots[url][1] for url in urls
+                if url in self._slots and now - self._slots[url][0] < self.status_ttl
+            }
+            missing = [url for url in urls if url not in slots]
+            if len(missing) > 1 and self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=min(len(self.urls), 8), thread_name_prefix="splinter-status",
+                )
+
+        if len(missing) > 1:
+            answers = dict(zip(missing, self._executor.map(self.status, missing)))
+        else:
+            answers = {url: self.status(url) for url in missing}
+
+        with self._lock:
+            for url, count in answers.items():
+                if count >= 0:
+                    self._slots[url] = (now, count)
+        for url, count in answers.items():
+            if count < 0:
+                self.failed(url)
+
+        slots.update(answers)
+        return slots
+
+    def choose(self) -> str:
+        """Get the url of the grid to create the next session on."""
+        urls = self.available()
+
+        if self.strategy == "worker":
+            preferred = self.urls[self.worker_index % len(self.urls)]
+            if preferred in urls:
+                return preferred
+            return urls[self.worker_index % len(urls)]
+
+        urls = self._round_robin(urls)
+        if self.strategy == "least-loaded" and len(urls) > 1:
+            slots = self.free_slots(urls)
+            answering = [url for url in urls if slots[url] >= 0]
+            if answering:
+                # max() keeps the first of the grids with the most free slots.
+                url = max(answering, key=slots.get)
+                with self._lock:
+                    if url in self._slots:
+                        checked, count = self._slots[url]
+                        # The new session takes a slot until the status is asked again.
+                        self._slots[url] = (checked, count - 1)
+                return url
+        return urls[0]
+
+    def failed(self, url: str) -> None:
+        """Leave a grid out after it failed to create a session."""
+        if url not in self.urls:
+            return
+        LOGGER.warning(f"Remote url {url} failed, leaving it out for {self.cooldown}s")
+        with self._lock:
+            self._cooling[url] = self.clock() + self.cooldown
+
+    def succeeded(self, url: str) -> None:
+        """Put a grid back after it created a session."""
+        with self._lock:
+            self._cooling.pop(url, None)
+
+    def close(self) -> None:
+        """Close the connections used for the status requests."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._http.clear()
+
+
+def capabilities_key(url: str, params: Dict[str, Any]) -> str:
+    """Get the key of the sessions of a grid url created with the same capabilities."""
+    payload = json.dumps([url, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_error(response: Dict[str, Any]) -> bool:
+    value = response.get("value")
+    return response.get("status") not in (None, 0) or (
+        isinstance(value, dict) and "error" in value
+    )
+
+
+class RemoteSessionRegistry:
+    """Remote sessions parked by a browser, for the next one to reuse.
+
+    A session is parked as a file of a directory shared by the pytest-xdist
+    workers of a host. Claiming a session renames its file, so a session is
+    only claimed once.
+
+    Arguments:
+        directory (str): Directory shared by the workers.
+        max_idle (float): Seconds after which a parked session is not reused,
+            since the grid may have closed it.
+    """
+
+    def __init__(self, directory: str, max_idle: float = 240):
+        self.directory = directory
+        self.max_idle = max_idle
+        os.makedirs(directory, exist_ok=True)
+
+    def park(self, key: str, url: str, session_id: str, capabilities: Any) -> None:
+        """Make a session available to the other browsers."""
+        path = os.path.join(self.directory, f"{key}.{session_id}.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as fd:
+            json.dump({
+                "url": url,
+                "session_id": session_id,
+                "capabilities": capabilities,
+                "parked": time.time(),
+            }, fd)
+        os.replace(tmp_path, path)
+
+    def _claim(self, name: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.directory, name)
+        claimed_path = f"{path}.{os.getpid()}.{threading.get_ident()}.claimed"
+        try:
+            os.rename(path, claimed_path)
+        except OSError:
+            # Claimed by another browser.
+            return None
+
+        try:
+            with open(claimed_path) as fd:
+                return json.load(fd)
+        except (OSError, ValueError):
+            return None
+        finally:
+            os.remove(claimed_path)
+
+    def claim(self, key: str) -> Optional[Dict[str, Any]]:
+        """Take a parked session created with the same capabilities.
+
+        Returns:
+            dict: The url, session_id and capabilities of the session, or None.
+        """
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith(f"{key}.") and name.endswith(".json")):
+                continue
+
+            entry = self._claim(name)
+            if entry is None:
+                continue
+            if time.time() - entry["parked"] > self.max_idle:
+                LOGGER.info(f"Dropping remote session {entry['session_id']}, idle for too long")
+                continue
+            return entry
+        return None
+
+    def close(self) -> None:
+        """Quit every parked session and remove the directory."""
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            entry = self._claim(name)
+            if entry is None:
+                continue
+
+            connection = RemoteConnection(entry["url"], keep_alive=False)
+            try:
+                connection.execute(Command.QUIT, {"sessionId": entry["session_id"]})
+            except Exception:  # NOQA
+                LOGGER.warning("Error closing a parked remote session", exc_info=True)
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class SharedRemoteConnection(RemoteConnection):
+    """Connection to a Selenium grid, shared by every browser using it.
+
+    Requests go through a single urllib3 pool of `pool_size` keep-alive
+    connections, so browsers do not open a new connection, with its TLS
+    handshake, for each session.
+
+    With a registry, quitting a browser parks its session instead of
+    deleting it, and new browsers reuse parked sessions with the same
+    capabilities. A reused session keeps the state of the previous
+    browser, see is_reused.
+
+    Arguments:
+        remote_server_addr (str): Url of the grid.
+        pool_size (int): Number of connections kept open to the grid.
+        registry (RemoteSessionRegistry): Where sessions are parked.
+    """
+
+    def __init__(
+        self,
+        remote_server_addr: str,
+        pool_size: int = 10,
+        registry: Optional[RemoteSessionRegistry] = None,
+        ignore_proxy: bool = False,
+    ):
+        self.pool_size = pool_size
+        self.registry = registry
+        self._sessions: Dict[str, Tuple[str, Any]] = {}
+        self._reused = set()
+        self._sessions_lock = threading.Lock()
+        super().__init__(remote_server_addr, keep_alive=True, ignore_proxy=ignore_proxy)
+
+    def _get_connection_manager(self):
+        manager = super()._get_connection_manager()
+        manager.connection_pool_kw["maxsize"] = self.pool_size
+        return manager
+
+    def execute(self, command, params):
+        """Send a command to the grid, parking and reusing sessions with a registry."""
+        if self.registry is not None:
+            if command == Command.NEW_SESSION:
+                return self._new_session(params)
+            if command == Command.QUIT and self._park(params.get("sessionId")):
+                return {"value": None}
+        return super().execute(command, params)
+
+    def _is_alive(self, session_id: str) -> bool:
+        try:
+            response = super().execute(Command.GET_CURRENT_URL, {"sessionId": session_id})
+        except HTTPError:
+            return False
+        return not _is_error(response)
+
+    def _new_session(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = capabilities_key(self._url, params)
+
+        entry = self.registry.claim(key)
+        while entry is not None:
+            session_id = entry["session_id"]
+            if self._is_alive(session_id):
+                LOGGER.info(f"Reusing remote session {session_id}")
+                with self._sessions_lock:
+                    self._sessions[session_id] = (key, entry["capabilities"])
+                    self._reused.add(session_id)
+                return {"value": {"sessionId": session_id, "capabilities": entry["capabilities"]}}
+            entry = self.registry.claim(key)
+
+        response = super().execute(Command.NEW_SESSION, params)
+        value = response if "sessionId" in response else response.get("value")
+        if isinstance(value, dict) and "sessionId" in value:
+            with self._sessions_lock:
+                self._sessions[value["sessionId"]] = (key, value.get("capabilities"))
+        return response
+
+    def is_reused(self, session_id: Optional[str]) -> bool:
+        """Check if a session was used by a previous browser, and needs cleaning."""
+        with self._sessions_lock:
+            return session_id in self._reused
+
+    def _park(self, session_id: Optional[str]) -> bool:
+        with self._sessions_lock:
+            session = self._sessions.pop(session_id, None)
+            self._reused.discard(session_id)
+        if session is None:
+            return False
+
+        key, capabilities = session
+        self.registry.park(key, self._url, session_id, capabilities)
+        return True
+
+    def close(self) -> None:
+        """Keep the connections open for the other browsers of the grid."""
+
+    def shutdown(self) -> None:
+        """Close the connections to the grid."""
+        super().close()
+
+
+class RemoteConnections:
+    """Shared connections of a pytest run, one per grid url.
+
+    Arguments:
+        pool_size (int): Number of connections kept open to each grid.
+        registry (RemoteSessionRegistry): Where sessions are parked, if they are reused.
+    """
+
+    def __init__(self, pool_size: int = 10, registry: Optional[RemoteSessionRegistry] = None):
+        self.pool_size = pool_size
+        self.registry = registry
+        self._connections: Dict[str, SharedRemoteConnection] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> SharedRemoteConnection:
+        """Get the connection to a grid."""
+        with self._lock:
+            if url not in self._connections:
+                self._connections[url] = SharedRemoteConnection(
+                    url, pool_size=self.pool_size, registry=self.registry,
+                )
+            return self._connections[url]
+
+    def values(self) -> List[SharedRemoteConnection]:
+        """Get every connection."""
+        with self._lock:
+            return list(self._connections.values())
+
+    def close(self) -> None:
+        """Close every connection."""
+        for connection in self.values():
+            connection.shutdown()
+
+
+session_registry_key = pytest.StashKey[RemoteSessionRegistry]()
+
+
+def get_session_registry(config) -> Optional[RemoteSessionRegistry]:
+    """Get the RemoteSessionRegistry of a pytest run, if remote sessions are reused."""
+    return config.stash.get(session_registry_key, None)
@@ -0,0 +1,369 @@
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+from http.client import HTTPException
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+# Clear the web storage of the current page in a single round trip.
+# The script returns once the IndexedDB databases are deleted. A deletion
+# blocked by a connection of the page completes when the page is left, and
+# pages opening the database afterwards wait for it.
+CLEAR_STORAGE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+    window.indexedDB.databases().then(function (databases) {
+        return Promise.all(databases.map(function (db) {
+            return new Promise(function (resolve) {
+                var request = window.indexedDB.deleteDatabase(db.name);
+                request.onsuccess = request.onerror = request.onblocked = resolve;
+            });
+        }));
+    }).then(done, done);
+} catch (e) {
+    // Storage is not available for this page, ie: about:blank
+    done();
+}
+"""
+
+# Storage cleared by Storage.clearDataForOrigin, cookies are cleared for every domain at once.
+CDP_STORAGE_TYPES = (
+    "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+)
+
+
+def _origin(url: str) -> Optional[str]:
+    """Get the origin of a url, ie: https://example.com:8080, if it has storage."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _reused_session(driver: Any) -> bool:
+    """Check if a remote driver is attached to a session used by a previous browser."""
+    is_reused = getattr(getattr(driver, "command_executor", None), "is_reused", None)
+    return callable(is_reused) and is_reused(getattr(driver, "session_id", None)) is True
+
+
+class CommandBatch:
+    """Driver calls which do not depend on each other, sent at the same time.
+
+    Each call still goes through the webdriver execute, so it is profiled
+    like any other command. The WebDriver server runs the commands of a
+    session one by one, but their round trips overlap: a batch costs about
+    one round trip instead of one per command.
+
+    Arguments:
+        executor (ThreadPoolExecutor): Threads sending the calls. Without it,
+            calls are sent one by one.
+    """
+
+    def __init__(self, executor: Optional[ThreadPoolExecutor] = None):
+        self.executor = executor
+        self.calls: List[Tuple[Callable, tuple]] = []
+        self.callbacks: List[Callable] = []
+
+    def add(self, func: Callable, *args) -> None:
+        """Add a call to the batch."""
+        self.calls.append((func, args))
+
+    def on_success(self, func: Callable) -> None:
+        """Call func once every call of the batch succeeded."""
+        self.callbacks.append(func)
+
+    def run(self) -> None:
+        """Send the calls, and raise the first error once every call is done."""
+        calls, self.calls = self.calls, []
+        callbacks, self.callbacks = self.callbacks, []
+
+        if self.executor is None or len(calls) < 2:
+            for func, args in calls:
+                func(*args)
+        else:
+            futures = [self.executor.submit(func, *args) for func, args in calls]
+            wait(futures)
+            for future in futures:
+                future.result()
+
+        for callback in callbacks:
+            callback()
+
+
+class BrowserReset:
+    """Bring a browser back to a clean state before a test.
+
+    The driver settings applied to a browser are remembered on its driver, so
+    unchanged settings are not sent again. A browser prepared for the first
+    time was just created and has nothing to clean, unless it is attached to
+    a remote session parked by a previous browser.
+
+    With the 'context' isolation, a Chromium browser gets a new browser
+    context, ie: incognito profile, instead of being cleaned. Other browsers
+    fall back to cleaning cookies and storage.
+
+    Settings and cleaning commands which do not depend on each other are
+    sent concurrently, see CommandBatch.
+
+    Arguments:
+        implicit_wait: Selenium implicit wait, in seconds.
+        speed: Selenium speed, in seconds.
+        socket_timeout: Selenium socket timeout, in seconds.
+        window_size: Browser window size, (width, height).
+        speed_commands: Selenium commands slowed down by the speed.
+        clean_cookies_urls: Additional urls to clean cookies on.
+        isolation (str): One of 'process', 'context' or 'cookies'.
+        blocked_url_patterns: Url patterns Chromium browsers do not load,
+            with `*` wildcards.
+        concurrent_commands (int): Maximum number of commands sent at the
+            same time to a remote grid. 0 sends commands one by one.
+    """
+
+    def __init__(
+        self,
+        implicit_wait: Any,
+        speed: Any,
+        socket_timeout: Any,
+        window_size: Optional[Tuple[int, int]],
+        speed_commands: Optional[Iterable[str]] = None,
+        clean_cookies_urls: Iterable[str] = (),
+        isolation: str = "cookies",
+        blocked_url_patterns: Iterable[str] = (),
+        concurrent_commands: int = 4,
+    ):
+        self.implicit_wait = implicit_wait
+        self.speed = speed
+        self.speed_commands = speed_commands
+        self.socket_timeout = socket_timeout
+        self.window_size = window_size
+        self.clean_cookies_urls = list(clean_cookies_urls)
+        self.isolation = isolation
+        self.blocked_url_patterns = list(blocked_url_patterns)
+        self.concurrent_commands = concurrent_commands
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._seen = weakref.WeakSet()
+
+    def batch(self, driver: Any = None) -> CommandBatch:
+        """Get a new batch of commands for a driver.
+
+        Commands are sent concurrently when the driver keeps several
+        connections open to its server, ie: to a remote grid. Local drivers
+        are one hop away, and keep a single connection.
+        """
+        pool_size = getattr(getattr(driver, "command_executor", None), "pool_size", None)
+        if self.concurrent_commands < 2 or not isinstance(pool_size, int) or pool_size < 2:
+            return CommandBatch()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrent_commands,
+                thread_name_prefix="splinter-reset",
+            )
+        return CommandBatch(self._executor)
+
+    def close(self) -> None:
+        """Stop the threads sending the commands."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __call__(self, browser: Any, driver_name: str) -> None:
+        """Apply the driver settings and clean the browser if it was used before.
+
+        Arguments:
+            browser: The browser to reset.
+            driver_name (str): Name of the webdriver used by the browser.
+        """
+        driver = getattr(browser, "driver", None)
+
+        batch = self.batch(driver)
+        if driver is not None:
+            self.apply_settings(driver, batch)
+
+        if browser not in self._seen:
+            self._seen.add(browser)
+            if not _reused_session(driver):
+                batch.add(self.block_urls, driver)
+                batch.run()
+                return
+
+        if self.isolation == "context":
+            # The window size applies to the current tab, set it before switching.
+            batch.run()
+            if self.new_context(driver):
+                # Blocked urls apply to a single tab.
+                self.block_urls(driver)
+                return
+
+        self.clean(browser, driver_name, batch)
+
+    def apply_settings(self, driver: Any, batch: Optional[CommandBatch] = None) -> None:
+        """Send the driver settings which are not already in effect.
+
+        Arguments:
+            driver: The webdriver.
+            batch (CommandBatch): Send the settings with the other commands of
+                the batch, when it runs. By default they are sent right away.
+        """
+        # Local settings, no round trip needed.
+        if self.speed_commands is None:
+            driver.set_speed(self.speed)
+        else:
+            driver.set_speed(self.speed, self.speed_commands)
+        driver.command_executor.set_timeout(self.socket_timeout)
+        driver.command_executor._conn.timeout = self.socket_timeout
+
+        settings = (self.implicit_wait, self.window_size)
+        if getattr(driver, "_splinter_settings", None) == settings:
+            return
+
+        run = batch is None
+        batch = batch or self.batch(driver)
+        batch.add(driver.implicitly_wait, self.implicit_wait)
+        if self.window_size:
+            batch.add(driver.set_window_size, *self.window_size)
+
+        # Changing a setting forgets the settings in effect, remember them once sent.
+        batch.on_success(lambda: setattr(driver, "_splinter_settings", settings))
+
+        if run:
+            batch.run()
+
+    def block_urls(self, driver: Any) -> None:
+        """Stop a Chromium browser from loading the blocked url patterns.
+
+        Urls are blocked in the current tab, not in the windows or tabs it opens.
+        """
+        if not self.blocked_url_patterns or not hasattr(driver, "execute_cdp_cmd"):
+            return
+
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_url_patterns})
+        except (IOError, HTTPException, WebDriverException):
+            LOGGER.warning("Error blocking urls", exc_info=True)
+
+    def new_context(self, driver: Any) -> bool:
+        """Switch a Chromium browser to a tab in a new browser context.
+
+        The browser context of the previous test is disposed of, with its tabs.
+
+        Returns:
+            bool: False if the browser does not support browser contexts.
+        """
+        if driver is None or not hasattr(driver, "execute_cdp_cmd"):
+            return False
+
+        try:
+            context_id = driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {},
+            )["browserContextId"]
+
+            target = {"url": "about:blank", "browserContextId": context_id}
+            if self.window_size:
+                target["width"], target["height"] = self.window_size
+            target_id = driver.execute_cdp_cmd("Target.createTarget", target)["targetId"]
+
+            # chromedriver uses the target id as the window handle.
+            handle = next(
+                (handle for handle in driver.window_handles if handle.endswith(target_id)),
+                None,
+            )
+            if handle is None:
+                driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": context_id},
+                )
+                return False
+
+            driver.switch_to.window(handle)
+        except (IOError, HTTPException, WebDriverException, KeyError):
+            LOGGER.warning("Error creating a browser context", exc_info=True)
+            return False
+
+        previous_context_id = getattr(driver, "_splinter_browser_context", None)
+        driver._splinter_browser_context = context_id
+
+        if previous_context_id is not None:
+            try:
+                driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": previous_context_id},
+                )
+            except (IOError, HTTPException, WebDriverException):
+                LOGGER.warning("Error disposing of the browser context", exc_info=True)
+
+        return True
+
+    def clean(self, browser: Any, driver_name: str, batch: Optional[CommandBatch] = None) -> None:
+        """Clear cookies and storage, then go back to a blank page.
+
+        Cookies and storage are cleared at the same time, with the commands
+        already in the batch. The blank page is loaded once they are done,
+        since a script starting the navigation would not wait for it.
+
+        Chromium browsers clear the storage of every origin the tab visited.
+        Other browsers only clear the storage of the current page, so storage
+        of other origins visited by a test, ie: in a redirect or another
+        window, is only cleared by the 'process' isolation.
+        """
+        driver = getattr(browser, "driver", None)
+        clean_cookies_urls = self.clean_cookies_urls
+        batch = batch or self.batch(driver)
+
+        if driver is not None and hasattr(driver, "execute_cdp_cmd"):
+            # Chromium can clear the cookies of every domain at once.
+            batch.add(driver.execute_cdp_cmd, "Network.clearBrowserCookies", {})
+            batch.add(self._clear_origins_storage, driver)
+            clean_cookies_urls = []
+        else:
+            batch.add(self._delete_cookies, browser)
+
+        if driver is not None:
+            batch.add(self._clear_storage, driver)
+
+        batch.run()
+
+        for url in clean_cookies_urls:
+            browser.visit(url)
+            browser.cookies.delete_all()
+
+        # Let firefox preferences handle this.
+        if driver is not None and driver_name != "firefox":
+            driver.get("about:blank")
+
+    def _delete_cookies(self, browser: Any) -> None:
+        try:
+            browser.cookies.delete_all()
+        except (IOError, HTTPException, WebDriverException):
+            LOGGER.warning("Error cleaning browser cookies", exc_info=True)
+
+    def _clear_storage(self, driver: Any) -> None:
+        try:
+            driver.execute_async_script(CLEAR_STORAGE_SCRIPT)
+        except (IOError, HTTPException, WebDriverException):
+            LOGGER.warning("Error cleaning browser storage", exc_info=True)
+
+    def _clear_origins_storage(self, driver: Any) -> None:
+        """Clear the storage of every origin in the navigation history of a Chromium tab.
+
+        The history is reset afterwards, so the next test only lists the
+        origins it visited.
+        """
+        try:
+            history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+            origins = {_origin(entry["url"]) for entry in history["entries"]}
+            for origin in sorted(origins - {None}):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": CDP_STORAGE_TYPES},
+                )
+            driver.execute_cdp_cmd("Page.resetNavigationHistory", {})
+        except (IOError, HTTPException, WebDriverException, KeyError, TypeError):
+            LOGGER.warning("Error cleaning browser storage", exc_info=True)
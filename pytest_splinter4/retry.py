@@ -0,0 +1,189 @@
+import logging
+import random
+import socket
+import threading
+import time
+from http.client import HTTPException
+from typing import Any, Callable, Dict
+
+import pytest
+
+from selenium.common.exceptions import (
+    SessionNotCreatedException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from urllib3.exceptions import MaxRetryError
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def failure_kind(error: BaseException) -> str:
+    """Get the kind of a failure, for the retry counters."""
+    if isinstance(error, SessionNotCreatedException):
+        return "session_not_created"
+    if isinstance(error, (TimeoutException, socket.timeout)):
+        return "timeout"
+    if isinstance(error, (MaxRetryError, ConnectionError, HTTPException)):
+        return "connection"
+    if isinstance(error, WebDriverException):
+        return "webdriver"
+    return type(error).__name__
+
+
+class Retry:
+    """Attempts of a single operation, ie: launching one browser.
+
+    Arguments:
+        policy (RetryPolicy): Policy deciding when to try again.
+        operation (str): Name of the operation, for the counters.
+    """
+
+    def __init__(self, policy: "RetryPolicy", operation: str):
+        self.policy = policy
+        self.operation = operation
+        self.attempt = 1
+        self.started = policy.clock()
+
+    def again(self, error: BaseException) -> bool:
+        """Record a failed attempt, and wait before the next one.
+
+        Returns:
+            bool: False when there are no attempts or time left.
+        """
+        return self.policy.again(self, error)
+
+
+class RetryPolicy:
+    """Retry failed operations with exponential backoff and jitter.
+
+    Delays start at `backoff` seconds and double after each failure, up to
+    `max_backoff`. Up to `jitter` of each delay is random, so browsers
+    failing together do not all come back at the same time.
+
+    Arguments:
+        attempts (int): Maximum number of attempts, including the first one.
+        backoff (float): Delay before the first retry, in seconds.
+        max_backoff (float): Maximum delay between two attempts, in seconds.
+        jitter (float): Random fraction of each delay, between 0 and 1.
+        budget (float): Seconds after which no new attempt is started. 0 means no limit.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        jitter: float = 0.5,
+        budget: float = 0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budget = budget
+        self.sleep = sleep
+        self.clock = clock
+        # Number of failures of each kind, per operation.
+        self.failures: Dict[str, Dict[str, int]] = {}
+        self.retries: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self, operation: str) -> Retry:
+        """Start the attempts of an operation."""
+        return Retry(self, operation)
+
+    def delay(self, attempt: int) -> float:
+        """Get the delay after a failed attempt, in seconds."""
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return delay * (1 - self.jitter * random.random())
+
+    def again(self, retry: Retry, error: BaseException) -> bool:
+        """Record a failed attempt, and wait before the next one.
+
+        Returns:
+            bool: False when there are no attempts or time left.
+        """
+        kind = failure_kind(error)
+        with self._lock:
+            failures = self.failures.setdefault(retry.operation, {})
+            failures[kind] = failures.get(kind, 0) + 1
+
+        if retry.attempt >= self.attempts:
+            return False
+
+        delay = self.delay(retry.attempt)
+        if self.budget:
+            remaining = self.budget - (self.clock() - retry.started)
+            if remaining <= delay:
+                return False
+
+        with self._lock:
+            self.retries[retry.operation] = self.retries.get(retry.operation, 0) + 1
+
+        LOGGER.warning(
+            f"{retry.operation} failed ({kind}), attempt {retry.attempt} of {self.attempts}. "
+            f"Retrying in {delay:.2f}s",
+        )
+        self.sleep(delay)
+        retry.attempt += 1
+        return True
+
+    def call(self, operation: str, func: Callable, *args, **kwargs) -> Any:
+        """Call func until it succeeds, or the policy gives up.
+
+        The error of the last attempt is raised.
+        """
+        retry = self.start(operation)
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:  # NOQA
+                if not retry.again(e):
+                    raise
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the counters, ie: to send them from a pytest-xdist worker."""
+        with self._lock:
+            return {
+                "failures": {op: dict(kinds) for op, kinds in self.failures.items()},
+                "retries": dict(self.retries),
+            }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add counters collected elsewhere, ie: on a pytest-xdist worker."""
+        with self._lock:
+            for operation, kinds in data.get("failures", {}).items():
+                failures = self.failures.setdefault(operation, {})
+                for kind, count in kinds.items():
+                    failures[kind] = failures.get(kind, 0) + count
+            for operation, count in data.get("retries", {}).items():
+                self.retries[operation] = self.retries.get(operation, 0) + count
+
+    def write_terminal_summary(self, terminalreporter) -> None:
+        """Write the failure counters to the pytest terminal."""
+        terminalreporter.write_sep("=", "splinter retries")
+        terminalreporter.write_line(f"{'operation':<24}{'failure':<24}{'count':>8}")
+        for operation, kinds in sorted(self.failures.items()):
+            for kind, count in sorted(kinds.items()):
+                terminalreporter.write_line(f"{operation:<24}{kind:<24}{count:>8}")
+        for operation, count in sorted(self.retries.items()):
+            terminalreporter.write_line(f"{operation} retried {count} times")
+
+
+retry_policy_key = pytest.StashKey[RetryPolicy]()
+
+
+def get_retry_policy(config) -> RetryPolicy:
+    """Get the RetryPolicy of a pytest run, configured by the command line options."""
+    if retry_policy_key not in config.stash:
+        config.stash[retry_policy_key] = RetryPolicy(
+            attempts=config.option.splinter_retry_attempts,
+            backoff=config.option.splinter_retry_backoff,
+            budget=config.option.splinter_retry_budget,
+        )
+    return config.stash[retry_policy_key]
@@ -0,0 +1,139 @@
+import base64
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Union
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def write_file(path: str, content: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """Write a screenshot file, creating its directory if needed.
+
+    Arguments:
+        path (str): Path of the file.
+        content: bytes, or str when an encoding is given.
+        encoding (str): Encoding of text content.
+
+    Returns:
+        str: The path of the file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if encoding:
+        with open(path, "w", encoding=encoding) as fd:
+            fd.write(content)
+    else:
+        with open(path, "wb") as fd:
+            fd.write(content)
+
+    return path
+
+
+def decode_png(png_base64: str) -> bytes:
+    """Decode a screenshot received from the webdriver."""
+    return base64.b64decode(png_base64.encode("ascii"))
+
+
+def _write_png(path: str, png_base64: str) -> str:
+    return write_file(path, decode_png(png_base64))
+
+
+def screenshot_extraline(png_path: str, html_path: str) -> str:
+    """Get the lines added to a failure report, pointing at the screenshots of the test."""
+    return f"""
+===========================
+pytest-splinter screenshots
+===========================
+png:  {png_path}
+html: {html_path}
+"""
+
+
+def queue_for_controller(node, class_name: str, files: List[dict]) -> None:
+    """Queue screenshot files to send to the pytest-xdist controller.
+
+    The files are sent with the teardown report of the test, so the worker
+    does not keep them until it shuts down.
+
+    Arguments:
+        node: The test item.
+        class_name (str): Name of the screenshot directory.
+        files (list): dicts with a `file_name` and a `content`. Content with
+            `base64` set is a PNG screenshot to decode. HTML content has an `encoding`.
+    """
+    node.__dict__.setdefault("splinter_screenshots", []).append(
+        {"class_name": class_name, "files": files},
+    )
+
+
+def write_screenshots(screenshot_dir: str, class_name: str, files: List[dict]) -> List[str]:
+    """Write screenshot files received from a pytest-xdist worker.
+
+    Returns:
+        list: The paths of the files.
+    """
+    paths = []
+    for file in files:
+        content = file["content"]
+        if file.get("base64"):
+            content = decode_png(content)
+
+        path = os.path.join(screenshot_dir, class_name, file["file_name"])
+        LOGGER.info(f"Saving screenshot to: {path}")
+        paths.append(write_file(path, content, file.get("encoding")))
+
+    return paths
+
+
+class ScreenshotWriter:
+    """Write screenshots in a background thread.
+
+    Jobs run one at a time, in the order they were submitted, so test
+    teardown does not wait for disk I/O. `flush` waits for every job.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Run func in the background thread."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="splinter-screenshots",
+                )
+            future = self._executor.submit(func, *args, **kwargs)
+            self._futures.append(future)
+        return future
+
+    def write(self, path: str, content: Any, encoding: Optional[str] = None) -> Future:
+        """Write a file in the background thread."""
+        return self.submit(write_file, path, content, encoding)
+
+    def write_png(self, path: str, png_base64: str) -> Future:
+        """Decode and write a screenshot in the background thread."""
+        return self.submit(_write_png, path, png_base64)
+
+    def flush(self) -> None:
+        """Wait for every submitted job to finish."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+
+        for future in futures:
+            try:
+                future.result()
+            except Exception:  # NOQA
+                LOGGER.warning("Could not save screenshot", exc_info=True)
+
+    def close(self) -> None:
+        """Flush and stop the background thread."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
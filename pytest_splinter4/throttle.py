@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Rate limiter handing out tokens at a fixed rate.
+
+    Tokens build up while nobody takes them, up to `capacity`. Taking more
+    tokens than available is allowed: the caller waits until they would have
+    been available, and the next callers wait behind it.
+
+    `reserve` only computes the wait, so async code can await
+    `asyncio.sleep(bucket.reserve())` instead of blocking its loop.
+
+    Arguments:
+        rate (float): Tokens per second.
+        capacity (float): Tokens which can be taken at once after a pause.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.sleep = sleep
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens.
+
+        Returns:
+            float: Seconds to wait before using them.
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.capacity)
+            self.updated = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Take tokens, waiting until they are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            self.sleep(delay)
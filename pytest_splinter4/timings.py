@@ -0,0 +1,293 @@
+import contextlib
+import functools
+import heapq
+import json
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pytest
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Get the nearest-rank percentile of a list of values.
+
+    Arguments:
+        values: The values, in any order.
+        pct (float): Percentile to get, between 0 and 100.
+
+    Returns:
+        float
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LifecycleTimings:
+    """Durations of the browser lifecycle phases, per test.
+
+    Records are dicts with the test `nodeid`, the `phase` name and the
+    `duration` in seconds. The test being run is set by the plugin hooks.
+
+    Arguments:
+        enabled (bool): Record durations. When False, only the test being run
+            is tracked, ie: for the CommandProfiler.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.nodeid: Optional[str] = None
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, duration: float, nodeid: Optional[str] = None) -> None:
+        """Record the duration of a phase."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.records.append({
+                "nodeid": nodeid or self.nodeid,
+                "phase": phase,
+                "duration": duration,
+            })
+
+    def extend(self, records: List[Dict[str, Any]]) -> None:
+        """Add records collected elsewhere, ie: on a pytest-xdist worker."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self.records.extend(records)
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Record the time spent in the with block."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        """Record the time spent in each call of func."""
+        if not self.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.measure(phase):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def for_test(self, nodeid: str) -> Dict[str, float]:
+        """Get the total duration of each phase for a test."""
+        totals: Dict[str, float] = {}
+        for record in self.records:
+            if record["nodeid"] == nodeid:
+                totals[record["phase"]] = totals.get(record["phase"], 0.0) + record["duration"]
+        return totals
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Get statistics for each phase, slowest total first."""
+        phases: Dict[str, List[float]] = {}
+        for record in self.records:
+            phases.setdefault(record["phase"], []).append(record["duration"])
+
+        rows = [
+            {
+                "phase": phase,
+                "count": len(durations),
+                "total": sum(durations),
+                "p50": percentile(durations, 50),
+                "p95": percentile(durations, 95),
+                "max": max(durations),
+            }
+            for phase, durations in phases.items()
+        ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def write_json(self, path: str) -> None:
+        """Write the summary and every record to a JSON file."""
+        with open(path, "w") as fd:
+            json.dump({"summary": self.summary(), "records": self.records}, fd, indent=2)
+
+    def write_terminal_summary(self, terminalreporter) -> None:
+        """Write the summary table to the pytest terminal."""
+        terminalreporter.write_sep("=", "splinter browser timings")
+        header = f"{'phase':<24}{'count':>8}{'total':>12}{'p50':>10}{'p95':>10}{'max':>10}"
+        terminalreporter.write_line(header)
+        for row in self.summary():
+            terminalreporter.write_line(
+                f"{row['phase']:<24}{row['count']:>8}{row['total']:>11.3f}s"
+                f"{row['p50']:>9.3f}s{row['p95']:>9.3f}s{row['max']:>9.3f}s",
+            )
+
+
+def payload_size(payload: Any) -> int:
+    """Get the approximate size of a WebDriver command payload, in bytes."""
+    if payload is None:
+        return 0
+    if isinstance(payload, (str, bytes)):
+        return len(payload)
+    return len(json.dumps(payload, default=str))
+
+
+class CommandProfiler:
+    """Latency and payload size of every WebDriver command.
+
+    Commands are grouped by command name and by test. The test being run is
+    read from the LifecycleTimings of the same pytest run.
+
+    Arguments:
+        timings (LifecycleTimings): Timings tracking the running test.
+        slowest (int): Number of slowest commands to keep.
+    """
+
+    def __init__(self, timings: LifecycleTimings, slowest: int = 10):
+        self.timings = timings
+        self.slowest_count = slowest
+        self.commands: Dict[str, Dict[str, Any]] = {}
+        self.tests: Dict[str, Dict[str, List[float]]] = {}
+        self.slowest: List[Tuple[float, str, str]] = []
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        command: str,
+        duration: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        """Record a WebDriver command."""
+        nodeid = self.timings.nodeid or "<no test>"
+        with self._lock:
+            stats = self.commands.setdefault(
+                command, {"durations": [], "request_bytes": 0, "response_bytes": 0},
+            )
+            stats["durations"].append(duration)
+            stats["request_bytes"] += request_bytes
+            stats["response_bytes"] += response_bytes
+
+            count_total = self.tests.setdefault(nodeid, {}).setdefault(command, [0, 0.0])
+            count_total[0] += 1
+            count_total[1] += duration
+
+            self._push_slowest((duration, command, nodeid))
+
+    def _push_slowest(self, item: Tuple[float, str, str]) -> None:
+        if len(self.slowest) < self.slowest_count:
+            heapq.heappush(self.slowest, item)
+        else:
+            heapq.heappushpop(self.slowest, item)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the recorded data, to send it to the pytest-xdist controller."""
+        return {
+            "commands": self.commands,
+            "tests": self.tests,
+            "slowest": [list(item) for item in self.slowest],
+        }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add data recorded by another profiler, ie: on a pytest-xdist worker."""
+        with self._lock:
+            for command, other in data.get("commands", {}).items():
+                stats = self.commands.setdefault(
+                    command, {"durations": [], "request_bytes": 0, "response_bytes": 0},
+                )
+                stats["durations"].extend(other["durations"])
+                stats["request_bytes"] += other["request_bytes"]
+                stats["response_bytes"] += other["response_bytes"]
+
+            for nodeid, commands in data.get("tests", {}).items():
+                for command, (count, total) in commands.items():
+                    count_total = self.tests.setdefault(nodeid, {}).setdefault(command, [0, 0.0])
+                    count_total[0] += count
+                    count_total[1] += total
+
+            for item in data.get("slowest", []):
+                self._push_slowest(tuple(item))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Get statistics for each command, slowest total first."""
+        rows = [
+            {
+                "command": command,
+                "count": len(stats["durations"]),
+                "total": sum(stats["durations"]),
+                "p50": percentile(stats["durations"], 50),
+                "p95": percentile(stats["durations"], 95),
+                "max": max(stats["durations"]),
+                "request_bytes": stats["request_bytes"],
+                "response_bytes": stats["response_bytes"],
+            }
+            for command, stats in self.commands.items()
+        ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def test_summary(self) -> List[Tuple[str, int, float]]:
+        """Get the number of commands and time spent in them for each test."""
+        rows = [
+            (
+                nodeid,
+                sum(count for count, _ in commands.values()),
+                sum(total for _, total in commands.values()),
+            )
+            for nodeid, commands in self.tests.items()
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def write_terminal_summary(self, terminalreporter, tests: int = 10) -> None:
+        """Write the command, test and slowest call tables to the pytest terminal."""
+        terminalreporter.write_sep("=", "splinter webdriver commands")
+        terminalreporter.write_line(
+            f"{'command':<32}{'count':>8}{'total':>12}{'p50':>10}{'p95':>10}{'max':>10}"
+            f"{'sent':>12}{'received':>12}",
+        )
+        for row in self.summary():
+            terminalreporter.write_line(
+                f"{row['command']:<32}{row['count']:>8}{row['total']:>11.3f}s"
+                f"{row['p50']:>9.3f}s{row['p95']:>9.3f}s{row['max']:>9.3f}s"
+                f"{row['request_bytes']:>11}B{row['response_bytes']:>11}B",
+            )
+
+        terminalreporter.write_sep("-", f"{tests} tests with the most time in webdriver commands")
+        for nodeid, count, total in self.test_summary()[:tests]:
+            terminalreporter.write_line(f"{total:>9.3f}s {count:>6} commands  {nodeid}")
+
+        terminalreporter.write_sep("-", f"{self.slowest_count} slowest webdriver commands")
+        for duration, command, nodeid in sorted(self.slowest, reverse=True):
+            terminalreporter.write_line(f"{duration:>9.3f}s {command:<32} {nodeid}")
+
+
+timings_key = pytest.StashKey[LifecycleTimings]()
+profiler_key = pytest.StashKey[CommandProfiler]()
+
+
+def get_timings(config) -> LifecycleTimings:
+    """Get the LifecycleTimings of a pytest run.
+
+    Durations are only recorded when they are reported, see `--splinter-timings`.
+    """
+    if timings_key not in config.stash:
+        config.stash[timings_key] = LifecycleTimings(
+            enabled=bool(config.option.splinter_timings or config.option.splinter_timings_json),
+        )
+    return config.stash[timings_key]
+
+
+def get_command_profiler(config) -> CommandProfiler:
+    """Get the CommandProfiler of a pytest run."""
+    if profiler_key not in config.stash:
+        config.stash[profiler_key] = CommandProfiler(get_timings(config))
+    return config.stash[profiler_key]
@@ -5,30 +5,89 @@ http://code.google.com/p/selenium/issues/detail?id=5175
 
 """
 
+import functools
 import time  # pragma: no cover
+import types
 
 from selenium.webdriver.firefox import webdriver  # pragma: no cover
+from selenium.webdriver.remote.command import Command
 from selenium.webdriver.remote.webdriver import (
     WebDriver as RemoteWebDriver,
 )  # pragma: no cover
 
+from .throttle import TokenBucket
+from .timings import payload_size
+
 
 # save the original execute
 RemoteWebDriver._base_execute = RemoteWebDriver.execute  # pragma: no cover
 
+# Methods changing the settings applied by pytest-splinter between tests.
+SETTINGS_METHODS = {
+    name: getattr(RemoteWebDriver, name)
+    for name in (
+        "implicitly_wait",
+        "set_window_size",
+        "set_window_rect",
+        "maximize_window",
+        "minimize_window",
+        "fullscreen_window",
+    )
+}  # pragma: no cover
+
+# Commands slowed down by set_speed: navigation and user interactions.
+THROTTLED_COMMANDS = frozenset({
+    Command.GET,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+    Command.REFRESH,
+    Command.CLICK_ELEMENT,
+    Command.SEND_KEYS_TO_ELEMENT,
+    Command.CLEAR_ELEMENT,
+    Command.W3C_ACTIONS,
+})
+
+
+def _throttled_execute(self, driver_command, params=None):
+    """Wait for the speed limiter before the throttled commands of a driver."""
+    if driver_command in self._speed_commands:
+        self._speed_limiter.acquire()
+    return RemoteWebDriver.execute(self, driver_command, params)
+
+
+def _invalidate_settings(method):
+    """Forget the settings applied to the driver when the method is called."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._splinter_settings = None
+        return method(self, *args, **kwargs)
 
-def patch_webdriver():
-    """Patch selenium webdriver to add functionality/fix issues."""
+    return wrapper
+
+
+def patch_webdriver(profiler=None):
+    """Patch selenium webdriver to add functionality/fix issues.
+
+    Arguments:
+        profiler (CommandProfiler): Records every command sent by the drivers, if given.
+    """
     # Apply the monkey patch to Firefox webdriver to disable native events
     # to avoid click on wrong elements, totally unpredictable
     # more info http://code.google.com/p/selenium/issues/detail?id=633
     webdriver.WebDriver.NATIVE_EVENTS_ALLOWED = False
 
-    def execute(self, driver_command, params=None):
-        result = self._base_execute(driver_command, params)
-        speed = self.get_speed()
-        if speed > 0:
-            time.sleep(speed)  # pragma: no cover
+    def profiled_execute(self, driver_command, params=None):
+        result = None
+        start = time.perf_counter()
+        try:
+            result = self._base_execute(driver_command, params)
+        finally:
+            self._command_profiler.add(
+                driver_command,
+                time.perf_counter() - start,
+                request_bytes=payload_size(params),
+                response_bytes=payload_size(result and result.get("value")),
+            )
         return result
 
     def get_current_window_info(self):
@@ -41,16 +100,40 @@ def patch_webdriver():
     def current_window_is_main(self):
         return self.current_window_handle == self.window_handles[0]
 
-    def set_speed(self, seconds):
+    def set_speed(self, seconds, commands=THROTTLED_COMMANDS):
+        """Run at most one of the given commands every `seconds` seconds.
+
+        The driver only gets a throttled execute when the speed is set, so
+        commands cost nothing extra at speed 0.
+        """
+        commands = frozenset(commands)
+        if (seconds, commands) == (self._speed, self._speed_commands):
+            return
+
         self._speed = seconds
+        self._speed_commands = commands
+        if seconds > 0:
+            self._speed_limiter = TokenBucket(rate=1 / seconds)
+            self.execute = types.MethodType(_throttled_execute, self)
+        else:
+            self._speed_limiter = None
+            self.__dict__.pop("execute", None)
 
     def get_speed(self):
-        if not hasattr(self, "_speed"):
-            self._speed = float(0)
         return self._speed
 
+    RemoteWebDriver._command_profiler = profiler
+    RemoteWebDriver._speed = 0
+    RemoteWebDriver._speed_commands = THROTTLED_COMMANDS
     RemoteWebDriver.set_speed = set_speed
     RemoteWebDriver.get_speed = get_speed
-    RemoteWebDriver.execute = execute
+    # Commands only go through a wrapper when they are profiled.
+    if profiler is not None:
+        RemoteWebDriver.execute = profiled_execute
+    else:
+        RemoteWebDriver.execute = RemoteWebDriver._base_execute
     RemoteWebDriver.get_current_window_info = get_current_window_info
     RemoteWebDriver.current_window_is_main = current_window_is_main
+
+    for name, method in SETTINGS_METHODS.items():
+        setattr(RemoteWebDriver, name, _invalidate_settings(method))
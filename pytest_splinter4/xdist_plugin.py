@@ -1,37 +1,110 @@
-import logging
 import os
+from typing import Any, Dict, List, Optional
 
-
-LOGGER = logging.getLogger(__name__)
+from .artifact_store import ArtifactStore
+from .health import HealthMonitor
+from .remote import RemoteSessionRegistry
+from .retry import RetryPolicy
+from .screenshots import screenshot_extraline, write_screenshots
+from .timings import CommandProfiler, LifecycleTimings
 
 
 class SplinterXdistPlugin:
     """Plugin to defer pytest-xdist hook handler."""
 
-    def __init__(self, screenshot_dir: str):
+    def __init__(
+        self,
+        screenshot_dir: str,
+        timings: Optional[LifecycleTimings] = None,
+        profiler: Optional[CommandProfiler] = None,
+        artifact_store: Optional[ArtifactStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        session_registry: Optional[RemoteSessionRegistry] = None,
+        health_monitor: Optional[HealthMonitor] = None,
+    ):
         self.screenshot_dir = screenshot_dir
+        self.timings = timings
+        self.profiler = profiler
+        self.artifact_store = artifact_store
+        self.retry_policy = retry_policy
+        self.session_registry = session_registry
+        self.health_monitor = health_monitor
+        # Failure reports waiting for the screenshots sent with the teardown report.
+        self._failures: Dict[str, Any] = {}
+
+    def pytest_configure_node(self, node):
+        """Share the directory of the parked remote sessions with a worker."""
+        if self.session_registry is not None:
+            node.workerinput["splinter_session_registry"] = self.session_registry.directory
 
     def pytest_testnodedown(self, node, error):
-        """Copy screenshots back from remote nodes to have them on the master."""
+        """Copy timings, command profiles, retries and recycled browsers from remote nodes."""
         workeroutput = getattr(node, "workeroutput", {})
 
-        for screenshot in workeroutput.get("screenshots", []):
-            screenshot_dir = os.path.join(
-                self.screenshot_dir,
-                screenshot["class_name"],
-            )
+        if self.timings is not None:
+            self.timings.extend(workeroutput.get("splinter_timings", []))
+
+        if self.profiler is not None and "splinter_commands" in workeroutput:
+            self.profiler.merge(workeroutput["splinter_commands"])
+
+        if self.retry_policy is not None and "splinter_retries" in workeroutput:
+            self.retry_policy.merge(workeroutput["splinter_retries"])
+
+        if self.health_monitor is not None and "splinter_recycled" in workeroutput:
+            self.health_monitor.merge(workeroutput["splinter_recycled"])
+
+    def pytest_runtest_logreport(self, report):
+        """Write the screenshots sent by a worker with a test report.
 
-            os.makedirs(screenshot_dir, exist_ok=True)
+        The failure report of the test then points at the written files.
+        """
+        if report.when != "teardown":
+            if report.failed:
+                self._failures[report.nodeid] = report
+            return
 
-            for filename in screenshot["files"]:
-                encoding = filename.get("encoding")
-                filepath = os.path.join(screenshot_dir, filename["file_name"])
+        failure = self._failures.pop(report.nodeid, None)
+        if failure is None and report.failed:
+            failure = report
 
-                LOGGER.info(f"Saving screenshot to: {filepath}")
+        screenshots = getattr(report, "splinter_screenshots", None)
+        if not screenshots:
+            return
 
-                mode = 'wb'
-                if encoding:
-                    mode = 'w'
+        paths = {}
+        for screenshot in screenshots:
+            written = self._write(report.nodeid, screenshot)
+            for file, path in zip(screenshot["files"], written):
+                paths[os.path.splitext(file["file_name"])[1]] = path
 
-                with open(filepath, mode, **dict(encoding=encoding) if encoding else {}) as fd: # NOQA C408
-                    fd.write(filename["content"])
+        if failure is not None and hasattr(failure.longrepr, "reprtraceback"):
+            failure.longrepr.reprtraceback.extraline = screenshot_extraline(
+                paths.get(".png", ""), paths.get(".html", ""),
+            )
+
+        # Do not keep the content around for as long as the report lives.
+        report.splinter_screenshots = []
+
+    def _write(self, nodeid: str, screenshot: Dict[str, Any]) -> List[str]:
+        """Write the files of a screenshot, to the artifact store if enabled.
+
+        Returns:
+            list: The paths of the files.
+        """
+        if self.artifact_store is None:
+            return write_screenshots(
+                self.screenshot_dir, screenshot["class_name"], screenshot["files"],
+            )
+
+        # Content is only sent the first time a worker sees a blob.
+        return [
+            self.artifact_store.add(
+                nodeid,
+                screenshot["class_name"],
+                file["file_name"],
+                file.get("content"),
+                file.get("encoding"),
+                file.get("digest"),
+            )
+            for file in screenshot["files"]
+        ]
@@ -40,6 +40,10 @@ setup(
         ('Programming Language :: Python :: %s' % x)
         for x in '3.8 3.9 3.10 3.11 3.12'.split()
     ],
+    extras_require={
+        'health': ['psutil'],
+        'zstd': ['zstandard'],
+    },
     tests_require=['tox'],
     entry_points={'pytest11': [
         'pytest-splinter4=pytest_splinter4.plugin',
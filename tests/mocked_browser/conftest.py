@@ -1,4 +1,5 @@
 """Configuration for pytest runner."""
+import base64
 import unittest.mock as mock
 
 import pytest
@@ -24,6 +25,9 @@ def mocked_browser(browser_pool, request):
         mocked_browser.driver.profile = mock.MagicMock()
         mocked_browser.driver_name = driver_name
         mocked_browser.html = u"<html></html>"
+        mocked_browser.driver.get_screenshot_as_base64.return_value = (
+            base64.b64encode(b"dummy").decode("ascii")
+        )
 
         def screenshot(name='', **kwargs):
             path = f"{name}.png"
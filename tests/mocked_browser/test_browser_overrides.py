@@ -51,4 +51,4 @@ def test_wait_for_condition(mocked_browser, browser, monkeypatch):
 
     assert browser.wait_for_condition(condition, 10)
 
-    assert sleeps == [0.5]
+    assert sleeps == [0.01]
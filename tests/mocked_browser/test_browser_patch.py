@@ -52,4 +52,45 @@ def test_wait_for_condititon(browser, monkeypatch):
 
     assert browser.wait_for_condition(condition, 10)
 
-    assert sleeps == [0.5]
+    assert sleeps == [0.01]
+
+
+def test_wait_for_condition_backoff(browser, monkeypatch):
+    """The poll interval doubles up to the maximum."""
+    checks = iter([False] * 8 + [True])
+    ticks = iter(range(1, 11))
+    sleeps = []
+
+    monkeypatch.setattr(time, "time", lambda: next(ticks) / 1000)
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    browser.wait_poll_initial = 0.01
+    browser.wait_poll_max = 0.5
+
+    assert browser.wait_for_condition(lambda browser: next(checks), 10)
+
+    assert sleeps == [0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.5, 0.5]
+
+
+def test_wait_for_condition_already_true(browser, monkeypatch):
+    """A condition which is already true does not wait."""
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    assert browser.wait_for_condition(lambda browser: True, 10)
+
+    assert sleeps == []
+
+
+def test_wait_for_condition_poll_frequency(browser, monkeypatch):
+    """An explicit poll frequency keeps a fixed poll interval."""
+    checks = iter([False, False, True])
+    ticks = iter([1, 2, 3, 4])
+    sleeps = []
+
+    monkeypatch.setattr(time, "time", lambda: next(ticks))
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    assert browser.wait_for_condition(lambda browser: next(checks), 10, poll_frequency=0.5)
+
+    assert sleeps == [0.5, 0.5]
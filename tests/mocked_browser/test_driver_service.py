@@ -0,0 +1,98 @@
+"""Driver service reuse tests."""
+import pytest
+
+
+@pytest.mark.parametrize("reuse", ["true", "false", None])
+def test_driver_service_passed_to_browser(pytester, reuse):
+    """Browsers get a reusable driver service instead of an executable path.
+
+    Driver services are not reused by default.
+    """
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+        calls = []
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                calls.append(kwargs)
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile(f"""
+        from conftest import calls
+
+        from pytest_splinter4.driver_service import ReusableService
+
+        def test_service(browser):
+            kwargs = calls[-1]
+            if {reuse == "true"}:
+                assert isinstance(kwargs["service"], ReusableService)
+                assert "executable_path" not in kwargs
+                assert "service_args" not in kwargs
+            else:
+                assert "service" not in kwargs
+                assert "executable_path" in kwargs
+    """)
+
+    args = ["--splinter-webdriver=chrome"]
+    if reuse is not None:
+        args.append(f"--splinter-reuse-driver-service={reuse}")
+
+    result = pytester.runpytest(*args)
+    result.assert_outcomes(passed=1)
+
+
+def test_driver_service_released_on_failure(pytester):
+    """A browser failing to start gives its driver service to the next attempt."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+        from selenium.common.exceptions import SessionNotCreatedException
+
+        services = []
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                service = kwargs["service"]
+                services.append(service)
+                # Selenium started the driver process before the browser failed.
+                service.service.process = mock.MagicMock(**{"poll.return_value": None})
+                service.started = True
+                if len(services) == 1:
+                    raise SessionNotCreatedException("Chrome crashed")
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile("""
+        from conftest import services
+
+        def test_service(browser):
+            assert len(services) == 2
+            assert services[0] is services[1]
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-webdriver=chrome",
+        "--splinter-reuse-driver-service=true",
+        "--splinter-retry-backoff=0",
+    )
+    result.assert_outcomes(passed=1)
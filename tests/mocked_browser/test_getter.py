@@ -28,3 +28,303 @@ def test_browser_instance_getter(request, browser_instance_getter):
     assert browser_instance_getter(
         request, test_browser_instance_getter
     ) is browser_instance_getter(request, test_browser_instance_getter)
+
+
+LAUNCHED_OPTIONS = """
+    import unittest.mock as mock
+
+    import pytest
+
+    launched = []
+
+
+    @pytest.fixture(scope="session")
+    def splinter_browser_class():
+        def browser_class(driver_name, **kwargs):
+            launched.append(kwargs["options"])
+            return mock.MagicMock(driver_name=driver_name)
+
+        return browser_class
+"""
+
+
+@pytest.mark.parametrize("webdriver", ["chrome", "firefox"])
+def test_http_cache_proxy(pytester, webdriver):
+    """Browser options use the caching proxy."""
+    pytester.makeconftest(LAUNCHED_OPTIONS)
+    pytester.makepyfile("""
+        from conftest import launched
+
+        def test_proxy(browser, splinter_webdriver, _splinter_http_proxy, request):
+            options = launched[-1]
+            if splinter_webdriver == "chrome":
+                assert f"--proxy-server={_splinter_http_proxy.url}" in options.arguments
+            else:
+                host, port = _splinter_http_proxy.address
+                assert options.preferences["network.proxy.http"] == host
+                assert options.preferences["network.proxy.http_port"] == port
+                assert options.preferences["network.proxy.allow_hijacking_localhost"] is True
+    """)
+
+    result = pytester.runpytest("--splinter-http-cache=cache", f"--splinter-webdriver={webdriver}")
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.parametrize("remote_name", ["chrome", "firefox"])
+def test_http_cache_proxy_not_sent_to_remote(pytester, remote_name):
+    """Remote browsers can not reach the proxy, they are launched without it."""
+    pytester.makeconftest(LAUNCHED_OPTIONS)
+    pytester.makepyfile("""
+        from conftest import launched
+
+        def test_proxy(browser):
+            options = launched[-1]
+            assert not any("--proxy-server" in arg for arg in options.arguments)
+            assert "network.proxy.type" not in options.preferences
+    """.replace("options.preferences", "getattr(options, 'preferences', {})"))
+
+    result = pytester.runpytest(
+        "--splinter-http-cache=cache",
+        "--splinter-webdriver=remote",
+        f"--splinter-remote-name={remote_name}",
+    )
+    result.assert_outcomes(passed=1, warnings=1)
+    result.stdout.fnmatch_lines(["*--splinter-http-cache only applies to local browsers*"])
+
+
+def test_driver_configuration_is_lazy(pytester):
+    """Only the options and arguments of the webdriver in use are resolved."""
+    pytester.makepyfile("""
+        import pytest
+
+        @pytest.fixture(scope="session")
+        def firefox_options():
+            raise AssertionError("firefox options resolved")
+
+        def test_lazy(browser, _splinter_driver_default_kwargs, monkeypatch):
+            def get_executable_path(root, file_name, resolver=None):
+                raise AssertionError(f"{file_name} resolved")
+
+            monkeypatch.setattr(
+                "pytest_splinter4.plugin.get_executable_path", get_executable_path,
+            )
+            assert _splinter_driver_default_kwargs["chrome"]["options"] == {}
+            with pytest.raises(AssertionError, match="geckodriver resolved"):
+                _splinter_driver_default_kwargs["firefox"]
+    """)
+
+    result = pytester.runpytest("--splinter-webdriver=chrome")
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.parametrize("webdriver", ["chrome", "firefox"])
+def test_blocked_url_patterns(pytester, webdriver):
+    """Firefox uses the proxy to block urls, chrome does not need it."""
+    pytester.makeconftest(LAUNCHED_OPTIONS)
+    pytester.makepyfile("""
+        from conftest import launched
+
+        def test_proxy(
+            browser, splinter_webdriver, _splinter_http_proxy, splinter_blocked_url_patterns,
+        ):
+            assert splinter_blocked_url_patterns == ["*.woff2", "*://*.doubleclick.net/*"]
+            assert _splinter_http_proxy.blocked_url_patterns == splinter_blocked_url_patterns
+            if splinter_webdriver == "chrome":
+                assert not any("--proxy-server" in arg for arg in launched[-1].arguments)
+            else:
+                assert launched[-1].preferences["network.proxy.type"] == 1
+                # The application under test on localhost does not go through the proxy.
+                assert launched[-1].preferences["network.proxy.allow_hijacking_localhost"] is False
+    """)
+
+    result = pytester.runpytest(
+        f"--splinter-webdriver={webdriver}",
+        "--splinter-block-url=*.woff2",
+        "--splinter-block-url=*://*.doubleclick.net/*",
+    )
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.parametrize("webdriver, started", [("chrome", False), ("firefox", True)])
+def test_blocked_url_patterns_proxy_started(pytester, webdriver, started):
+    """Chrome blocks urls itself, the proxy is only started for firefox."""
+    pytester.makeconftest(LAUNCHED_OPTIONS + """
+
+    proxies = []
+
+
+    @pytest.fixture(scope="session")
+    def _splinter_http_proxy():
+        proxies.append(mock.MagicMock(address=("127.0.0.1", 8080), mode="off"))
+        return proxies[-1]
+    """)
+    pytester.makepyfile(f"""
+        from conftest import proxies
+
+        def test_proxy(browser):
+            assert bool(proxies) is {started}
+    """)
+
+    result = pytester.runpytest(f"--splinter-webdriver={webdriver}", "--splinter-block-url=*.woff2")
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.parametrize("remote_name", ["chrome", "firefox"])
+def test_blocked_url_patterns_remote(pytester, remote_name):
+    """Remote browsers do not block urls, which warns."""
+    pytester.makeconftest(LAUNCHED_OPTIONS)
+    pytester.makepyfile("""
+        from conftest import launched
+
+        def test_proxy(browser):
+            assert "network.proxy.type" not in getattr(launched[-1], "preferences", {})
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-webdriver=remote",
+        f"--splinter-remote-name={remote_name}",
+        "--splinter-block-url=*.woff2",
+    )
+    result.assert_outcomes(passed=1, warnings=1)
+    result.stdout.fnmatch_lines(["*--splinter-block-url only applies to local browsers*"])
+
+
+def test_options_copied_per_launch(pytester):
+    """Each browser gets its own copy of the session options."""
+    pytester.makepyfile("""
+        import unittest.mock as mock
+
+        import pytest
+
+        launched = []
+
+
+        @pytest.fixture(scope="session")
+        def splinter_browser_class():
+            def browser_class(driver_name, **kwargs):
+                # Splinter adds arguments to the options it is given
+                kwargs["options"].add_argument("--headless")
+                launched.append(kwargs["options"])
+                return mock.MagicMock(driver_name=driver_name)
+
+            return browser_class
+
+
+        @pytest.mark.parametrize("run", [1, 2])
+        def test_options(request, browser_instance_getter, chrome_options, run):
+            browser_instance_getter(request, test_options)
+            assert chrome_options.arguments == ["--disable-gpu"]
+            assert launched[-1] is not chrome_options
+            assert launched[-1].arguments == ["--disable-gpu", "--headless"]
+
+            if run == 2:
+                assert launched[0] is not launched[1]
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-webdriver=chrome",
+        "--splinter-session-scoped-browser=false",
+        "--chrome-arguments=--disable-gpu",
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_get_browser_retry(pytester):
+    """A failed browser launch is retried, and reported."""
+    pytester.makepyfile("""
+        import unittest.mock as mock
+
+        import pytest
+
+        from selenium.common.exceptions import SessionNotCreatedException
+
+        launches = []
+
+
+        @pytest.fixture(scope="session")
+        def splinter_browser_class():
+            def browser_class(driver_name, **kwargs):
+                launches.append(driver_name)
+                if len(launches) < 3:
+                    raise SessionNotCreatedException("Grid is busy")
+                return mock.MagicMock(driver_name=driver_name)
+
+            return browser_class
+
+
+        def test_retry(browser):
+            assert len(launches) == 3
+    """)
+
+    result = pytester.runpytest("--splinter-retry-backoff=0.01")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines([
+        "*splinter retries*",
+        "get_browser*session_not_created*2",
+        "get_browser retried 2 times",
+    ])
+
+
+def test_get_browser_retry_attempts(pytester):
+    """The error of the last attempt is raised."""
+    pytester.makepyfile("""
+        import pytest
+
+        from selenium.common.exceptions import SessionNotCreatedException
+
+
+        @pytest.fixture(scope="session")
+        def splinter_browser_class():
+            def browser_class(driver_name, **kwargs):
+                raise SessionNotCreatedException("Grid is busy")
+
+            return browser_class
+
+
+        def test_retry(browser):
+            pass
+    """)
+
+    result = pytester.runpytest("--splinter-retry-attempts=2", "--splinter-retry-backoff=0.01")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*SessionNotCreatedException*Grid is busy*"])
+
+
+def test_remote_connection_shared(pytester):
+    """Remote browsers share the connection to the grid."""
+    pytester.makepyfile("""
+        import unittest.mock as mock
+
+        import pytest
+
+        from pytest_splinter4.remote import SharedRemoteConnection
+
+        executors = []
+
+
+        @pytest.fixture(scope="session")
+        def splinter_browser_class():
+            def browser_class(driver_name, **kwargs):
+                executors.append(kwargs["command_executor"])
+                return mock.MagicMock(driver_name=driver_name)
+
+            return browser_class
+
+
+        @pytest.mark.parametrize("run", [1, 2])
+        def test_remote(request, browser_instance_getter, run):
+            browser_instance_getter(request, test_remote)
+            assert isinstance(executors[-1], SharedRemoteConnection)
+            assert executors[-1].pool_size == 4
+
+            if run == 2:
+                assert executors[0] is executors[1]
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-webdriver=remote",
+        "--splinter-remote-url=http://127.0.0.1:4444/wd/hub",
+        "--splinter-remote-pool-size=4",
+        "--splinter-session-scoped-browser=false",
+    )
+    result.assert_outcomes(passed=2)
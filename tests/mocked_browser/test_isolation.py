@@ -0,0 +1,36 @@
+"""Browser isolation tests."""
+
+
+def test_process_isolation(pytester):
+    """Each test gets a new browser, which is closed after the test."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile("""
+        browsers = []
+
+        def test_one(browser):
+            browsers.append(browser)
+
+        def test_two(browser):
+            browsers.append(browser)
+            assert browsers[0] is not browsers[1]
+            browsers[0].quit.assert_called_once()
+    """)
+
+    result = pytester.runpytest("--splinter-isolation=process")
+    result.assert_outcomes(passed=2)
@@ -0,0 +1,168 @@
+"""Parallel browser startup tests."""
+import pytest
+
+
+def test_browser_fixtures_start_in_parallel(pytester):
+    """Browsers needed by the same test are launched at the same time."""
+    pytester.makeconftest("""
+        import threading
+        import unittest.mock as mock
+
+        import pytest
+
+        barrier = threading.Barrier(2, timeout=5)
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                # Fails with BrokenBarrierError unless both start together.
+                barrier.wait()
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+
+
+        @pytest.fixture
+        def admin_browser(request, browser_instance_getter):
+            return browser_instance_getter(request, admin_browser)
+    """)
+
+    pytester.makepyfile("""
+        def test_two_browsers(browser, admin_browser):
+            assert browser is not admin_browser
+    """)
+
+    result = pytester.runpytest("--splinter-session-scoped-browser=false")
+    result.assert_outcomes(passed=1)
+
+
+def test_pooled_browsers_not_launched_ahead(pytester):
+    """Browsers the pool has for the other fixtures of a test are not launched again."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+        browsers = []
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                browsers.append(mock.MagicMock(driver_name=driver_name))
+                return browsers[-1]
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+
+
+        @pytest.fixture
+        def admin_browser(request, browser_instance_getter):
+            return browser_instance_getter(request, admin_browser)
+    """)
+
+    pytester.makepyfile("""
+        from conftest import browsers
+
+        def test_admin(admin_browser):
+            pass
+
+        def test_two_browsers(browser, admin_browser):
+            pass
+
+        def test_count():
+            assert len(browsers) == 2
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-session-scoped-browser=false", "--splinter-browser-pool-size=2",
+    )
+    result.assert_outcomes(passed=3)
+
+
+@pytest.mark.parametrize("args, count", [
+    (["--splinter-session-scoped-browser=true"], 1),
+    (["--splinter-session-scoped-browser=false", "--splinter-browser-pool-size=1"], 1),
+    (["--splinter-session-scoped-browser=false"], 5),
+])
+def test_reused_browsers_not_prewarmed(pytester, args, count):
+    """Prewarmed browsers are only launched for browsers which are not reused."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+        browsers = []
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                browsers.append(mock.MagicMock(driver_name=driver_name))
+                return browsers[-1]
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile(f"""
+        import pytest
+
+        from conftest import browsers
+
+        @pytest.mark.parametrize("run", range(3))
+        def test_browser(browser, run):
+            pass
+
+        def test_count(browser_instance_getter):
+            assert len(browsers) == {count}
+    """)
+
+    result = pytester.runpytest("--splinter-prewarm=2", *args)
+    result.assert_outcomes(passed=4)
+
+
+def test_fixtures_resolved_in_main_thread(pytester):
+    """Fixtures needed to launch browsers are not resolved by prewarm threads."""
+    pytester.makeconftest("""
+        import threading
+        import unittest.mock as mock
+
+        import pytest
+
+        threads = set()
+
+
+        @pytest.fixture(scope="session", autouse=True)
+        def spy_getfixturevalue():
+            getfixturevalue = pytest.FixtureRequest.getfixturevalue
+
+            def spy(self, argname):
+                threads.add(threading.current_thread())
+                return getfixturevalue(self, argname)
+
+            with mock.patch.object(pytest.FixtureRequest, "getfixturevalue", spy):
+                yield
+    """)
+
+    pytester.makepyfile("""
+        import threading
+
+        import pytest
+
+        from conftest import threads
+
+
+        @pytest.mark.parametrize("run", [1, 2, 3])
+        def test_prewarm(browser, run):
+            assert threads == {threading.main_thread()}
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-session-scoped-browser=false", "--splinter-prewarm=2",
+    )
+    result.assert_outcomes(passed=3)
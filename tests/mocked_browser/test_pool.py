@@ -0,0 +1,139 @@
+"""Browser pool tests."""
+import pytest
+
+from pytest_splinter4 import health
+
+
+def test_function_scoped_browser_reused_with_pool_size(pytester):
+    """Function scoped browsers are reused when the pool has a size."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile("""
+        browsers = []
+
+        def test_one(browser):
+            browsers.append(browser)
+
+        def test_two(browser):
+            browsers.append(browser)
+
+        def test_three(browser):
+            browsers.append(browser)
+            assert browsers[0] is browsers[1]
+            assert browsers[1] is not browsers[2]
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-session-scoped-browser=false",
+        "--splinter-browser-pool-size=1",
+        "--splinter-browser-pool-max-uses=2",
+    )
+    result.assert_outcomes(passed=3)
+
+
+def test_browser_recycled_after_max_uptime(pytester):
+    """A browser older than the max uptime is replaced before the next test."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile("""
+        import time
+
+        browsers = []
+
+        def test_one(browser):
+            browsers.append(browser)
+            time.sleep(0.2)
+
+        def test_two(browser):
+            browsers.append(browser)
+            assert browsers[0] is not browsers[1]
+            browsers[0].quit.assert_called_once()
+    """)
+
+    result = pytester.runpytest("--splinter-browser-max-uptime=0.1")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        "*= splinter recycled browsers =*",
+        "uptime * 1",
+    ])
+
+
+def test_browser_health_requires_psutil(pytester, monkeypatch):
+    """Memory and CPU limits without psutil are a usage error, before any test runs."""
+    monkeypatch.setattr(health, "psutil", None)
+    pytester.makepyfile("""
+        def test_browser(browser):
+            pass
+    """)
+
+    result = pytester.runpytest("--splinter-browser-max-memory=500")
+
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*require the psutil package*"])
+
+
+def test_recycled_browsers_reported_from_workers(pytester):
+    """Browsers recycled by pytest-xdist workers are reported by the controller."""
+    pytester.makeconftest("""
+        import unittest.mock as mock
+
+        import pytest
+
+
+        @pytest.fixture(autouse=True)
+        def mocked_browser():
+            def browser(driver_name, *args, **kwargs):
+                mocked_browser = mock.MagicMock()
+                mocked_browser.driver_name = driver_name
+                return mocked_browser
+
+            with mock.patch("pytest_splinter4.plugin.splinter.Browser", browser):
+                yield
+    """)
+
+    pytester.makepyfile("""
+        import time
+
+        def test_one(browser):
+            time.sleep(0.2)
+
+        def test_two(browser):
+            pass
+    """)
+
+    result = pytester.runpytest("-n", "1", "--splinter-browser-max-uptime=0.1")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        "*= splinter recycled browsers =*",
+        "uptime * 1",
+    ])
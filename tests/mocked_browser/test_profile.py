@@ -25,3 +25,80 @@ def test_firefox_profile(pytester):
 
     result = pytester.runpytest('-vv')
     assert 0 == result.ret
+
+
+def test_firefox_profile_preferences_not_in_profile(pytester):
+    """Preferences are only sent with the options, not in the zipped profile."""
+    pytester.makepyfile("""
+        import base64
+        import io
+        import zipfile
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        def splinter_firefox_profile_directory(tmp_path_factory):
+            directory = tmp_path_factory.mktemp("profile")
+            (directory / "cert9.db").write_text("certs")
+            return str(directory)
+
+
+        @pytest.fixture(scope="session")
+        def splinter_firefox_profile_preferences():
+            return {'browser.startup.page': 1}
+
+
+        def test_preferences(browser, firefox_options):
+            options = firefox_options.to_capabilities()["moz:firefoxOptions"]
+            assert options["prefs"]['browser.startup.page'] == 1
+
+            encoded = base64.b64decode(options["profile"])
+            with zipfile.ZipFile(io.BytesIO(encoded)) as zipped:
+                assert zipped.namelist() == ["cert9.db"]
+    """)
+
+    result = pytester.runpytest('-vv')
+    result.assert_outcomes(passed=1)
+
+
+def test_firefox_profile_built_once(pytester):
+    """The profile directory is zipped once, and preferences are applied once."""
+    pytester.makeconftest("""
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        def splinter_firefox_profile_directory(tmp_path_factory):
+            directory = tmp_path_factory.mktemp("profile")
+            (directory / "cert9.db").write_text("certs")
+            return str(directory)
+    """)
+
+    pytester.makepyfile("""
+        import unittest.mock as mock
+
+        import pytest
+
+        profiles = []
+
+
+        @pytest.fixture(autouse=True)
+        def spy_firefox_options(firefox_options):
+            firefox_options.set_preference = mock.Mock(wraps=firefox_options.set_preference)
+            return firefox_options
+
+
+        @pytest.mark.parametrize("run", [1, 2])
+        def test_profile(request, browser_instance_getter, firefox_options, run):
+            browser_instance_getter(request, test_profile)
+            profiles.append(firefox_options.profile)
+            assert firefox_options.profile.encoded
+
+            if run == 2:
+                assert profiles[0] is profiles[1]
+                assert firefox_options.set_preference.call_count == 0
+    """)
+
+    result = pytester.runpytest("-vv", "--splinter-session-scoped-browser=false")
+    result.assert_outcomes(passed=2)
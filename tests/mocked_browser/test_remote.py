@@ -0,0 +1,75 @@
+"""Remote session reuse tests."""
+import os
+
+
+def test_session_registry_shared_with_workers(pytester):
+    """pytest-xdist workers park sessions in the directory of the controller."""
+    pytester.makepyfile("""
+        import os
+
+        import pytest
+
+        from pytest_splinter4.remote import get_session_registry
+
+
+        @pytest.mark.parametrize("run", range(4))
+        def test_registry(request, run, worker_id):
+            registry = get_session_registry(request.config)
+            assert os.path.isdir(registry.directory)
+            with open(f"registry-{worker_id}", "w") as fd:
+                fd.write(registry.directory)
+    """)
+
+    result = pytester.runpytest("-n", "2", "--splinter-remote-session-reuse=true")
+    result.assert_outcomes(passed=4)
+
+    directories = {path.read_text() for path in pytester.path.glob("registry-*")}
+    assert len(directories) == 1
+    # The controller quits the parked sessions and removes the directory.
+    assert not os.path.exists(directories.pop())
+
+
+def test_failing_remote_url_left_out(pytester):
+    """A session failing on a grid is retried on the next one."""
+    pytester.makepyfile("""
+        import unittest.mock as mock
+
+        import pytest
+
+        from selenium.common.exceptions import SessionNotCreatedException
+
+        urls = []
+
+
+        @pytest.fixture(scope="session")
+        def splinter_browser_class():
+            def browser_class(driver_name, **kwargs):
+                url = kwargs["command_executor"]._url
+                urls.append(url)
+                if url == "http://grid-a:4444/wd/hub":
+                    raise SessionNotCreatedException("Grid is full")
+                return mock.MagicMock(driver_name=driver_name)
+
+            return browser_class
+
+
+        @pytest.mark.parametrize("run", range(3))
+        def test_remote(request, browser_instance_getter, run):
+            browser_instance_getter(request, test_remote)
+
+            if run == 2:
+                assert urls == [
+                    "http://grid-a:4444/wd/hub",
+                    "http://grid-b:4444/wd/hub",
+                    "http://grid-b:4444/wd/hub",
+                    "http://grid-b:4444/wd/hub",
+                ]
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-webdriver=remote",
+        "--splinter-remote-url=http://grid-a:4444/wd/hub,http://grid-b:4444/wd/hub",
+        "--splinter-session-scoped-browser=false",
+        "--splinter-retry-backoff=0.01",
+    )
+    result.assert_outcomes(passed=3)
@@ -1,6 +1,8 @@
 """Browser screenshot tests."""
+import json
 import unittest.mock as mock
 import os
+import re
 
 import pytest
 
@@ -163,3 +165,211 @@ def test_browser_screenshot_xdist(pytester):
 
     for item in (os.listdir(expected_directory)):
         assert item.startswith('test_screenshot-browser')
+
+
+def test_browser_screenshot_async(pytester, mocked_browser):
+    """Test writing screenshots in a background thread on test failure."""
+    pytester.inline_runsource(
+        """
+        import base64
+
+        def test_screenshot(browser):
+            browser.driver.get_screenshot_as_base64.return_value = (
+                base64.b64encode(b"png").decode("ascii")
+            )
+            assert False
+    """,
+        "-vl",
+        "--splinter-screenshot-async",
+    )
+
+    expected_directory = os.path.join(
+        pytester.path, "logs", "test_browser_screenshot_async",
+    )
+
+    png = os.path.join(expected_directory, "test_screenshot-browser.png")
+    html = os.path.join(expected_directory, "test_screenshot-browser.html")
+
+    with open(png, "rb") as f:
+        assert f.read() == b"png"
+
+    with open(html) as f:
+        assert f.read() == "<html></html>"
+
+
+@pytest.mark.skipif(
+    'not config.pluginmanager.getplugin("xdist")',
+    reason="pytest-xdist is not installed",
+)
+def test_browser_screenshot_async_xdist(pytester):
+    """Test writing screenshots in a background thread in distributed mode (xdist)."""
+    pytester.inline_runsource(
+        """
+        import base64
+        import unittest.mock as mock
+
+        import splinter
+
+        import pytest
+
+        m = mock.MagicMock()
+        m.return_value.driver_name = "mock"
+        m.return_value.html = "<html></html>"
+        m.return_value.driver.get_screenshot_as_base64.return_value = (
+            base64.b64encode(b"png").decode("ascii")
+        )
+
+        splinter.browser._DRIVERS['mock'] = m
+
+        @pytest.fixture
+        def splinter_webdriver():
+            return "mock"
+
+
+        def test_screenshot(browser):
+            assert False
+    """,
+        "-vl",
+        "-n1",
+        "--splinter-screenshot-async",
+    )
+
+    expected_directory = os.path.join(
+        pytester.path, 'logs', 'test_browser_screenshot_async_xdist',
+    )
+
+    assert sorted(os.listdir(expected_directory)) == [
+        'test_screenshot-browser.html',
+        'test_screenshot-browser.png',
+    ]
+
+    with open(os.path.join(expected_directory, 'test_screenshot-browser.png'), 'rb') as f:
+        assert f.read() == b"png"
+
+
+@pytest.mark.skipif(
+    'not config.pluginmanager.getplugin("xdist")',
+    reason="pytest-xdist is not installed",
+)
+def test_browser_screenshot_xdist_streamed(pytester):
+    """Screenshots are written by the controller while the worker is still running tests."""
+    pytester.inline_runsource(
+        """
+        import base64
+        import os
+        import time
+        import unittest.mock as mock
+
+        import splinter
+
+        import pytest
+
+        m = mock.MagicMock()
+        m.return_value.driver_name = "mock"
+        m.return_value.html = "<html></html>"
+        m.return_value.driver.get_screenshot_as_base64.return_value = (
+            base64.b64encode(b"png").decode("ascii")
+        )
+
+        splinter.browser._DRIVERS['mock'] = m
+
+        @pytest.fixture
+        def splinter_webdriver():
+            return "mock"
+
+
+        def test_screenshot(browser):
+            assert False
+
+
+        def test_screenshot_is_written():
+            path = os.path.join(
+                "logs", "test_browser_screenshot_xdist_streamed", "test_screenshot-browser.png",
+            )
+            deadline = time.time() + 10
+            while not os.path.exists(path) and time.time() < deadline:
+                time.sleep(0.05)
+            assert os.path.exists(path)
+    """,
+        "-vl",
+        "-n1",
+        "--splinter-screenshot-async",
+    ).assertoutcome(passed=1, failed=1)
+
+
+ARTIFACT_STORE_SOURCE = """
+    import base64
+    import unittest.mock as mock
+
+    import splinter
+
+    import pytest
+
+    m = mock.MagicMock()
+    m.return_value.driver_name = "mock"
+    m.return_value.html = "<html></html>"
+    m.return_value.driver.get_screenshot_as_base64.return_value = (
+        base64.b64encode(b"png").decode("ascii")
+    )
+
+    splinter.browser._DRIVERS['mock'] = m
+
+    @pytest.fixture
+    def splinter_webdriver():
+        return "mock"
+
+
+    @pytest.mark.parametrize("page", [1, 2, 3])
+    def test_screenshot(browser, page):
+        assert False
+"""
+
+
+def _assert_artifact_store(pytester):
+    logs = os.path.join(pytester.path, "logs")
+
+    assert len(os.listdir(os.path.join(logs, "blobs"))) == 2
+
+    with open(os.path.join(logs, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    assert len(manifest["tests"]) == 3
+    for files in manifest["tests"].values():
+        assert sorted(file["file_name"].split("-")[-1] for file in files) == [
+            "browser.html", "browser.png",
+        ]
+        for file in files:
+            assert os.path.isfile(os.path.join(logs, file["blob"]))
+
+
+def test_browser_screenshot_artifact_store(pytester):
+    """Identical screenshots are stored once."""
+    pytester.inline_runsource(
+        ARTIFACT_STORE_SOURCE, "-vl", "--splinter-artifact-store",
+    ).assertoutcome(failed=3)
+
+    _assert_artifact_store(pytester)
+
+
+@pytest.mark.skipif(
+    'not config.pluginmanager.getplugin("xdist")',
+    reason="pytest-xdist is not installed",
+)
+def test_browser_screenshot_artifact_store_xdist(pytester):
+    """Identical screenshots are stored once in distributed mode (xdist).
+
+    Failure reports point at the blobs written by the controller.
+    """
+    reprec = pytester.inline_runsource(
+        ARTIFACT_STORE_SOURCE, "-vl", "-n1", "--splinter-artifact-store",
+    )
+    reprec.assertoutcome(failed=3)
+
+    _assert_artifact_store(pytester)
+
+    blobs = os.path.join(pytester.path, "logs", "blobs")
+    for report in reprec.getfailures():
+        extraline = report.longrepr.reprtraceback.extraline
+        png, html = re.findall(r"(?:png|html): +(.*)", extraline)
+        assert os.path.dirname(png) == os.path.dirname(html) == blobs
+        assert os.path.isfile(png) and os.path.isfile(html)
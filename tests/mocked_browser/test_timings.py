@@ -0,0 +1,52 @@
+"""Browser lifecycle timings tests."""
+import json
+
+
+def test_timings_report(pytester, mocked_browser):
+    """Lifecycle phases are printed and written to a JSON file."""
+    pytester.makepyfile("""
+        def test_timings(browser):
+            browser.visit("http://example.com")
+            assert False
+    """)
+
+    result = pytester.runpytest(
+        "--splinter-timings",
+        "--splinter-timings-json=timings.json",
+    )
+
+    result.stdout.fnmatch_lines([
+        "*splinter browser timings*",
+        "phase*count*total*p50*p95*max",
+    ])
+    result.stdout.fnmatch_lines(["get_browser*1*"])
+
+    with open(pytester.path / "timings.json") as fd:
+        data = json.load(fd)
+
+    phases = {record["phase"] for record in data["records"]}
+    assert phases == {
+        "get_browser",
+        "prepare_browser",
+        "reset_browser",
+        "take_screenshot",
+        "wait_for_condition",
+    }
+    assert all(
+        record["nodeid"] == "test_timings_report.py::test_timings"
+        for record in data["records"]
+    )
+
+
+def test_timings_not_recorded_by_default(pytester, mocked_browser):
+    """Timings are not kept in memory unless they are reported."""
+    pytester.makepyfile("""
+        from pytest_splinter4.timings import get_timings
+
+        def test_timings(request, browser):
+            browser.visit("http://example.com")
+            assert get_timings(request.config).records == []
+    """)
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
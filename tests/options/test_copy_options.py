@@ -0,0 +1,39 @@
+from pytest_splinter4.options import copy_options
+
+from selenium import webdriver
+
+
+def test_copy_options_chrome():
+    """Arguments added to the copy are not added to the original."""
+    options = webdriver.chrome.options.Options()
+    options.add_argument("--disable-gpu")
+
+    options_copy = copy_options(options)
+    options_copy.add_argument("--headless")
+    options_copy.add_experimental_option("detach", True)
+
+    assert options.arguments == ["--disable-gpu"]
+    assert options.experimental_options == {}
+    assert options_copy.arguments == ["--disable-gpu", "--headless"]
+
+
+def test_copy_options_firefox():
+    """Preferences set on the copy are not set on the original."""
+    options = webdriver.firefox.options.Options()
+    options.set_preference("browser.startup.page", 1)
+    profile = object()
+    options._profile = profile
+
+    options_copy = copy_options(options)
+    options_copy.set_preference("network.dns.disableIPv6", False)
+
+    assert options.preferences == {"browser.startup.page": 1}
+    assert options_copy.preferences == {
+        "browser.startup.page": 1,
+        "network.dns.disableIPv6": False,
+    }
+    assert options_copy._profile is profile
+
+
+def test_copy_options_none():
+    assert copy_options(None) is None
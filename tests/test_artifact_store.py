@@ -0,0 +1,79 @@
+"""ArtifactStore tests."""
+import gzip
+import json
+import sys
+
+import pytest
+
+from pytest_splinter4.artifact_store import ArtifactStore, content_digest
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    """Each unique payload is saved as a single blob."""
+    store = ArtifactStore(str(tmp_path))
+
+    first = store.add("test_a", "tests", "test_a-browser.png", b"png")
+    second = store.add("test_b", "tests", "test_b-browser.png", b"png")
+    html = store.add("test_b", "tests", "test_b-browser.html", "<html></html>", "utf-8")
+
+    assert first == second
+    assert first == str(tmp_path / "blobs" / f"{content_digest(b'png')}.png")
+    assert html.endswith(".html")
+    assert len(list((tmp_path / "blobs").iterdir())) == 2
+
+
+def test_add_known_digest_without_content(tmp_path):
+    """Content can be omitted for blobs that are already stored."""
+    store = ArtifactStore(str(tmp_path))
+    digest = content_digest(b"png")
+    store.add("test_a", "tests", "test_a-browser.png", b"png")
+
+    path = store.add("test_b", "tests", "test_b-browser.png", digest=digest)
+
+    assert path == store.blob_path(digest, "test_b-browser.png")
+    assert store.has(digest)
+
+
+def test_gzip_compression(tmp_path):
+    """Blobs can be compressed with gzip."""
+    store = ArtifactStore(str(tmp_path), compression="gzip")
+
+    path = store.add("test_a", "tests", "test_a-browser.png", b"png")
+
+    assert path.endswith(".png.gz")
+    with open(path, "rb") as f:
+        assert gzip.decompress(f.read()) == b"png"
+
+
+def test_zstd_requires_zstandard(tmp_path, monkeypatch):
+    """A usage error is raised when zstandard is not installed."""
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+
+    with pytest.raises(pytest.UsageError):
+        ArtifactStore(str(tmp_path), compression="zstd")
+
+
+def test_manifest(tmp_path):
+    """The manifest maps each test to its blobs."""
+    store = ArtifactStore(str(tmp_path))
+    assert store.write_manifest() is None
+
+    store.add("test_a", "tests", "test_a-browser.png", b"png")
+    path = store.write_manifest()
+
+    with open(path) as f:
+        manifest = json.load(f)
+
+    digest = content_digest(b"png")
+    assert manifest == {
+        "compression": "none",
+        "tests": {
+            "test_a": [{
+                "class_name": "tests",
+                "file_name": "test_a-browser.png",
+                "digest": digest,
+                "blob": f"blobs/{digest}.png",
+                "encoding": None,
+            }],
+        },
+    }
@@ -0,0 +1,110 @@
+"""BrowserPool tests."""
+import unittest.mock as mock
+
+from pytest_splinter4.browser_pool import BrowserPool
+
+
+def test_checkout_reuses_idle_browser():
+    """A checked in browser is handed out again for the same key."""
+    pool = BrowserPool()
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    browser = pool.checkout("key", factory)
+    pool.checkin(browser)
+
+    assert pool.checkout("key", factory) is browser
+    assert factory.call_count == 1
+
+
+def test_checkout_shares_browser_in_use_for_same_key():
+    """Checking out the same key twice returns the same browser."""
+    pool = BrowserPool()
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    assert pool.checkout("key", factory) is pool.checkout("key", factory)
+    assert pool.checkout("other", factory) is not pool.checkout("key", factory)
+
+
+def test_max_uses():
+    """A browser is replaced after serving max_uses tests."""
+    pool = BrowserPool(max_uses=2)
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    browser = pool.checkout("key", factory)
+    pool.checkin(browser)
+    assert pool.checkout("key", factory) is browser
+    pool.checkin(browser)
+
+    # Expired browsers stay alive until the next checkout.
+    browser.quit.assert_not_called()
+
+    assert pool.checkout("key", factory) is not browser
+    browser.quit.assert_called_once()
+    assert len(pool) == 1
+
+
+def test_max_size_evicts_least_recently_used():
+    """When the pool is full the least recently used idle browser is quit."""
+    pool = BrowserPool(max_size=2)
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    first = pool.checkout("first", factory)
+    second = pool.checkout("second", factory)
+    pool.checkin(first)
+    pool.checkin(second)
+
+    third = pool.checkout("third", factory)
+
+    first.quit.assert_called_once()
+    second.quit.assert_not_called()
+    assert pool.values() == [second, third]
+
+
+def test_close():
+    """Closing the pool quits every browser."""
+    pool = BrowserPool()
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    browser = pool.checkout("key", factory)
+    pool.close()
+
+    browser.quit.assert_called_once()
+    assert len(pool) == 0
+
+
+def test_health_check_recycles_idle_browser():
+    """An idle browser failing the health check is replaced at checkout."""
+    reasons = iter([None, "memory 600MB over 500MB"])
+    pool = BrowserPool(health_check=lambda entry: next(reasons))
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    browser = pool.checkout("key", factory)
+    pool.checkin(browser)
+    assert pool.checkout("key", factory) is browser
+    pool.checkin(browser)
+
+    assert pool.checkout("key", factory) is not browser
+    browser.quit.assert_called_once()
+    assert len(pool) == 1
+
+
+def test_health_check_skips_browser_in_use():
+    """A browser already checked out is shared without being checked."""
+    health_check = mock.Mock(return_value="uptime")
+    pool = BrowserPool(health_check=health_check)
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+
+    assert pool.checkout("key", factory) is pool.checkout("key", factory)
+    health_check.assert_not_called()
+
+
+def test_reusable():
+    """Keys with a browser in use or not expired can be served by the pool."""
+    pool = BrowserPool(max_uses=1)
+    browser = pool.checkout("key", mock.Mock)
+
+    assert pool.reusable("key")
+    assert not pool.reusable("other")
+
+    pool.checkin(browser)
+    assert not pool.reusable("key")
@@ -0,0 +1,110 @@
+"""DriverServiceManager tests."""
+import unittest.mock as mock
+
+import pytest
+
+from pytest_splinter4 import driver_service
+from pytest_splinter4.driver_service import DriverServiceManager
+
+
+@pytest.fixture
+def service_class(monkeypatch):
+    """Replace the chromedriver service with a mock."""
+    def create(**kwargs):
+        service = mock.Mock(kwargs=kwargs, process=None)
+
+        def start():
+            service.process = mock.Mock(**{"poll.return_value": None})
+
+        service.start.side_effect = start
+        return service
+
+    service_class = mock.Mock(side_effect=create)
+    monkeypatch.setitem(driver_service.SERVICE_CLASSES, "chrome", service_class)
+    return service_class
+
+
+def test_acquire_takes_service_kwargs(service_class):
+    """Service settings are used for the service, not the webdriver."""
+    manager = DriverServiceManager()
+    kwargs = {
+        "executable_path": "/bin/chromedriver",
+        "service_args": ["--verbose"],
+        "options": "options",
+    }
+
+    service = manager.acquire("chrome", kwargs)
+
+    assert kwargs == {"options": "options"}
+    assert service.kwargs == {
+        "executable_path": "/bin/chromedriver",
+        "service_args": ["--verbose"],
+        "log_path": None,
+    }
+
+
+def test_service_is_reused(service_class):
+    """A service stays running for the next browser."""
+    manager = DriverServiceManager()
+
+    service = manager.acquire("chrome", {})
+    service.start()
+    service.stop()
+
+    assert manager.idle_count("chrome") == 1
+
+    reused = manager.acquire("chrome", {})
+    reused.start()
+
+    assert reused is service
+    service.service.start.assert_called_once()
+    service.service.stop.assert_not_called()
+    assert manager.idle_count() == 0
+
+
+def test_service_is_used_by_one_browser(service_class):
+    """Browsers running at the same time get their own service."""
+    manager = DriverServiceManager()
+
+    first = manager.acquire("chrome", {})
+    first.start()
+    second = manager.acquire("chrome", {})
+
+    assert first is not second
+
+
+def test_settings_are_not_mixed(service_class):
+    """Services are only reused with the same settings."""
+    manager = DriverServiceManager()
+
+    service = manager.acquire("chrome", {"service_args": ["--verbose"]})
+    service.start()
+    service.stop()
+
+    assert manager.acquire("chrome", {}) is not service
+
+
+def test_dead_service_is_replaced(service_class):
+    """A service whose process exited is not reused."""
+    manager = DriverServiceManager()
+
+    service = manager.acquire("chrome", {})
+    service.start()
+    service.stop()
+    service.service.process.poll.return_value = 1
+
+    assert manager.acquire("chrome", {}) is not service
+
+
+def test_close(service_class):
+    """Closing the manager stops every driver process."""
+    manager = DriverServiceManager()
+
+    started = manager.acquire("chrome", {})
+    started.start()
+    not_started = manager.acquire("chrome", {})
+
+    manager.close()
+
+    started.service.stop.assert_called_once()
+    not_started.service.stop.assert_not_called()
@@ -0,0 +1,170 @@
+"""Driver executable resolution tests."""
+import json
+import os
+
+import pytest
+
+from pytest_splinter4.executable_path import (
+    ExecutableIndex,
+    ExecutableResolver,
+    get_executable_path,
+)
+
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="Uses shell scripts as executables")
+
+
+def make_executable(directory, name, version):
+    """Create a shell script printing a version, counting its runs next to it."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(
+        "#!/bin/sh\n"
+        f"echo run >> {path}.runs\n"
+        f"echo '{name} {version} (abc)'\n",
+    )
+    path.chmod(0o755)
+    return path
+
+
+def runs(path):
+    """Get the number of times an executable made by make_executable ran."""
+    try:
+        return len((path.parent / f"{path.name}.runs").read_text().splitlines())
+    except FileNotFoundError:
+        return 0
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    """Directory used as PATH."""
+    path = tmp_path / "bin"
+    path.mkdir()
+    monkeypatch.setenv("PATH", str(path))
+    return path
+
+
+def test_root_first(tmp_path, bin_dir):
+    """An executable in the root directory wins over PATH."""
+    make_executable(bin_dir, "chromedriver", "114.0")
+    local = make_executable(tmp_path / "root", "chromedriver", "114.0")
+
+    assert get_executable_path(str(tmp_path / "root"), "chromedriver") == str(local)
+
+
+def test_path_search(tmp_path, bin_dir):
+    """An executable missing from the root directory is searched in PATH."""
+    driver = make_executable(bin_dir, "geckodriver", "0.33.0")
+
+    assert get_executable_path(str(tmp_path), "geckodriver") == str(driver)
+
+
+def test_default_resolver_searches_once(tmp_path, bin_dir, monkeypatch):
+    """Without a resolver, the search is kept between calls."""
+    driver = make_executable(bin_dir, "geckodriver", "0.33.0")
+    assert get_executable_path(str(tmp_path), "geckodriver") == str(driver)
+
+    searches = []
+    monkeypatch.setattr(
+        "pytest_splinter4.executable_path.shutil.which",
+        lambda name: searches.append(name),
+    )
+
+    assert get_executable_path(str(tmp_path), "geckodriver") == str(driver)
+    assert searches == []
+
+
+def test_driver_dirs(tmp_path, bin_dir):
+    """The most recent executable of the driver directories is used."""
+    cache = tmp_path / "cache"
+    old = make_executable(cache / "chromedriver" / "linux64" / "113.0", "chromedriver", "113.0")
+    new = make_executable(cache / "chromedriver" / "linux64" / "114.0", "chromedriver", "114.0")
+    os.utime(old, (1, 1))
+
+    resolver = ExecutableResolver(driver_dirs=[str(cache)], check_versions=False)
+
+    assert resolver.resolve(str(tmp_path), "chromedriver") == str(new)
+
+
+def test_not_found(tmp_path, bin_dir):
+    """The name of a missing executable is returned, once searched."""
+    resolver = ExecutableResolver(driver_dirs=[], check_versions=False)
+
+    assert resolver.resolve(str(tmp_path), "chromedriver") == "chromedriver"
+
+    make_executable(bin_dir, "chromedriver", "114.0")
+    assert resolver.resolve(str(tmp_path), "chromedriver") == "chromedriver"
+
+
+def test_index_probes_once(tmp_path):
+    """Versions are saved, and only probed again when the executable changes."""
+    driver = make_executable(tmp_path, "chromedriver", "114.0.5735.90")
+    index_path = str(tmp_path / "executables.json")
+
+    assert ExecutableIndex(index_path).version(str(driver)) == "114.0.5735.90"
+    assert ExecutableIndex(index_path).version(str(driver)) == "114.0.5735.90"
+    assert runs(driver) == 1
+    assert json.loads((tmp_path / "executables.json").read_text())[str(driver)]["version"] == (
+        "114.0.5735.90"
+    )
+
+    make_executable(tmp_path, "chromedriver", "115.0.5790.102")
+    assert ExecutableIndex(index_path).version(str(driver)) == "115.0.5790.102"
+    assert runs(driver) == 2
+
+
+def test_version_match_preferred(tmp_path, bin_dir):
+    """The driver matching the major version of its browser wins over the first found."""
+    make_executable(bin_dir, "google-chrome", "114.0.5735.198")
+    make_executable(bin_dir, "chromedriver", "115.0.5790.102")
+    cache = tmp_path / "cache"
+    match = make_executable(cache / "114.0.5735.90", "chromedriver", "114.0.5735.90")
+    newer = make_executable(cache / "116.0.5845.96", "chromedriver", "116.0.5845.96")
+    os.utime(match, (1, 1))
+    os.utime(newer, (2, 2))
+
+    resolver = ExecutableResolver(driver_dirs=[str(cache)], manager=lambda name: None)
+
+    assert resolver.resolve(str(tmp_path), "chromedriver") == str(match)
+
+
+def test_version_mismatch_selenium_manager(tmp_path, bin_dir, recwarn):
+    """The driver of selenium-manager is used when no driver matches the browser."""
+    make_executable(bin_dir, "google-chrome", "115.0.5790.102")
+    make_executable(tmp_path, "chromedriver", "114.0.5735.90")
+    managed = []
+
+    def manager(file_name):
+        managed.append(file_name)
+        return "/selenium/chromedriver"
+
+    resolver = ExecutableResolver(driver_dirs=[], manager=manager)
+
+    assert resolver.resolve(str(tmp_path), "chromedriver") == "/selenium/chromedriver"
+    assert resolver.resolve(str(tmp_path), "chromedriver") == "/selenium/chromedriver"
+    assert managed == ["chromedriver"]
+    assert not recwarn.list
+
+
+def test_version_mismatch_warning(tmp_path, bin_dir):
+    """Without selenium-manager, a driver not matching its browser warns, once."""
+    make_executable(bin_dir, "google-chrome", "115.0.5790.102")
+    driver = make_executable(tmp_path, "chromedriver", "114.0.5735.90")
+    resolver = ExecutableResolver(driver_dirs=[], manager=lambda name: None)
+
+    with pytest.warns(pytest.PytestWarning, match="does not match the installed browser"):
+        assert resolver.resolve(str(tmp_path), "chromedriver") == str(driver)
+
+    resolver.resolve(str(tmp_path), "chromedriver")
+    assert runs(driver) == 1
+
+
+def test_version_match(tmp_path, bin_dir, recwarn):
+    """A driver matching its browser does not warn."""
+    make_executable(bin_dir, "google-chrome", "114.0.5735.198")
+    make_executable(tmp_path, "chromedriver", "114.0.5735.90")
+
+    resolver = ExecutableResolver(driver_dirs=[], manager=lambda name: pytest.fail(name))
+    resolver.resolve(str(tmp_path), "chromedriver")
+
+    assert not recwarn.list
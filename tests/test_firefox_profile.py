@@ -0,0 +1,86 @@
+"""Firefox profile cache tests."""
+import base64
+import io
+import os
+import zipfile
+
+import pytest
+
+from pytest_splinter4.firefox_profile import EncodedProfile, ProfileCache, profile_key
+
+from selenium.webdriver.firefox.options import Options
+
+
+def unzip(encoded):
+    """Get the files of an encoded profile."""
+    with zipfile.ZipFile(io.BytesIO(base64.b64decode(encoded))) as zipped:
+        return {name: zipped.read(name).decode() for name in zipped.namelist()}
+
+
+def test_empty_directory(tmp_path):
+    """No profile is built for an empty directory."""
+    (tmp_path / ".marker").write_text("")
+
+    assert ProfileCache().get(str(tmp_path)) is None
+
+
+def test_profile_is_built_once(tmp_path):
+    """Profiles are zipped once, preferences are left to the options."""
+    (tmp_path / "cert9.db").write_text("certs")
+    (tmp_path / "user.js").write_text('user_pref("b", "c");\n')
+    cache = ProfileCache()
+
+    profile = cache.get(str(tmp_path))
+
+    assert cache.get(str(tmp_path)) is profile
+    assert unzip(profile.encoded) == {
+        "cert9.db": "certs",
+        "user.js": 'user_pref("b", "c");\n',
+    }
+
+
+def test_profile_key(tmp_path):
+    """The key changes with the directory content."""
+    (tmp_path / "cert9.db").write_text("certs")
+    key = profile_key(str(tmp_path))
+
+    assert profile_key(str(tmp_path)) == key
+
+    (tmp_path / "cert9.db").write_text("other certs")
+    assert profile_key(str(tmp_path)) != key
+
+
+@pytest.mark.filterwarnings("ignore:Setting a profile:DeprecationWarning")
+def test_encoded_profile_capabilities():
+    """The encoded profile is sent to geckodriver as is."""
+    options = Options()
+    profile = EncodedProfile("encoded")
+    options.profile = profile
+
+    assert options.to_capabilities()["moz:firefoxOptions"]["profile"] == "encoded"
+    assert os.path.isdir(profile.path)
+    profile.cleanup()
+
+
+def test_encoded_profile_path():
+    """The same directory is used, created again once selenium deleted it."""
+    profile = EncodedProfile("encoded")
+    path = profile.path
+
+    os.rmdir(path)
+    assert profile.path == path
+    assert os.path.isdir(path)
+
+    profile.cleanup()
+    assert not os.path.exists(path)
+
+
+def test_profile_cache_close(tmp_path):
+    """Closing the cache removes the directories of its profiles."""
+    (tmp_path / "cert9.db").write_text("certs")
+    cache = ProfileCache()
+    path = cache.get(str(tmp_path)).path
+
+    cache.close()
+
+    assert not os.path.exists(path)
@@ -0,0 +1,91 @@
+"""HealthMonitor tests."""
+import subprocess
+import sys
+import time
+import unittest.mock as mock
+
+import pytest
+
+from pytest_splinter4 import health
+from pytest_splinter4.browser_pool import PooledBrowser
+from pytest_splinter4.health import HealthMonitor, HealthSample, MB, driver_pid
+
+
+def make_entry(pid=None):
+    browser = mock.Mock()
+    browser.driver.service.process.pid = pid
+    return PooledBrowser("key", browser)
+
+
+def test_driver_pid():
+    assert driver_pid(make_entry(1234).browser) == 1234
+    assert driver_pid(mock.MagicMock()) is None
+    assert driver_pid(object()) is None
+
+
+def test_max_uptime():
+    monitor = HealthMonitor(max_uptime=60)
+    entry = make_entry()
+    assert monitor.check(entry) is None
+
+    entry.created -= 61
+    assert monitor.check(entry).startswith("uptime")
+    assert monitor.recycled == {"uptime": 1}
+
+
+def test_max_memory(monkeypatch):
+    monkeypatch.setattr(
+        health, "sample_process_tree", lambda pid: HealthSample(600 * MB, 0.0, time.monotonic()),
+    )
+    monitor = HealthMonitor(max_memory=500)
+
+    assert monitor.check(make_entry(1234)) == "memory 600MB over 500MB"
+    # Browsers without a local driver process are not sampled.
+    assert monitor.check(make_entry()) is None
+
+
+def test_max_cpu(monkeypatch):
+    samples = iter([HealthSample(0, 1.0, 10.0), HealthSample(0, 2.8, 12.0)])
+    monkeypatch.setattr(health, "sample_process_tree", lambda pid: next(samples))
+    monitor = HealthMonitor(max_cpu=80)
+    entry = make_entry(1234)
+
+    # The first check has nothing to compare with.
+    assert monitor.check(entry) is None
+    assert monitor.check(entry) == "cpu 90% over 80%"
+
+
+def test_requires_psutil(monkeypatch):
+    monkeypatch.setattr(health, "psutil", None)
+
+    with pytest.raises(pytest.UsageError):
+        HealthMonitor(max_memory=500)
+
+    assert HealthMonitor(max_uptime=60).enabled
+
+
+def test_sample_process_tree():
+    pytest.importorskip("psutil")
+    child = "import time; time.sleep(10)"
+    parent = f"import subprocess, sys; subprocess.run([sys.executable, '-c', {child!r}])"
+    process = subprocess.Popen([sys.executable, "-c", parent])
+    try:
+        sample = health.sample_process_tree(process.pid)
+    finally:
+        process.kill()
+        process.wait()
+
+    assert sample.memory > 0
+    assert sample.cpu_time >= 0
+    assert health.sample_process_tree(process.pid) is None
+
+
+def test_merge():
+    """Recycled browsers of pytest-xdist workers add up."""
+    monitor = HealthMonitor()
+    monitor.recycled = {"uptime": 1}
+
+    monitor.merge({"recycled": {"uptime": 2, "memory": 1}})
+    monitor.merge(HealthMonitor().to_dict())
+
+    assert monitor.recycled == {"uptime": 3, "memory": 1}
@@ -0,0 +1,219 @@
+"""Caching proxy tests."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import urllib3
+
+from pytest_splinter4.http_cache import (
+    CachedResponse,
+    CachingProxy,
+    ResponseCache,
+    is_static,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serve a static and a dynamic page, and events, counting requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # NOQA N802
+        """Answer a GET request."""
+        self.server.requests.append(self.path)
+        if self.path == "/events":
+            self.send_events()
+            return
+
+        content_type = "application/javascript" if self.path.endswith(".js") else "text/html"
+        body = f"{self.path} {len(self.server.requests)}".encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_HEAD = do_GET  # NOQA N815
+
+    def send_events(self):
+        """Send an event, then a second one once the test let it."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in (b"data: 1\n\n", b"data: 2\n\n"):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.flush()
+            self.server.sent.set()
+            self.server.next_event.wait(5)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        """Keep the test output clean."""
+
+
+@pytest.fixture
+def upstream():
+    """Start a HTTP server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    server.sent = threading.Event()
+    server.next_event = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def start_proxy():
+    """Start caching proxies, stopped after the test."""
+    proxies = []
+
+    def start(*args, **kwargs):
+        proxy = CachingProxy(*args, **kwargs).start()
+        proxies.append(proxy)
+        return proxy
+
+    yield start
+
+    for proxy in proxies:
+        proxy.stop()
+
+
+def get(proxy, url):
+    """Get a url through a proxy."""
+    with urllib3.ProxyManager(proxy.url) as http:
+        return http.request("GET", url, retries=False)
+
+
+def test_static_responses_are_cached(upstream, start_proxy):
+    """Static responses are served from the cache, other responses are not."""
+    proxy = start_proxy("cache")
+    base = "http://127.0.0.1:{}".format(upstream.server_address[1])
+
+    first = get(proxy, f"{base}/app.js")
+    second = get(proxy, f"{base}/app.js")
+    get(proxy, f"{base}/page")
+    get(proxy, f"{base}/page")
+
+    assert first.data == second.data == b"/app.js 1"
+    assert upstream.requests == ["/app.js", "/page", "/page"]
+    assert proxy.stats() == {"hits": 1, "misses": 3, "entries": 1}
+
+
+def test_events_streamed(upstream, start_proxy):
+    """Responses which are not cached are sent as they arrive."""
+    proxy = start_proxy("off", blocked_url_patterns=["*.woff2"])
+    base = "http://127.0.0.1:{}".format(upstream.server_address[1])
+
+    with urllib3.ProxyManager(proxy.url) as http:
+        response = http.request("GET", f"{base}/events", retries=False, preload_content=False)
+        events = response.stream(None)
+        first = next(events)
+        # The second event is only sent once the first one went through the proxy.
+        upstream.next_event.set()
+        rest = b"".join(events)
+
+    assert first == b"data: 1\n\n"
+    assert rest == b"data: 2\n\n"
+
+
+def test_head_content_length(upstream, start_proxy):
+    """HEAD responses keep the length of the body of the server."""
+    proxy = start_proxy("cache")
+    base = "http://127.0.0.1:{}".format(upstream.server_address[1])
+
+    with urllib3.ProxyManager(proxy.url) as http:
+        response = http.request("HEAD", f"{base}/page", retries=False)
+
+    assert response.headers["Content-Length"] == str(len(b"/page 1"))
+
+
+def test_record_and_replay(upstream, start_proxy, tmp_path):
+    """Recorded responses are replayed without the network."""
+    base = "http://127.0.0.1:{}".format(upstream.server_address[1])
+
+    recorder = start_proxy("record", ResponseCache(directory=str(tmp_path)))
+    get(recorder, f"{base}/page")
+
+    replayer = start_proxy("replay", ResponseCache(directory=str(tmp_path)))
+    replayed = get(replayer, f"{base}/page")
+    missing = get(replayer, f"{base}/other")
+
+    assert replayed.status == 200
+    assert replayed.data == b"/page 1"
+    assert replayed.headers["Content-Type"] == "text/html"
+    assert missing.status == 504
+    assert upstream.requests == ["/page"]
+
+
+def test_lru_eviction():
+    """The least recently used responses are evicted first."""
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", CachedResponse(200, "OK", [], b"aaaa"))
+    cache.put("b", CachedResponse(200, "OK", [], b"bbbb"))
+    cache.get("a")
+    cache.put("c", CachedResponse(200, "OK", [], b"cccc"))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.size == 8
+
+
+@pytest.mark.parametrize("url, headers, expected", [
+    ("http://a/app.js", [], True),
+    ("http://a/font", [("Content-Type", "font/woff2")], True),
+    ("http://a/page", [("Content-Type", "text/html")], False),
+    ("http://a/app.js", [("Cache-Control", "no-store")], False),
+    ("http://a/app.js", [("Set-Cookie", "a=b")], False),
+])
+def test_is_static(url, headers, expected):
+    """Only static assets are cached."""
+    assert is_static(url, CachedResponse(200, "OK", headers, b"")) is expected
+
+
+def test_blocked_urls(upstream, start_proxy):
+    """Requests matching a blocked url pattern get an empty response."""
+    proxy = start_proxy("off", blocked_url_patterns=["*.js"])
+    base = "http://127.0.0.1:{}".format(upstream.server_address[1])
+
+    blocked = get(proxy, f"{base}/app.js")
+    page = get(proxy, f"{base}/page")
+    get(proxy, f"{base}/page")
+
+    assert blocked.status == 204
+    assert page.data == b"/page 1"
+    assert upstream.requests == ["/page", "/page"]
+    assert proxy.stats() == {"hits": 0, "misses": 0, "entries": 0}
+    assert proxy.blocked == 1
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://a/app.js", True),
+    ("http://a/app.js?v=1", False),
+    ("http://a/page?id=1", True),
+    ("http://a/page?id=12", False),
+    ("http://a/[1]", True),
+    ("http://a/1", False),
+])
+def test_blocked_url_pattern_wildcards(url, expected):
+    """Only `*` is a wildcard, `?` and `[` match themselves like in Chromium."""
+    proxy = CachingProxy("off", blocked_url_patterns=["*.js", "*/page?id=1", "*/[1]"])
+
+    assert proxy.is_blocked(url) is expected
+
+
+def test_blocked_tunnel(start_proxy):
+    """HTTPS servers matching a blocked url pattern are not connected to."""
+    proxy = start_proxy("off", blocked_url_patterns=["https://*.example.com/*"])
+
+    with urllib3.ProxyManager(proxy.url) as http:
+        with pytest.raises(urllib3.exceptions.ProxyError):
+            http.request("GET", "https://ads.example.com/pixel", retries=False)
+
+    assert proxy.blocked == 1
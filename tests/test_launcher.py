@@ -0,0 +1,88 @@
+"""BrowserLauncher tests."""
+import threading
+import unittest.mock as mock
+
+from pytest_splinter4.launcher import BrowserLauncher
+
+
+def test_get_without_prewarm():
+    """Without prewarm, browsers are created in the calling thread."""
+    threads = []
+
+    def factory(driver_name):
+        threads.append(threading.current_thread())
+        return mock.Mock(driver_name=driver_name)
+
+    launcher = BrowserLauncher(factory)
+
+    assert launcher.get("firefox").driver_name == "firefox"
+    assert launcher.get("firefox").driver_name == "firefox"
+    assert threads == [threading.current_thread()] * 2
+    assert launcher.pending("firefox") == 0
+
+
+def test_get_with_prewarm():
+    """With prewarm, browsers are launched ahead of demand."""
+    factory = mock.Mock(side_effect=lambda driver_name: mock.Mock())
+    launcher = BrowserLauncher(factory, prewarm=2)
+
+    first = launcher.get("chrome")
+    assert launcher.pending("chrome") == 2
+
+    second = launcher.get("chrome")
+    assert second is not first
+    assert launcher.pending("chrome") == 2
+
+    launcher.close()
+    assert launcher.pending("chrome") == 0
+
+
+def test_get_without_top_up():
+    """Callers reusing their browsers only launch the browsers they ask for."""
+    factory = mock.Mock(side_effect=lambda driver_name: mock.Mock())
+    launcher = BrowserLauncher(factory, prewarm=2)
+
+    launcher.get("chrome", prewarm=False)
+    assert launcher.pending("chrome") == 0
+
+    launcher.get("chrome", ahead=1, prewarm=False)
+    assert launcher.pending("chrome") == 1
+
+    launcher.close()
+
+
+def test_close_quits_unused_browsers():
+    """Browsers launched but never handed out are quit on close."""
+    browsers = []
+
+    def factory(driver_name):
+        browsers.append(mock.Mock())
+        return browsers[-1]
+
+    launcher = BrowserLauncher(factory, prewarm=1)
+    used = launcher.get("chrome")
+    launcher.close()
+
+    used.quit.assert_not_called()
+    for browser in browsers:
+        if browser is not used:
+            browser.quit.assert_called_once()
+
+
+def test_prepare_in_calling_thread():
+    """Webdrivers are prepared once, in the calling thread, before any launch."""
+    calls = []
+    launcher = BrowserLauncher(
+        lambda driver_name: calls.append(("launch", driver_name)) or mock.Mock(),
+        prewarm=2,
+        prepare=lambda driver_name: calls.append(
+            ("prepare", driver_name, threading.current_thread()),
+        ),
+    )
+
+    launcher.get("firefox")
+    launcher.get("firefox")
+    launcher.close()
+
+    assert calls[0] == ("prepare", "firefox", threading.current_thread())
+    assert [call for call in calls if call[0] == "prepare"] == calls[:1]
@@ -0,0 +1,373 @@
+"""Remote connection and session reuse tests."""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pytest_splinter4.remote import (
+    RemoteConnections,
+    RemoteSessionRegistry,
+    RemoteUrlBalancer,
+    SharedRemoteConnection,
+    free_slots,
+    parse_remote_urls,
+)
+from pytest_splinter4.reset import BrowserReset
+
+from selenium.webdriver import ChromeOptions, Remote
+from selenium.webdriver.remote.command import Command
+
+from splinter.driver.webdriver.cookie_manager import CookieManager
+
+
+class GridHandler(BaseHTTPRequestHandler):
+    """Minimal WebDriver server, recording sessions and connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, value):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length)
+
+    def _session(self):
+        match = re.match(r"/session/([^/]+)", self.path)
+        return match and match.group(1)
+
+    def do_POST(self):  # NOQA N802
+        """Create a session, or run a command of a session."""
+        body = json.loads(self._read() or b"{}")
+        grid = self.server
+        grid.clients.add(self.client_address)
+        session_id = self._session()
+        if session_id is None:
+            session_id = f"session-{len(grid.sessions) + 1}"
+            grid.sessions[session_id] = True
+            grid.pages[session_id] = {"url": "about:blank", "cookies": []}
+            self._send(200, {"sessionId": session_id, "capabilities": {"browserName": "chrome"}})
+            return
+
+        page = grid.pages[session_id]
+        if self.path.endswith("/url"):
+            page["url"] = body["url"]
+        elif self.path.endswith("/cookie"):
+            page["cookies"].append(body["cookie"])
+        self._send(200, None)
+
+    def do_GET(self):  # NOQA N802
+        """Get the url or cookies of a session, or the status of the grid."""
+        self.server.clients.add(self.client_address)
+        if self.path == "/status":
+            self._send(200, self.server.status)
+            return
+        if not self.server.sessions.get(self._session()):
+            self._send(404, {"error": "invalid session id", "message": "", "stacktrace": ""})
+            return
+
+        page = self.server.pages[self._session()]
+        self._send(200, page["cookies"] if self.path.endswith("/cookie") else page["url"])
+
+    def do_DELETE(self):  # NOQA N802
+        """Delete a session, or its cookies."""
+        self.server.clients.add(self.client_address)
+        if self.path.endswith("/cookie"):
+            self.server.pages[self._session()]["cookies"] = []
+        else:
+            self.server.sessions[self._session()] = False
+            self.server.deleted.append(self._session())
+        self._send(200, None)
+
+    def log_message(self, *args):
+        """Keep the test output clean."""
+
+
+@pytest.fixture
+def grid():
+    """Start a fake Selenium grid."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GridHandler)
+    server.sessions = {}
+    server.pages = {}
+    server.deleted = []
+    server.clients = set()
+    server.status = {"ready": True}
+    server.url = "http://{}:{}".format(*server.server_address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+NEW_SESSION = {"capabilities": {"alwaysMatch": {"browserName": "chrome"}}}
+
+
+def new_session(connection, params=NEW_SESSION):
+    return connection.execute(Command.NEW_SESSION, json.loads(json.dumps(params)))
+
+
+def test_shared_connection_keeps_connections(grid):
+    """Browsers share the keep-alive connections of a grid."""
+    connections = RemoteConnections(pool_size=3)
+    connection = connections.get(grid.url)
+    assert connections.get(grid.url) is connection
+
+    for _ in range(3):
+        new_session(connection)
+        # A browser quitting does not close the connections of the others.
+        connection.close()
+
+    assert connection._conn.connection_pool_kw["maxsize"] == 3
+    assert len(grid.clients) == 1
+    connections.close()
+
+
+def test_registry_claims_once(tmp_path):
+    registry = RemoteSessionRegistry(str(tmp_path))
+    registry.park("key", "http://grid", "session-1", {"browserName": "chrome"})
+
+    entry = registry.claim("key")
+    assert entry["session_id"] == "session-1"
+    assert entry["capabilities"] == {"browserName": "chrome"}
+    assert registry.claim("key") is None
+    assert registry.claim("other") is None
+
+
+def test_registry_drops_idle_sessions(tmp_path):
+    registry = RemoteSessionRegistry(str(tmp_path), max_idle=60)
+    registry.park("key", "http://grid", "session-1", {})
+
+    path = tmp_path / "key.session-1.json"
+    entry = json.loads(path.read_text())
+    entry["parked"] = time.time() - 61
+    path.write_text(json.dumps(entry))
+
+    assert registry.claim("key") is None
+
+
+def test_session_reuse(grid, tmp_path):
+    """A quit session is parked, and reused by another connection to the grid."""
+    registry = RemoteSessionRegistry(str(tmp_path))
+    first = SharedRemoteConnection(grid.url, registry=registry)
+    second = SharedRemoteConnection(grid.url, registry=registry)
+
+    session_id = new_session(first)["value"]["sessionId"]
+    assert not first.is_reused(session_id)
+    first.execute(Command.QUIT, {"sessionId": session_id})
+    assert grid.deleted == []
+
+    response = new_session(second)
+    assert response["value"]["sessionId"] == session_id
+    assert second.is_reused(session_id)
+    assert len(grid.sessions) == 1
+
+    # Other capabilities need another session.
+    other = new_session(second, {"capabilities": {"alwaysMatch": {"browserName": "firefox"}}})
+    assert other["value"]["sessionId"] != session_id
+
+    second.execute(Command.QUIT, {"sessionId": session_id})
+    registry.close()
+    assert grid.deleted == [session_id]
+    assert not tmp_path.exists()
+
+
+def test_session_reuse_skips_closed_sessions(grid, tmp_path):
+    """Sessions closed by the grid are not reused."""
+    registry = RemoteSessionRegistry(str(tmp_path))
+    connection = SharedRemoteConnection(grid.url, registry=registry)
+
+    session_id = new_session(connection)["value"]["sessionId"]
+    connection.execute(Command.QUIT, {"sessionId": session_id})
+    grid.sessions[session_id] = False
+
+    assert new_session(connection)["value"]["sessionId"] != session_id
+
+
+def test_remote_driver(grid, tmp_path):
+    """Selenium's remote driver attaches to a parked session."""
+    registry = RemoteSessionRegistry(str(tmp_path))
+    connection = SharedRemoteConnection(grid.url, registry=registry)
+
+    driver = Remote(command_executor=connection, options=ChromeOptions())
+    session_id = driver.session_id
+    driver.quit()
+
+    driver = Remote(command_executor=connection, options=ChromeOptions())
+    assert driver.session_id == session_id
+    assert driver.caps == {"browserName": "chrome"}
+    assert len(grid.sessions) == 1
+
+
+class RemoteDriver(Remote):
+    """Remote driver, without the patches of the plugin."""
+
+    def set_speed(self, seconds, commands=None):
+        """Commands are not slowed down."""
+
+
+class RemoteBrowser:
+    """Splinter browser of a remote driver, as far as BrowserReset uses it."""
+
+    def __init__(self, connection):
+        self.driver = RemoteDriver(command_executor=connection, options=ChromeOptions())
+        self.cookies = CookieManager(self.driver)
+
+
+def test_reused_session_is_cleaned(grid, tmp_path, monkeypatch):
+    """A browser attached to a parked session is cleaned before its first test."""
+    # BrowserReset sets the socket timeout of the connection class.
+    monkeypatch.setattr(SharedRemoteConnection, "_timeout", SharedRemoteConnection._timeout)
+    registry = RemoteSessionRegistry(str(tmp_path))
+    connection = SharedRemoteConnection(grid.url, registry=registry)
+    reset = BrowserReset(implicit_wait=0, speed=0, socket_timeout=120, window_size=None)
+
+    first = RemoteBrowser(connection)
+    reset(first, "chrome")
+    first.driver.get("http://app/private")
+    first.driver.add_cookie({"name": "secret", "value": "user-a"})
+    first.driver.quit()
+
+    second = RemoteBrowser(connection)
+    assert second.driver.session_id == first.driver.session_id
+    reset(second, "chrome")
+
+    assert second.driver.get_cookies() == []
+    assert second.driver.current_url == "about:blank"
+    reset.close()
+
+
+class FakeClock:
+    """Clock moved by the tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_remote_urls():
+    assert parse_remote_urls(None) == []
+    assert parse_remote_urls("http://a/wd/hub") == ["http://a/wd/hub"]
+    assert parse_remote_urls("http://a/wd/hub, http://b/wd/hub,") == [
+        "http://a/wd/hub", "http://b/wd/hub",
+    ]
+    assert parse_remote_urls(["http://a/wd/hub"]) == ["http://a/wd/hub"]
+
+
+def test_free_slots():
+    slot = {"session": None}
+    busy_slot = {"session": {"sessionId": "1"}}
+    nodes = [
+        {"availability": "UP", "slots": [slot, busy_slot, slot]},
+        {"availability": "DRAINING", "slots": [slot]},
+    ]
+    status = {"value": {"ready": True, "nodes": nodes}}
+
+    assert free_slots(status) == 2
+    assert free_slots({"value": {"ready": False, "nodes": []}}) == 0
+    assert free_slots({"value": {"ready": True, "message": "Server is running"}}) == 1
+
+
+def test_round_robin_with_cooldown():
+    """A failing url is left out until its cooldown is over."""
+    clock = FakeClock()
+    balancer = RemoteUrlBalancer(["a", "b", "c"], cooldown=30, clock=clock)
+
+    assert [balancer.choose() for _ in range(4)] == ["a", "b", "c", "a"]
+
+    balancer.failed("b")
+    assert {balancer.choose() for _ in range(4)} == {"a", "c"}
+
+    clock.now = 31
+    assert "b" in {balancer.choose() for _ in range(3)}
+
+
+def test_every_url_cooling_down():
+    """The url which failed first is tried again."""
+    clock = FakeClock()
+    balancer = RemoteUrlBalancer(["a", "b"], cooldown=30, clock=clock)
+
+    balancer.failed("b")
+    clock.now = 1
+    balancer.failed("a")
+
+    assert balancer.choose() == "b"
+    balancer.succeeded("b")
+    assert balancer.available() == ["b"]
+
+
+def test_worker_affinity():
+    clock = FakeClock()
+    balancer = RemoteUrlBalancer(["a", "b", "c"], strategy="worker", worker_index=4, clock=clock)
+
+    assert {balancer.choose() for _ in range(3)} == {"b"}
+
+    balancer.failed("b")
+    assert balancer.choose() in {"a", "c"}
+
+
+def test_least_loaded(grid):
+    """The grid with the most free slots is chosen."""
+    free = {"ready": True, "nodes": [{"slots": [{"session": None}, {"session": None}]}]}
+    grid.status = free
+
+    balancer = RemoteUrlBalancer(["http://127.0.0.1:1", grid.url], strategy="least-loaded")
+    assert balancer.status("http://127.0.0.1:1") == -1
+    assert balancer.status(grid.url) == 2
+    assert {balancer.choose() for _ in range(2)} == {grid.url}
+    # A grid which does not answer is not asked again until its cooldown is over.
+    assert balancer.available() == [grid.url]
+    balancer.close()
+
+
+class StatusBalancer(RemoteUrlBalancer):
+    """Balancer answering the free slots of the grids from a dict."""
+
+    def __init__(self, slots, **kwargs):
+        super().__init__(list(slots), strategy="least-loaded", **kwargs)
+        self.free = slots
+        self.asked = []
+
+    def status(self, url):
+        self.asked.append(url)
+        return self.free[url]
+
+
+def test_least_loaded_asks_grids_at_once():
+    """Grids are asked for their status at the same time."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    class Balancer(StatusBalancer):
+        def status(self, url):
+            barrier.wait()
+            return super().status(url)
+
+    balancer = Balancer({"a": 1, "b": 3, "c": 2}, clock=FakeClock())
+
+    assert balancer.choose() == "b"
+    balancer.close()
+
+
+def test_least_loaded_status_kept():
+    """Statuses are kept for status_ttl seconds, counting the sessions sent meanwhile."""
+    clock = FakeClock()
+    balancer = StatusBalancer({"a": 1, "b": 2}, clock=clock, status_ttl=2)
+
+    # b has 2 free slots, then both have 1 and round-robin picks b again.
+    assert [balancer.choose() for _ in range(3)] == ["b", "b", "a"]
+    assert sorted(balancer.asked) == ["a", "b"]
+
+    clock.now = 3
+    balancer.choose()
+    assert len(balancer.asked) == 4
+    balancer.close()
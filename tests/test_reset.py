@@ -0,0 +1,278 @@
+"""BrowserReset tests."""
+import threading
+import unittest.mock as mock
+
+import pytest
+
+from pytest_splinter4.reset import BrowserReset, CLEAR_STORAGE_SCRIPT
+
+from selenium.common.exceptions import WebDriverException
+
+
+def make_reset(**kwargs):
+    """Create a BrowserReset with test defaults."""
+    return BrowserReset(**{
+        "implicit_wait": 5,
+        "speed": 0,
+        "socket_timeout": 120,
+        "window_size": (1366, 768),
+        **kwargs,
+    })
+
+
+def test_new_browser_is_not_cleaned():
+    """A browser prepared for the first time is only configured."""
+    reset = make_reset()
+    browser = mock.MagicMock()
+
+    reset(browser, "chrome")
+
+    browser.driver.implicitly_wait.assert_called_once_with(5)
+    browser.driver.set_window_size.assert_called_once_with(1366, 768)
+    browser.cookies.delete_all.assert_not_called()
+    browser.driver.get.assert_not_called()
+
+
+def test_settings_are_applied_once():
+    """Settings already in effect are not sent again."""
+    reset = make_reset()
+    browser = mock.MagicMock()
+    browser.driver._splinter_settings = None
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    browser.driver.implicitly_wait.assert_called_once_with(5)
+    browser.driver.set_window_size.assert_called_once_with(1366, 768)
+    assert browser.driver.set_speed.call_count == 2
+
+
+def make_history_driver(driver, urls):
+    """Make a mocked driver answer the navigation history of its tab."""
+    def execute_cdp_cmd(cmd, params):
+        if cmd == "Page.getNavigationHistory":
+            return {"currentIndex": len(urls) - 1, "entries": [{"url": url} for url in urls]}
+        return {}
+
+    driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+
+
+def test_clean_with_cdp():
+    """Chromium drivers clear every cookie with a single CDP command."""
+    reset = make_reset(clean_cookies_urls=["http://example.com"])
+    browser = mock.MagicMock()
+    make_history_driver(browser.driver, ["about:blank"])
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    assert browser.driver.execute_cdp_cmd.call_args_list == [
+        mock.call("Network.clearBrowserCookies", {}),
+        mock.call("Page.getNavigationHistory", {}),
+        mock.call("Page.resetNavigationHistory", {}),
+    ]
+    browser.driver.execute_async_script.assert_called_once_with(CLEAR_STORAGE_SCRIPT)
+    browser.visit.assert_not_called()
+    browser.driver.get.assert_called_once_with("about:blank")
+
+
+def test_clean_every_origin_with_cdp():
+    """Chromium drivers clear the storage of every origin the tab visited."""
+    reset = make_reset()
+    browser = mock.MagicMock()
+    make_history_driver(browser.driver, [
+        "about:blank",
+        "https://login.example.com/form",
+        "http://localhost:8000/",
+        "https://login.example.com/done?next=/",
+        "data:text/html,<p></p>",
+    ])
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    cleared = [
+        call[0][1]["origin"] for call in browser.driver.execute_cdp_cmd.call_args_list
+        if call[0][0] == "Storage.clearDataForOrigin"
+    ]
+    assert cleared == ["http://localhost:8000", "https://login.example.com"]
+    browser.driver.execute_cdp_cmd.assert_any_call("Page.resetNavigationHistory", {})
+
+
+def test_clean_without_cdp():
+    """Other drivers delete cookies for each url to clean."""
+    reset = make_reset(clean_cookies_urls=["http://example.com"])
+    browser = mock.MagicMock()
+    del browser.driver.execute_cdp_cmd
+
+    reset(browser, "firefox")
+    reset(browser, "firefox")
+
+    assert browser.cookies.delete_all.call_count == 2
+    browser.visit.assert_called_once_with("http://example.com")
+    browser.driver.execute_async_script.assert_called_once_with(CLEAR_STORAGE_SCRIPT)
+    browser.driver.get.assert_not_called()
+
+
+def test_clean_driverless():
+    """Driverless browsers only get their cookies deleted."""
+    reset = make_reset()
+    browser = mock.Mock()
+    del browser.driver
+
+    reset(browser, "flask")
+    reset(browser, "flask")
+
+    browser.cookies.delete_all.assert_called_once()
+
+
+def make_cdp_driver(driver):
+    """Make a mocked driver answer the browser context CDP commands."""
+    contexts = iter(["context-1", "context-2"])
+    targets = iter(["TARGET1", "TARGET2"])
+
+    def execute_cdp_cmd(cmd, params):
+        if cmd == "Target.createBrowserContext":
+            return {"browserContextId": next(contexts)}
+        if cmd == "Target.createTarget":
+            target_id = next(targets)
+            driver.window_handles.append(target_id)
+            return {"targetId": target_id}
+        return {}
+
+    driver.window_handles = ["DEFAULT"]
+    driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+
+
+def test_context_isolation():
+    """Each test gets a new browser context, the previous one is disposed of."""
+    reset = make_reset(isolation="context")
+    browser = mock.MagicMock()
+    make_cdp_driver(browser.driver)
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    assert browser.driver.switch_to.window.call_args_list == [
+        mock.call("TARGET1"), mock.call("TARGET2"),
+    ]
+    browser.driver.execute_cdp_cmd.assert_any_call(
+        "Target.createTarget",
+        {"url": "about:blank", "browserContextId": "context-1", "width": 1366, "height": 768},
+    )
+    browser.driver.execute_cdp_cmd.assert_called_with(
+        "Target.disposeBrowserContext", {"browserContextId": "context-1"},
+    )
+    browser.cookies.delete_all.assert_not_called()
+    browser.driver.execute_async_script.assert_not_called()
+
+
+def test_context_isolation_unknown_window():
+    """Browsers are cleaned when the new tab can not be found."""
+    reset = make_reset(isolation="context")
+    browser = mock.MagicMock()
+    make_cdp_driver(browser.driver)
+    browser.driver.window_handles = mock.MagicMock()
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    browser.driver.execute_cdp_cmd.assert_any_call(
+        "Target.disposeBrowserContext", {"browserContextId": "context-1"},
+    )
+    browser.driver.switch_to.window.assert_not_called()
+    browser.driver.execute_async_script.assert_called_once_with(CLEAR_STORAGE_SCRIPT)
+
+
+def test_context_isolation_without_cdp():
+    """Browsers without CDP are cleaned instead."""
+    reset = make_reset(isolation="context")
+    browser = mock.MagicMock()
+    del browser.driver.execute_cdp_cmd
+
+    reset(browser, "firefox")
+    reset(browser, "firefox")
+
+    browser.cookies.delete_all.assert_called_once()
+    browser.driver.execute_async_script.assert_called_once_with(CLEAR_STORAGE_SCRIPT)
+
+
+def test_blocked_urls():
+    """Blocked urls are set on new browsers and new browser contexts."""
+    reset = make_reset(isolation="context", blocked_url_patterns=["*.woff2"])
+    browser = mock.MagicMock()
+    make_cdp_driver(browser.driver)
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    blocked = [
+        call for call in browser.driver.execute_cdp_cmd.call_args_list
+        if call[0][0] == "Network.setBlockedURLs"
+    ]
+    assert blocked == [mock.call("Network.setBlockedURLs", {"urls": ["*.woff2"]})] * 2
+
+
+def make_remote_browser():
+    """Create a mocked browser using a connection to a remote grid."""
+    browser = mock.MagicMock()
+    browser.driver.command_executor.pool_size = 10
+    del browser.driver.execute_cdp_cmd
+    return browser
+
+
+def test_commands_sent_concurrently():
+    """Cookies and storage of a remote browser are cleaned at the same time."""
+    reset = make_reset()
+    browser = make_remote_browser()
+    barrier = threading.Barrier(2, timeout=5)
+    browser.cookies.delete_all.side_effect = lambda: barrier.wait()
+    browser.driver.execute_async_script.side_effect = lambda script: barrier.wait()
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+    reset.close()
+
+    browser.cookies.delete_all.assert_called_once()
+    browser.driver.execute_async_script.assert_called_once_with(CLEAR_STORAGE_SCRIPT)
+    browser.driver.get.assert_called_once_with("about:blank")
+
+
+def test_concurrent_settings_not_remembered_on_error():
+    """Settings are sent again after one of them failed."""
+    reset = make_reset()
+    browser = make_remote_browser()
+    browser.driver._splinter_settings = None
+    browser.driver.set_window_size.side_effect = [WebDriverException("lost"), None]
+
+    with pytest.raises(WebDriverException):
+        reset(browser, "chrome")
+    reset(browser, "chrome")
+    reset.close()
+
+    assert browser.driver.implicitly_wait.call_count == 2
+    assert browser.driver._splinter_settings == (5, (1366, 768))
+
+
+def test_local_commands_sent_one_by_one():
+    """Drivers with a single connection to their server get commands one by one."""
+    reset = make_reset()
+    browser = mock.MagicMock()
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    assert reset._executor is None
+
+
+def test_concurrent_commands_disabled():
+    """Commands are sent one by one when concurrent commands are disabled."""
+    reset = make_reset(concurrent_commands=0)
+    browser = make_remote_browser()
+
+    reset(browser, "chrome")
+    reset(browser, "chrome")
+
+    assert reset._executor is None
+    browser.driver.get.assert_called_once_with("about:blank")
@@ -0,0 +1,101 @@
+"""RetryPolicy tests."""
+import unittest.mock as mock
+
+import pytest
+
+from pytest_splinter4.retry import RetryPolicy, failure_kind
+
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+
+from urllib3.exceptions import MaxRetryError
+
+
+class FakeClock:
+    """Clock advanced by the sleeps of the policy."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def make_policy(**kwargs):
+    clock = FakeClock()
+    kwargs.setdefault("jitter", 0)
+    return RetryPolicy(sleep=clock.sleep, clock=clock, **kwargs), clock
+
+
+def test_failure_kind():
+    assert failure_kind(SessionNotCreatedException()) == "session_not_created"
+    assert failure_kind(MaxRetryError(None, "/session")) == "connection"
+    assert failure_kind(ConnectionRefusedError()) == "connection"
+    assert failure_kind(TimeoutError()) == "timeout"
+    assert failure_kind(WebDriverException()) == "webdriver"
+    assert failure_kind(ValueError()) == "ValueError"
+
+
+def test_call_retries_with_backoff():
+    """Delays double after each failure."""
+    policy, clock = make_policy(attempts=4, backoff=0.5)
+    func = mock.Mock(side_effect=[
+        SessionNotCreatedException(), ConnectionRefusedError(), WebDriverException(), "browser",
+    ])
+
+    assert policy.call("get_browser", func) == "browser"
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+    assert policy.failures == {
+        "get_browser": {"session_not_created": 1, "connection": 1, "webdriver": 1},
+    }
+    assert policy.retries == {"get_browser": 3}
+
+
+def test_call_raises_last_error():
+    policy, clock = make_policy(attempts=2, backoff=0.5)
+    func = mock.Mock(side_effect=[WebDriverException("first"), WebDriverException("last")])
+
+    with pytest.raises(WebDriverException, match="last"):
+        policy.call("get_browser", func)
+    assert func.call_count == 2
+    assert clock.sleeps == [0.5]
+
+
+def test_max_backoff_and_jitter():
+    policy, _ = make_policy(backoff=1, max_backoff=3, jitter=0.5)
+
+    for attempt, delay in [(1, 1), (2, 2), (3, 3), (10, 3)]:
+        assert delay / 2 <= policy.delay(attempt) <= delay
+
+
+def test_budget():
+    """No attempt is started once the time budget is spent."""
+    policy, clock = make_policy(attempts=10, backoff=1, budget=5)
+    func = mock.Mock(side_effect=WebDriverException())
+
+    with pytest.raises(WebDriverException):
+        policy.call("get_browser", func)
+
+    # 1 + 2 seconds of delays, the next one would end after the budget.
+    assert clock.sleeps == [1, 2]
+    assert func.call_count == 3
+
+
+def test_merge():
+    policy, _ = make_policy()
+    policy.failures = {"get_browser": {"timeout": 1}}
+    policy.retries = {"get_browser": 1}
+
+    policy.merge({
+        "failures": {"get_browser": {"timeout": 2}, "prepare_browser": {"webdriver": 1}},
+        "retries": {"get_browser": 2},
+    })
+
+    assert policy.to_dict() == {
+        "failures": {"get_browser": {"timeout": 3}, "prepare_browser": {"webdriver": 1}},
+        "retries": {"get_browser": 3},
+    }
@@ -0,0 +1,83 @@
+"""Screenshot writing tests."""
+import base64
+import threading
+import types
+
+from pytest_splinter4.screenshots import (
+    queue_for_controller,
+    screenshot_extraline,
+    ScreenshotWriter,
+    write_screenshots,
+)
+from pytest_splinter4.xdist_plugin import SplinterXdistPlugin
+
+
+def test_write(tmp_path):
+    """Files are written in a background thread, creating directories."""
+    writer = ScreenshotWriter()
+    threads = []
+
+    writer.submit(lambda: threads.append(threading.current_thread()))
+    writer.write(str(tmp_path / "a" / "page.html"), "<html></html>", "utf-8")
+    writer.write_png(str(tmp_path / "a" / "page.png"), base64.b64encode(b"png").decode())
+    writer.close()
+
+    assert threads[0] is not threading.current_thread()
+    assert (tmp_path / "a" / "page.html").read_text() == "<html></html>"
+    assert (tmp_path / "a" / "page.png").read_bytes() == b"png"
+
+
+def test_queue_and_write_screenshots(tmp_path):
+    """Screenshots queued on a worker are written by the controller."""
+    node = types.SimpleNamespace()
+    files = [
+        {"file_name": "test-browser.png", "content": base64.b64encode(b"png").decode(), "base64": True},
+        {"file_name": "test-browser.html", "content": "<html></html>", "encoding": "utf-8"},
+    ]
+
+    queue_for_controller(node, "tests.test_a", files)
+
+    assert node.splinter_screenshots == [{"class_name": "tests.test_a", "files": files}]
+
+    paths = write_screenshots(str(tmp_path), "tests.test_a", files)
+
+    assert paths == [
+        str(tmp_path / "tests.test_a" / "test-browser.png"),
+        str(tmp_path / "tests.test_a" / "test-browser.html"),
+    ]
+    assert (tmp_path / "tests.test_a" / "test-browser.png").read_bytes() == b"png"
+    assert (tmp_path / "tests.test_a" / "test-browser.html").read_text() == "<html></html>"
+
+
+def test_flush_logs_errors(caplog):
+    """Errors in the background thread are logged, not raised."""
+    writer = ScreenshotWriter()
+
+    def fail():
+        raise OSError("disk full")
+
+    writer.submit(fail)
+    writer.close()
+
+    assert "Could not save screenshot" in caplog.text
+
+
+def test_controller_report_points_at_written_files(tmp_path):
+    """The failure report of a worker test points at the files written by the controller."""
+    plugin = SplinterXdistPlugin(str(tmp_path))
+    longrepr = types.SimpleNamespace(reprtraceback=types.SimpleNamespace(extraline=None))
+    call = types.SimpleNamespace(nodeid="test_a", when="call", failed=True, longrepr=longrepr)
+    teardown = types.SimpleNamespace(nodeid="test_a", when="teardown", failed=False)
+    teardown.splinter_screenshots = [{"class_name": "tests.test_a", "files": [
+        {"file_name": "test-browser.png", "content": base64.b64encode(b"png").decode(), "base64": True},
+        {"file_name": "test-browser.html", "content": "<html></html>", "encoding": "utf-8"},
+    ]}]
+
+    plugin.pytest_runtest_logreport(call)
+    plugin.pytest_runtest_logreport(teardown)
+
+    assert longrepr.reprtraceback.extraline == screenshot_extraline(
+        str(tmp_path / "tests.test_a" / "test-browser.png"),
+        str(tmp_path / "tests.test_a" / "test-browser.html"),
+    )
+    assert plugin._failures == {}
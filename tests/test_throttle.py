@@ -0,0 +1,166 @@
+"""TokenBucket and driver speed tests."""
+import pytest
+
+from pytest_splinter4.throttle import TokenBucket
+from pytest_splinter4.webdriver_patches import SETTINGS_METHODS, patch_webdriver
+
+from selenium.webdriver.firefox.webdriver import WebDriver as FirefoxWebDriver
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+
+class FakeClock:
+    """Clock advanced by the sleeps of the bucket."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def make_bucket(**kwargs):
+    clock = FakeClock()
+    return TokenBucket(sleep=clock.sleep, clock=clock, **kwargs), clock
+
+
+def test_bucket_spaces_tokens():
+    """Tokens taken in a row are spaced by 1 / rate."""
+    bucket, clock = make_bucket(rate=2)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_bucket_refills():
+    """Time spent between two tokens counts towards the wait."""
+    bucket, clock = make_bucket(rate=2)
+
+    bucket.acquire()
+    clock.now += 0.3
+    bucket.acquire()
+    clock.now += 1
+    bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(0.2)]
+
+
+def test_bucket_capacity():
+    """Tokens build up to the capacity during a pause."""
+    bucket, clock = make_bucket(rate=1, capacity=2)
+
+    for _ in range(3):
+        bucket.acquire()
+    clock.now += 10
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == [1, 1]
+
+
+def test_bucket_reserve():
+    """Reservations queue up behind each other, without waiting."""
+    bucket, clock = make_bucket(rate=1)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 1, 2]
+    assert clock.sleeps == []
+
+
+# Class attributes replaced by patch_webdriver.
+PATCHED_ATTRIBUTES = (
+    "_command_profiler",
+    "_speed",
+    "_speed_commands",
+    "set_speed",
+    "get_speed",
+    "execute",
+    "get_current_window_info",
+    "current_window_is_main",
+    *SETTINGS_METHODS,
+)
+
+
+def patched_attributes():
+    """Get the class attributes replaced by patch_webdriver."""
+    return {name: vars(RemoteWebDriver).get(name) for name in PATCHED_ATTRIBUTES}
+
+
+def make_driver(monkeypatch):
+    """Create a remote driver answering every command without a server.
+
+    Every attribute patched on the webdriver classes is restored by monkeypatch.
+    """
+    for name in PATCHED_ATTRIBUTES:
+        monkeypatch.setattr(RemoteWebDriver, name, vars(RemoteWebDriver).get(name), raising=False)
+    monkeypatch.setattr(
+        FirefoxWebDriver,
+        "NATIVE_EVENTS_ALLOWED",
+        vars(FirefoxWebDriver).get("NATIVE_EVENTS_ALLOWED"),
+        raising=False,
+    )
+    patch_webdriver()
+
+    driver = RemoteWebDriver.__new__(RemoteWebDriver)
+    driver.commands = []
+    monkeypatch.setattr(
+        RemoteWebDriver,
+        "execute",
+        lambda self, command, params=None: self.commands.append(command) or {"value": None},
+    )
+    return driver
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    """Remote driver answering every command without a server."""
+    return make_driver(monkeypatch)
+
+
+def test_speed_zero_uses_class_execute(driver):
+    """Drivers without a speed do not go through the throttled execute."""
+    driver.set_speed(0)
+
+    assert "execute" not in vars(driver)
+    assert driver.get_speed() == 0
+
+
+def test_speed_throttles_commands(driver):
+    """Only the chosen commands wait for the limiter."""
+    driver.set_speed(2, commands={"get"})
+    driver._speed_limiter, clock = make_bucket(rate=0.5)
+
+    for command in ("get", "getTitle", "getTitle", "get", "get"):
+        driver.execute(command)
+
+    assert driver.commands == ["get", "getTitle", "getTitle", "get", "get"]
+    assert clock.sleeps == [2, 2]
+    assert driver.get_speed() == 2
+
+    driver.set_speed(0)
+    assert "execute" not in vars(driver)
+
+
+def test_set_speed_unchanged_keeps_limiter(driver):
+    """Setting the same speed again keeps the state of the limiter."""
+    driver.set_speed(1)
+    limiter = driver._speed_limiter
+
+    driver.set_speed(1)
+
+    assert driver._speed_limiter is limiter
+
+
+def test_patches_restored():
+    """The driver fixture leaves the webdriver classes as they were."""
+    attributes = patched_attributes()
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        make_driver(monkeypatch).set_speed(1)
+
+    assert patched_attributes() == attributes
@@ -0,0 +1,115 @@
+"""LifecycleTimings tests."""
+import json
+
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from pytest_splinter4.timings import CommandProfiler, LifecycleTimings, percentile
+from pytest_splinter4.webdriver_patches import patch_webdriver
+
+
+def test_percentile():
+    """Nearest-rank percentiles."""
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 0) == 1
+    assert percentile([], 50) == 0.0
+
+
+def test_summary():
+    """Phases are summarized, slowest total first."""
+    timings = LifecycleTimings()
+    timings.nodeid = "test_a"
+    timings.add("get_browser", 2.0)
+    timings.add("reset_browser", 0.5)
+    timings.nodeid = "test_b"
+    timings.add("get_browser", 1.0)
+
+    get_browser, reset_browser = timings.summary()
+    assert get_browser["phase"] == "get_browser"
+    assert get_browser["count"] == 2
+    assert get_browser["total"] == 3.0
+    assert get_browser["max"] == 2.0
+    assert reset_browser["total"] == 0.5
+
+    assert timings.for_test("test_a") == {"get_browser": 2.0, "reset_browser": 0.5}
+
+
+def test_write_json(tmp_path):
+    """Records and summary are written to a JSON file."""
+    timings = LifecycleTimings()
+    with timings.measure("take_screenshot"):
+        pass
+
+    path = tmp_path / "timings.json"
+    timings.write_json(str(path))
+
+    data = json.loads(path.read_text())
+    assert data["summary"][0]["phase"] == "take_screenshot"
+    assert data["records"][0]["nodeid"] is None
+
+
+def test_disabled():
+    """Disabled timings track the test being run, without recording anything."""
+    timings = LifecycleTimings(enabled=False)
+
+    def func():
+        return "result"
+
+    with timings.measure("take_screenshot"):
+        pass
+    timings.add("get_browser", 1.0)
+    timings.extend([{"nodeid": "test_a", "phase": "get_browser", "duration": 1.0}])
+
+    assert timings.wrap("get_browser", func) is func
+    assert timings.records == []
+
+
+def test_command_profiler():
+    """Commands are grouped by command name and test."""
+    timings = LifecycleTimings()
+    profiler = CommandProfiler(timings, slowest=2)
+
+    timings.nodeid = "test_a"
+    profiler.add("get", 0.3, request_bytes=10)
+    profiler.add("findElement", 0.1)
+    timings.nodeid = "test_b"
+    profiler.add("get", 0.5, response_bytes=20)
+
+    get, find_element = profiler.summary()
+    assert get["command"] == "get"
+    assert get["count"] == 2
+    assert get["request_bytes"] == 10
+    assert get["response_bytes"] == 20
+    assert find_element["total"] == 0.1
+
+    assert profiler.test_summary()[0] == ("test_b", 1, 0.5)
+    assert sorted(profiler.slowest, reverse=True) == [
+        (0.5, "get", "test_b"),
+        (0.3, "get", "test_a"),
+    ]
+
+    merged = CommandProfiler(LifecycleTimings(), slowest=2)
+    merged.merge(profiler.to_dict())
+    merged.merge(profiler.to_dict())
+    assert merged.summary()[0]["count"] == 4
+    assert merged.tests["test_a"]["get"] == [2, 0.6]
+
+
+def test_patched_execute_records_commands(monkeypatch):
+    """The patched RemoteWebDriver.execute feeds the profiler."""
+    profiler = CommandProfiler(LifecycleTimings())
+    # Restore the execute of the session after the test.
+    monkeypatch.setattr(RemoteWebDriver, "execute", RemoteWebDriver.execute)
+    monkeypatch.setattr(RemoteWebDriver, "_command_profiler", profiler, raising=False)
+    patch_webdriver(profiler=profiler)
+
+    driver = RemoteWebDriver.__new__(RemoteWebDriver)
+    driver._base_execute = lambda command, params: {"value": "abcd"}
+
+    assert driver.execute("getTitle", {"sessionId": "1"}) == {"value": "abcd"}
+
+    stats = profiler.commands["getTitle"]
+    assert len(stats["durations"]) == 1
+    assert stats["request_bytes"] == len('{"sessionId": "1"}')
+    assert stats["response_bytes"] == 4